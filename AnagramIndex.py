@@ -0,0 +1,131 @@
+import argparse
+from itertools import combinations_with_replacement
+from constants import blank
+from DictionaryProcessor import DictionaryProcessor
+
+class AnagramIndex:
+    """
+    Indexes the words of a dictionary by their sorted letters, to find the words a rack can form.
+
+    Two words are anagrams when their letters sorted alphabetically (their
+    signature) are the same, so the words a rack can form are the words of
+    the signatures of its sub-multisets. A rack of 7 letters has at most 128
+    sub-multisets. Every blank can stand for any letter of the alphabet, so
+    it multiplies the lookups by the size of the alphabet.
+
+    The index is an offline tool, the game does not use it: the rack refill
+    uses the WordIndex and the hints grow their moves with the GADDAG, which
+    already only follows the letters of the rack. It is used by the
+    query_racks operation of the Benchmark and by the command line below,
+    which lists the words of a file of racks.
+
+    Attributes:
+        dictionary (CompiledDictionary): The indexed dictionary.
+        signatures (dict): For every signature, the list of the indexes of its words.
+        lengths (set): The lengths of the words in the dictionary.
+    """
+
+    def __init__(self, dictionary):
+        """
+        Initializes the AnagramIndex with a single pass over the dictionary.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary to index.
+        """
+        self.dictionary = dictionary
+        self.signatures = {}
+        for index, word in enumerate(dictionary):
+            self.signatures.setdefault(''.join(sorted(word)), []).append(index)
+        self.lengths = {len(signature) for signature in self.signatures}
+        self._blank_fills = {}
+
+    def blank_fills(self, count):
+        """
+        Returns every multiset of letters a number of blanks can stand for.
+
+        Args:
+            count (int): The number of blanks.
+
+        Returns:
+            list: The multisets, as strings.
+        """
+        if count not in self._blank_fills:
+            self._blank_fills[count] = [''.join(fill) for fill in
+                                        combinations_with_replacement(sorted(self.dictionary.alphabet), count)]
+        return self._blank_fills[count]
+
+    def sub_multisets(self, letters):
+        """
+        Returns every distinct sub-multiset of a multiset of letters.
+
+        Args:
+            letters (str): The letters.
+
+        Returns:
+            list: The sub-multisets, as strings of sorted letters.
+        """
+        subsets = ['']
+        for letter in sorted(set(letters)):
+            subsets = [subset + letter * repeat for subset in subsets for repeat in range(letters.count(letter) + 1)]
+        return subsets
+
+    def query(self, rack):
+        """
+        Finds the words that can be formed with some or all of the letters of a rack.
+
+        Args:
+            rack (iterable): The letters of the rack, blanks written as constants.blank.
+
+        Returns:
+            list: The sorted indexes of the words.
+        """
+        letters = ''.join(letter for letter in rack if letter != blank)
+        blanks = len(rack) - len(letters)
+        found = set()
+        for subset in self.sub_multisets(letters):
+            for count in range(blanks + 1):
+                if len(subset) + count not in self.lengths:
+                    continue
+                for fill in self.blank_fills(count):
+                    indexes = self.signatures.get(''.join(sorted(subset + fill)))
+                    if indexes:
+                        found.update(indexes)
+        return sorted(found)
+
+    def query_batch(self, racks):
+        """
+        Finds the words that can be formed from every rack of a batch.
+
+        Racks holding the same letters in a different order are only searched once.
+
+        Args:
+            racks (iterable): The racks, each an iterable of letters.
+
+        Returns:
+            list: For every rack, the sorted indexes of the words it can form.
+        """
+        results = {}
+        matches = []
+        for rack in racks:
+            key = ''.join(sorted(rack))
+            if key not in results:
+                results[key] = self.query(key)
+            matches.append(results[key])
+        return matches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lists the words that can be formed from racks of letters.")
+    parser.add_argument("racks", help="A file with one rack per line, blanks written as '?'.")
+    parser.add_argument("--dictionary", default="Utils/scrabble_cuvinte_romana.txt", help="The path to the dictionary file.")
+    parser.add_argument("--words", action="store_true", help="Print the words instead of their number.")
+    args = parser.parse_args()
+
+    dictionary = DictionaryProcessor(args.dictionary).words
+    with open(args.racks, 'r', encoding='utf-8') as file:
+        racks = [line.strip().upper() for line in file if line.strip()]
+    index = AnagramIndex(dictionary)
+    for rack, matches in zip(racks, index.query_batch(racks)):
+        if args.words:
+            print(f"{rack}: {' '.join(dictionary.word(match) for match in matches)}")
+        else:
+            print(f"{rack}: {len(matches)} words")
@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from AnagramIndex import AnagramIndex
+from DictionaryProcessor import DictionaryProcessor
+from constants import blank
+from GameEngine import GameEngine
+from Opponent import Opponent
+from Simulation import Simulation
+from WordIndex import WordIndex
+
+BUNDLED_DICTIONARY = "Utils/scrabble_cuvinte_romana.txt"
+GENERATED_SIZES = (10000, 100000, 1000000)
+BOARDS = {'empty': 0, 'midgame': 10, 'endgame': 60}  # Number of turns played before measuring
+
+class Benchmark:
+    """
+    Measures the latency and the memory of the main game operations.
+
+    Every operation runs on seeded boards (an empty board, a board in the
+    middle of a game and a dense endgame board) with dictionaries of
+    increasing size: the bundled word list and generated word lists. The
+    boards are played once with the bundled dictionary, so they are the same
+    for every dictionary and the results can be compared across sizes.
+
+    Attributes:
+        seed (int): The seed of the boards and the generated word lists.
+        budget (float): The time in seconds spent measuring one operation on one board.
+        max_samples (int): The maximum number of samples of one operation on one board.
+        data_dir (str): The folder holding the generated word lists.
+        boards (dict): The seeded boards and their current iteration, keyed by board name.
+    """
+
+    def __init__(self, seed=0, budget=2.0, max_samples=200, data_dir="benchmark_data"):
+        """
+        Initializes the Benchmark and plays the seeded boards.
+
+        Args:
+            seed (int): The seed of the boards and the generated word lists.
+            budget (float): The time in seconds spent measuring one operation on one board.
+            max_samples (int): The maximum number of samples of one operation on one board.
+            data_dir (str): The folder holding the generated word lists.
+        """
+        self.seed = seed
+        self.budget = budget
+        self.max_samples = max_samples
+        self.data_dir = data_dir
+        self.boards = self.play_boards(DictionaryProcessor(BUNDLED_DICTIONARY).words)
+
+    def play_boards(self, dictionary):
+        """
+        Plays the seeded boards between two computer players.
+
+        The last move of every board is left in the current iteration, so
+        find_word and calculate_score see the words of a turn.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary the boards are played with.
+
+        Returns:
+            dict: The boards and their current iteration, keyed by board name.
+        """
+        boards = {}
+        for name, turns in BOARDS.items():
+            random.seed(self.seed)
+            engine = GameEngine(dictionary, verbose=False, deal_rack=False)
+            players = [Opponent(engine), Opponent(engine)]
+            if turns:
+                players[0].apply_move(Simulation(dictionary).opening_move())
+            for turn in range(1, turns):
+                if players[turn % 2].make_move() is None:
+                    break
+            if engine.iteration:
+                engine.iteration -= 1
+            boards[name] = (engine.board.copy(), engine.iteration)
+        return boards
+
+    def generate_dictionary(self, size):
+        """
+        Writes a generated word list of the given size, unless it already exists.
+
+        The words follow the lengths and the letter pairs of the bundled word
+        list (a first-order Markov chain), so they share prefixes and suffixes
+        like real words do.
+
+        Args:
+            size (int): The number of words.
+
+        Returns:
+            str: The path to the word list.
+        """
+        path = os.path.join(self.data_dir, f"generated_{size}_{self.seed}.txt")
+        if os.path.exists(path):
+            return path
+
+        with open(BUNDLED_DICTIONARY, 'r', encoding='utf-8') as file:
+            samples = [line.strip().upper() for line in file if line.strip()]
+        lengths = Counter(len(word) for word in samples)
+        transitions = defaultdict(Counter)
+        for word in samples:
+            for previous, letter in zip('^' + word, word):
+                transitions[previous][letter] += 1
+        choices = {previous: (list(counter), list(counter.values())) for previous, counter in transitions.items()}
+        fallback = (list(transitions['^']), list(transitions['^'].values()))
+
+        generator = random.Random(self.seed)
+        length_choices, length_weights = list(lengths), list(lengths.values())
+        words = set()
+        while len(words) < size:
+            previous = '^'
+            word = []
+            for _ in range(generator.choices(length_choices, length_weights)[0]):
+                letters, weights = choices.get(previous, fallback)
+                previous = generator.choices(letters, weights)[0]
+                word.append(previous)
+            words.add(''.join(word))
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('\n'.join(sorted(words)) + '\n')
+        return path
+
+    def measure(self, operation, setup=None):
+        """
+        Measures an operation until the time budget or the maximum number of samples is reached.
+
+        Args:
+            operation (callable): The operation, called with the value returned by setup.
+            setup (callable): Prepares the input of every sample, outside of the measured time.
+
+        Returns:
+            dict: The latency percentiles in milliseconds, the number of samples and the peak memory in KiB.
+        """
+        samples = []
+        deadline = time.perf_counter() + self.budget
+        while len(samples) < self.max_samples and (len(samples) < 3 or time.perf_counter() < deadline):
+            argument = setup() if setup else None
+            start = time.perf_counter_ns()
+            operation(argument)
+            samples.append((time.perf_counter_ns() - start) / 1e6)
+
+        argument = setup() if setup else None
+        tracemalloc.start()
+        operation(argument)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        samples.sort()
+        return {
+            'samples': len(samples),
+            'p50_ms': percentile(samples, 0.50),
+            'p90_ms': percentile(samples, 0.90),
+            'p99_ms': percentile(samples, 0.99),
+            'max_ms': samples[-1],
+            'peak_kib': peak / 1024,
+        }
+
+    def run_board(self, dictionary, word_index, board_name):
+        """
+        Measures every operation on one board with one dictionary.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary to measure with.
+            word_index (WordIndex): The indexes of the dictionary, shared by the boards.
+            board_name (str): The name of the seeded board.
+
+        Returns:
+            dict: The measurements, keyed by operation.
+        """
+        board, iteration = self.boards[board_name]
+        engine = GameEngine(dictionary, verbose=False, deal_rack=False, word_index=word_index)
+        engine.load_board(board, iteration)
+        opponent = Opponent(engine)
+
+        generator = random.Random(self.seed)
+        words = [dictionary.word(generator.randrange(len(dictionary))) for _ in range(self.max_samples)]
+        placements = []
+        for word in words:
+            position = (generator.randrange(engine.board_size), generator.randrange(engine.board_size))
+            direction = generator.choice(('horizontal', 'vertical'))
+            if opponent.can_place_word(word, position, direction):
+                placements.append((word, position, direction))
+        placements = placements or [(words[0], (0, 0), 'horizontal')]
+        rack = list(words[0][:7])
+
+        engine.find_word()
+        results = {
+            'find_possible_words': self.measure(lambda _: opponent.find_possible_words(), engine.move_cache.clear),
+            'find_possible_words_cached': self.measure(lambda _: opponent.find_possible_words()),
+            'is_valid_placement': self.measure(lambda placement: opponent.is_valid_placement(*placement),
+                                               lambda: generator.choice(placements)),
+            'find_word': self.measure(lambda _: engine.find_word()),
+            'calculate_score': self.measure(lambda _: engine.calculate_score()),
+        }
+        moves = opponent.find_possible_words()
+        results['score_moves'] = self.measure(lambda _: engine.scorer.score_moves(engine.view, moves))
+        results['replace_letters'] = self.measure(lambda _: engine.replace_letters(),
+                                                  lambda: setattr(engine, 'rack', rack[:]))
+        return results
+
+    def run_racks(self, dictionary, anagram_index):
+        """
+        Measures a batch query of random racks, some of them with blanks.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary to measure with.
+            anagram_index (AnagramIndex): The anagram index of the dictionary.
+
+        Returns:
+            dict: The measurement of the batch query.
+        """
+        generator = random.Random(self.seed)
+        alphabet = sorted(dictionary.alphabet)
+        racks = []
+        for _ in range(100):
+            blanks = generator.choice((0, 0, 0, 1, 1, 2))
+            racks.append([generator.choice(alphabet) for _ in range(7 - blanks)] + [blank] * blanks)
+        return self.measure(lambda _: anagram_index.query_batch(racks))
+
+    def run(self, sizes=GENERATED_SIZES, progress=print):
+        """
+        Measures every operation on every board with every dictionary.
+
+        Args:
+            sizes (iterable): The sizes of the generated word lists.
+            progress (callable): Called with a line of text after every board.
+
+        Returns:
+            dict: The environment of the run, the load and index times of every dictionary and the list of measurements.
+            The rack queries do not depend on the board and are reported with the board 'none'.
+        """
+        paths = [BUNDLED_DICTIONARY] + [self.generate_dictionary(size) for size in sizes]
+        dictionaries = []
+        results = []
+        for path in paths:
+            start = time.perf_counter()
+            dictionary = DictionaryProcessor(path).words  # Compiles the word list on the first run
+            load_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            word_index = WordIndex(dictionary)
+            index_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            anagram_index = AnagramIndex(dictionary)
+            anagram_index_ms = (time.perf_counter() - start) * 1000
+            dictionaries.append({'dictionary': os.path.basename(path), 'words': len(dictionary), 'load_ms': load_ms,
+                                 'index_ms': index_ms, 'anagram_index_ms': anagram_index_ms})
+            results.append({'dictionary': os.path.basename(path), 'words': len(dictionary), 'board': 'none',
+                            'operation': 'query_racks', **self.run_racks(dictionary, anagram_index)})
+            for board_name in BOARDS:
+                for operation, measurement in self.run_board(dictionary, word_index, board_name).items():
+                    results.append({'dictionary': os.path.basename(path), 'words': len(dictionary),
+                                    'board': board_name, 'operation': operation, **measurement})
+                progress(f"{os.path.basename(path)} ({len(dictionary)} words, loaded in {load_ms:.0f} ms), "
+                         f"{board_name} board done")
+
+        return {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': self.seed,
+            'dictionaries': dictionaries,
+            'results': results,
+        }
+
+def percentile(samples, fraction):
+    """
+    Returns a percentile of sorted samples, with linear interpolation.
+
+    Args:
+        samples (list): The sorted samples.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The percentile.
+    """
+    position = (len(samples) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+def compare(report, baseline):
+    """
+    Prints the change of the median latency of every measurement against a previous run.
+
+    Args:
+        report (dict): The current run, as returned by Benchmark.run.
+        baseline (dict): A previous run, as returned by Benchmark.run.
+    """
+    previous = {(result['dictionary'], result['board'], result['operation']): result for result in baseline['results']}
+    for result in report['results']:
+        old = previous.get((result['dictionary'], result['board'], result['operation']))
+        if old and old['p50_ms']:
+            change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100
+            print(f"{result['dictionary']:>28} {result['board']:>8} {result['operation']:>20}: "
+                  f"{old['p50_ms']:10.3f} ms -> {result['p50_ms']:10.3f} ms ({change:+.0f}%)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the latency and the memory of the game operations.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in GENERATED_SIZES),
+                        help="The comma-separated sizes of the generated word lists, empty for none.")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the boards and the generated word lists.")
+    parser.add_argument("--budget", type=float, default=2.0, help="The seconds spent measuring one operation on one board.")
+    parser.add_argument("--max-samples", type=int, default=200, help="The maximum number of samples per measurement.")
+    parser.add_argument("--output", default=None, help="The JSON file to write, benchmark-<timestamp>.json by default.")
+    parser.add_argument("--baseline", default=None, help="A previous JSON result to compare with.")
+    args = parser.parse_args()
+
+    benchmark = Benchmark(args.seed, args.budget, args.max_samples)
+    report = benchmark.run([int(size) for size in args.sizes.split(",") if size])
+
+    for result in report['results']:
+        print(f"{result['dictionary']:>28} {result['board']:>8} {result['operation']:>20}: "
+              f"p50 {result['p50_ms']:10.3f} ms  p90 {result['p90_ms']:10.3f} ms  p99 {result['p99_ms']:10.3f} ms  "
+              f"peak {result['peak_kib']:10.1f} KiB")
+
+    output = args.output or f"benchmark-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            compare(report, json.load(file))
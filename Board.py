@@ -1,7 +1,6 @@
 import pygame
 import Utils
 from Cell import Cell
-from constants import letter_scores
 
 class Board:
     """
@@ -11,12 +10,13 @@ class Board:
         board_size (int): The size of the board.
         cell_size (int): The size of each cell on the board.
         margin (int): The margin between cells.
-        placed_letters (dict): A dictionary of placed letters with their positions.
-        cell_colors (dict): A dictionary of cell colors with their positions.
+        view (BoardView): The read-only view of the letters on the board.
         piece_color (tuple): The color of the pieces.
+        background (pygame.Surface): The empty board with the bonus colors, rendered once.
+        ghost_tiles (list): The letters of a hint drawn as see-through tiles, as (letter, (row, col)) tuples.
     """
 
-    def __init__(self, board_size, cell_size, margin):
+    def __init__(self, board_size, cell_size, margin, view):
         """
         Initializes the Board with the given size, cell size, and margin.
 
@@ -24,17 +24,15 @@ class Board:
             board_size (int): The size of the board.
             cell_size (int): The size of each cell on the board.
             margin (int): The margin between cells.
+            view (BoardView): The read-only view of the letters on the board.
         """
         self.board_size = board_size
         self.cell_size = cell_size
         self.margin = margin
-        self.placed_letters = {}
-        self.cell_colors = {}
+        self.view = view
         self.piece_color = Utils.hex_to_rgb('#b79d9b')
-
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                self.cell_colors[(row, col)] = Cell.get_cell_color(row, col)
+        self.background = None
+        self.ghost_tiles = []
 
     def count_placed_letters(self):
         """
@@ -43,49 +41,70 @@ class Board:
         Returns:
             int: The number of placed letters.
         """
-        return len(self.placed_letters)
+        return len(self.view.positions())
+
+    def cell_rect(self, row, col):
+        """
+        Returns the rectangle of a cell on the screen.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            pygame.Rect: The rectangle of the cell.
+        """
+        x = self.margin + col * (self.cell_size + self.margin)
+        y = self.margin + row * (self.cell_size + self.margin)
+        return pygame.Rect(x, y, self.cell_size, self.cell_size)
 
-    def draw(self, screen, font, score_font):
+    def render_background(self):
+        """
+        Renders the empty board with the bonus colors to an off-screen surface.
+
+        Returns:
+            pygame.Surface: The rendered board, transparent between the cells.
+        """
+        size = self.margin + self.board_size * (self.cell_size + self.margin)
+        background = pygame.Surface((size, size), pygame.SRCALPHA)
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                Utils.draw_rounded_rect(background, Cell.get_cell_color(row, col), self.cell_rect(row, col), corner_radius=8)
+        return background
+
+    def draw(self, screen, font, score_font, sprites):
         """
         Draws the board and the placed letters on the screen.
 
+        The empty board is rendered once and blitted, the placed letters are cached tiles blitted on top of it.
+
         Args:
             screen (pygame.Surface): The screen to draw on.
             font (pygame.font.Font): The font for drawing letters.
             score_font (pygame.font.Font): The font for drawing letter scores.
+            sprites (SpriteCache): The cache of the rendered tiles.
         """
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                x = self.margin + col * (self.cell_size + self.margin)
-                y = self.margin + row * (self.cell_size + self.margin)
+        if self.background is None:
+            self.background = self.render_background()
+        screen.blit(self.background, (0, 0))
 
-                Utils.draw_rounded_rect(screen, self.cell_colors[(row, col)], (x, y, self.cell_size, self.cell_size), corner_radius=8)
+        positions = self.view.positions()
+        self.draw_borders(screen, set(positions))
 
-        self.draw_borders(screen)
+        for row, col in positions:
+            screen.blit(sprites.tile(self.view.letter(row, col), font, score_font, self.piece_color), self.cell_rect(row, col))
 
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if (row, col) in self.placed_letters:
-                    x = self.margin + col * (self.cell_size + self.margin)
-                    y = self.margin + row * (self.cell_size + self.margin)
-
-                    letter = self.placed_letters[(row, col)]
-                    letter_text = font.render(letter, True, (0, 0, 0))
-                    screen.blit(letter_text, (
-                        x + (self.cell_size - letter_text.get_width()) // 2, y + (self.cell_size - letter_text.get_height()) // 2))
-
-                    letter_score = letter_scores[letter]
-                    score_text = score_font.render(str(letter_score), True, (0, 0, 0))
-                    score_x = x + self.cell_size - score_text.get_width() - 5
-                    score_y = y + self.cell_size - score_text.get_height() - 5
-                    screen.blit(score_text, (score_x, score_y))
-
-    def draw_borders(self, screen):
+        for letter, (row, col) in self.ghost_tiles:
+            if self.view.letter(row, col) is None:
+                screen.blit(sprites.tile(letter, font, score_font, self.piece_color, alpha=110), self.cell_rect(row, col))
+
+    def draw_borders(self, screen, placed_positions):
         """
         Draws the borders between placed letters on the board.
 
         Args:
             screen (pygame.Surface): The screen to draw on.
+            placed_positions (set): The positions of the placed letters.
         """
         border_color = Utils.hex_to_rgb('#b79d9b')  # Border color between letters
 
@@ -94,7 +113,7 @@ class Board:
             r2, c2 = cell2
             return abs(r1 - r2) + abs(c1 - c2) == 1  # Check if they are neighbors
 
-        for (row, col) in self.placed_letters:
+        for (row, col) in placed_positions:
             # Current cell coordinates
             x = self.margin + col * (self.cell_size + self.margin)
             y = self.margin + row * (self.cell_size + self.margin)
@@ -102,7 +121,7 @@ class Board:
             # Check neighbors and color the common border
             for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
                 neighbor = (row + dr, col + dc)
-                if neighbor in self.placed_letters and are_neighbors((row, col), neighbor):
+                if neighbor in placed_positions and are_neighbors((row, col), neighbor):
                     # Neighbor coordinates
                     nx = self.margin + neighbor[1] * (self.cell_size + self.margin)
                     ny = self.margin + neighbor[0] * (self.cell_size + self.margin)
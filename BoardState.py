@@ -0,0 +1,334 @@
+import random
+from array import array
+
+ZOBRIST_TABLES = {}  # The Zobrist keys of every board size and alphabet, shared by all the boards
+
+class BoardState:
+    """
+    The letters on the board, stored once in two flat arrays.
+
+    Every cell holds a letter code (0 for an empty cell, otherwise the position
+    of the letter in the alphabet plus one) and the iteration the letter was
+    placed in. The cells are stored row by row, so copying the board for a
+    search is two buffer copies. The rules and the rendering read the board
+    through a BoardView, only the game engine changes it.
+
+    Next to the cells, the occupied cells of every row and every column are
+    kept as bitmasks (bit i set when the i-th cell of the line holds a
+    letter), so the placement and adjacency checks are a few shifts and ANDs.
+
+    The board also keeps its Zobrist hash: every (cell, letter) pair has a
+    random 64-bit key, and the hash is the XOR of the keys of the letters on
+    the board, updated on every placement and removal. Equal boards have
+    equal hashes, so the hash identifies a position in caches. The keys are
+    seeded from the size and the alphabet, so they are the same in every
+    process.
+
+    Attributes:
+        size (int): The size of the board.
+        letters (str): The letter of every code, code 0 standing for an empty cell.
+        codes (dict): The code of every letter.
+        cells (bytearray): The letter code of every cell.
+        iterations (array): The iteration of every cell.
+        row_masks (list): The occupancy bitmask of every row, bit i standing for column i.
+        column_masks (list): The occupancy bitmask of every column, bit i standing for row i.
+        zobrist_keys (list): The key of every (cell, letter code) pair, at index cell * len(letters) + code.
+        zobrist (int): The Zobrist hash of the letters on the board, 0 for an empty board.
+    """
+
+    def __init__(self, size, alphabet):
+        """
+        Initializes an empty BoardState.
+
+        Args:
+            size (int): The size of the board.
+            alphabet (str): The letters that can be placed on the board, at most 255.
+        """
+        self.size = size
+        self.letters = ' ' + alphabet
+        self.codes = {letter: code for code, letter in enumerate(self.letters) if code}
+        self.cells = bytearray(size * size)
+        self.iterations = array('I', bytes(4 * size * size))
+        self.row_masks = [0] * size
+        self.column_masks = [0] * size
+        self.zobrist_keys = zobrist_keys(size, self.letters)
+        self.zobrist = 0
+
+    def copy(self):
+        """
+        Returns an independent copy of the board.
+
+        Returns:
+            BoardState: The copy.
+        """
+        board = BoardState.__new__(BoardState)
+        board.size = self.size
+        board.letters = self.letters
+        board.codes = self.codes
+        board.cells = self.cells[:]
+        board.iterations = self.iterations[:]
+        board.row_masks = self.row_masks[:]
+        board.column_masks = self.column_masks[:]
+        board.zobrist_keys = self.zobrist_keys
+        board.zobrist = self.zobrist
+        return board
+
+    def view(self):
+        """
+        Returns a read-only view of the board.
+
+        Returns:
+            BoardView: The view, which follows the later changes of the board.
+        """
+        return BoardView(self)
+
+    def __getitem__(self, position):
+        row, col = position
+        code = self.cells[row * self.size + col]
+        if not code:
+            return None
+        return self.letters[code], self.iterations[row * self.size + col]
+
+    def letter(self, row, col):
+        """
+        Returns the letter on a cell.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            str: The letter, or None if the cell is empty.
+        """
+        code = self.cells[row * self.size + col]
+        return self.letters[code] if code else None
+
+    def iteration(self, row, col):
+        """
+        Returns the iteration a letter was placed in.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            int: The iteration, or None if the cell is empty.
+        """
+        index = row * self.size + col
+        return self.iterations[index] if self.cells[index] else None
+
+    def line(self, index, direction):
+        """
+        Returns the letters of a row or a column.
+
+        Args:
+            index (int): The row index for 'horizontal', the column index for 'vertical'.
+            direction (str): The direction of the line ('horizontal' or 'vertical').
+
+        Returns:
+            list: The letters of the line, None for the empty cells.
+        """
+        if direction == 'horizontal':
+            codes = self.cells[index * self.size:(index + 1) * self.size]
+        else:
+            codes = self.cells[index::self.size]
+        return [self.letters[code] if code else None for code in codes]
+
+    def positions(self):
+        """
+        Returns the positions of the letters on the board, row by row.
+
+        Returns:
+            list: A list of (row, col) tuples.
+        """
+        return [divmod(index, self.size) for index, code in enumerate(self.cells) if code]
+
+    def line_mask(self, index, direction):
+        """
+        Returns the occupancy bitmask of a row or a column.
+
+        Args:
+            index (int): The row index for 'horizontal', the column index for 'vertical'.
+            direction (str): The direction of the line ('horizontal' or 'vertical').
+
+        Returns:
+            int: The bitmask of the occupied cells, 0 for a line outside the board.
+        """
+        if not 0 <= index < self.size:
+            return 0
+        return self.row_masks[index] if direction == 'horizontal' else self.column_masks[index]
+
+    def hook_mask(self, index, direction):
+        """
+        Returns the empty cells of a line that touch a letter on a neighbouring line.
+
+        A letter placed on such a cell forms a perpendicular word.
+
+        Args:
+            index (int): The row index for 'horizontal', the column index for 'vertical'.
+            direction (str): The direction of the line ('horizontal' or 'vertical').
+
+        Returns:
+            int: The bitmask of the hook cells.
+        """
+        neighbors = self.line_mask(index - 1, direction) | self.line_mask(index + 1, direction)
+        return neighbors & ~self.line_mask(index, direction)
+
+    def count_neighbors(self, row, col):
+        """
+        Counts the letters next to a cell.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            int: The number of neighbouring cells with letters.
+        """
+        return ((self.row_masks[row] & (0b101 << col >> 1)).bit_count() +
+                (self.column_masks[col] & (0b101 << row >> 1)).bit_count())
+
+    def clear(self):
+        """
+        Removes all the letters from the board.
+        """
+        self.cells[:] = bytes(len(self.cells))
+        self.row_masks = [0] * self.size
+        self.column_masks = [0] * self.size
+        self.zobrist = 0
+
+    def place(self, row, col, letter, iteration):
+        """
+        Places a letter on a cell, replacing the letter already there if any.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+            letter (str): The letter to place.
+            iteration (int): The iteration the letter is placed in.
+        """
+        index = row * self.size + col
+        if self.cells[index]:
+            self.zobrist ^= self.zobrist_keys[index * len(self.letters) + self.cells[index]]
+        self.cells[index] = self.codes[letter]
+        self.zobrist ^= self.zobrist_keys[index * len(self.letters) + self.cells[index]]
+        self.iterations[index] = iteration
+        self.row_masks[row] |= 1 << col
+        self.column_masks[col] |= 1 << row
+
+    def remove(self, row, col):
+        """
+        Removes the letter from a cell.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            str: The removed letter, or None if the cell was empty.
+        """
+        letter = self.letter(row, col)
+        index = row * self.size + col
+        if self.cells[index]:
+            self.zobrist ^= self.zobrist_keys[index * len(self.letters) + self.cells[index]]
+        self.cells[index] = 0
+        self.row_masks[row] &= ~(1 << col)
+        self.column_masks[col] &= ~(1 << row)
+        return letter
+
+def zobrist_keys(size, letters):
+    """
+    Returns the Zobrist keys of a board, generated once per size and alphabet.
+
+    Args:
+        size (int): The size of the board.
+        letters (str): The letter of every code, code 0 standing for an empty cell.
+
+    Returns:
+        list: The key of every (cell, letter code) pair.
+    """
+    keys = ZOBRIST_TABLES.get((size, letters))
+    if keys is None:
+        generator = random.Random(f"{size}:{letters}")
+        keys = [generator.getrandbits(64) for _ in range(size * size * len(letters))]
+        ZOBRIST_TABLES[(size, letters)] = keys
+    return keys
+
+class BoardView:
+    """
+    A read-only view of a BoardState, used by the rules and the rendering.
+
+    Attributes:
+        size (int): The size of the board.
+    """
+
+    def __init__(self, board):
+        """
+        Initializes the BoardView over a board.
+
+        Args:
+            board (BoardState): The board to read.
+        """
+        self._board = board
+        self.size = board.size
+
+    def copy(self):
+        """
+        Returns an independent, writable copy of the board.
+
+        Returns:
+            BoardState: The copy.
+        """
+        return self._board.copy()
+
+    def __getitem__(self, position):
+        return self._board[position]
+
+    @property
+    def zobrist(self):
+        """
+        The Zobrist hash of the letters on the board.
+        """
+        return self._board.zobrist
+
+    def letter(self, row, col):
+        """
+        Returns the letter on a cell, None if the cell is empty.
+        """
+        return self._board.letter(row, col)
+
+    def iteration(self, row, col):
+        """
+        Returns the iteration a letter was placed in, None if the cell is empty.
+        """
+        return self._board.iteration(row, col)
+
+    def line(self, index, direction):
+        """
+        Returns the letters of a row or a column, None for the empty cells.
+        """
+        return self._board.line(index, direction)
+
+    def positions(self):
+        """
+        Returns the positions of the letters on the board, row by row.
+        """
+        return self._board.positions()
+
+    def line_mask(self, index, direction):
+        """
+        Returns the occupancy bitmask of a row or a column, 0 for a line outside the board.
+        """
+        return self._board.line_mask(index, direction)
+
+    def hook_mask(self, index, direction):
+        """
+        Returns the empty cells of a line that touch a letter on a neighbouring line.
+        """
+        return self._board.hook_mask(index, direction)
+
+    def count_neighbors(self, row, col):
+        """
+        Counts the letters next to a cell.
+        """
+        return self._board.count_neighbors(row, col)
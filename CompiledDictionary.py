@@ -0,0 +1,380 @@
+import glob
+import gzip
+import hashlib
+import heapq
+import io
+import lzma
+import mmap
+import os
+import struct
+import sys
+from array import array
+from Gaddag import Gaddag, SEPARATOR
+
+MAGIC = b'SCRBDIC1'
+HEADER = struct.Struct('<8s32sIIIII')
+EXTENSION = '.cdict'
+RUN_WORDS = 1 << 18  # Words sorted in memory at once while compiling, before they are packed into a run
+GZIP_MAGIC = b'\x1f\x8b'
+XZ_MAGIC = b'\xfd7zXZ\x00'
+
+class CompiledDictionary:
+    """
+    A dictionary compiled to a compact binary file and opened with mmap.
+
+    The file is stored next to the word list and named after the hash of the
+    word list, so it is rebuilt only when the word list changes. It holds the
+    sorted, uppercased word table with its offsets and the prebuilt GADDAG of
+    the words, so opening it does not parse anything.
+
+    File layout (little-endian, every section padded to 4 bytes):
+        header: magic, SHA-256 of the source, word count, word bytes length,
+                alphabet bytes length, GADDAG node count, GADDAG edge count
+        alphabet (UTF-8), word offsets (uint32), word bytes (UTF-8),
+        GADDAG first edge per node (uint32), GADDAG terminal flags (bytes),
+        GADDAG edge letters (bytes), GADDAG edge targets (uint32)
+
+    The uint32 sections are read in place on little-endian hosts, and copied
+    with their bytes swapped on big-endian hosts.
+
+    Attributes:
+        path (str): The path of the compiled file, or None if it is kept in memory.
+        digest (bytes): The SHA-256 of the word list the file was compiled from.
+        alphabet (str): The letters that appear in the words.
+        offsets (memoryview): The start offset of every word in the word bytes (one extra entry at the end).
+        data_start (int): The position of the word bytes in the buffer.
+        gaddag (Gaddag): The GADDAG of the words.
+    """
+
+    def __init__(self, buffer, path=None):
+        """
+        Initializes the CompiledDictionary over the bytes of a compiled file.
+
+        Args:
+            buffer (bytes or mmap.mmap): The contents of the compiled file.
+            path (str): The path of the compiled file.
+
+        Raises:
+            ValueError: If the buffer is not a compiled dictionary.
+        """
+        self.path = path
+        self.buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise ValueError("Not a compiled dictionary")
+        magic, self.digest, word_count, data_length, alphabet_length, node_count, edge_count = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a compiled dictionary")
+        size = HEADER.size + padded(alphabet_length) + 4 * (word_count + 1) + padded(data_length) + \
+            4 * (node_count + 1) + padded(node_count) + padded(edge_count) + 4 * edge_count
+        if len(view) < size:
+            raise ValueError("Truncated compiled dictionary")
+
+        offset = HEADER.size
+        self.alphabet, offset = bytes(view[offset:offset + alphabet_length]).decode('utf-8'), offset + padded(alphabet_length)
+        self.offsets, offset = uint32_section(view[offset:offset + 4 * (word_count + 1)]), offset + 4 * (word_count + 1)
+        self.data_start, offset = offset, offset + padded(data_length)
+        first_edge, offset = uint32_section(view[offset:offset + 4 * (node_count + 1)]), offset + 4 * (node_count + 1)
+        terminal, offset = view[offset:offset + node_count], offset + padded(node_count)
+        edge_letters, offset = view[offset:offset + edge_count], offset + padded(edge_count)
+        edge_targets = uint32_section(view[offset:offset + 4 * edge_count])
+        self.gaddag = Gaddag.from_arrays(first_edge, edge_letters, edge_targets, terminal, self.alphabet + SEPARATOR)
+
+    @classmethod
+    def load(cls, source_path):
+        """
+        Opens the compiled dictionary of a word list, compiling it first if needed.
+
+        The file is compiled again if it is missing, damaged, or was compiled
+        from another word list, as told by the SHA-256 stored in its header.
+
+        Args:
+            source_path (str): The path to the word list (one word per line, plain, gzip or xz).
+
+        Returns:
+            CompiledDictionary: The compiled dictionary.
+        """
+        with open(source_path, 'rb') as file:
+            digest = hashlib.file_digest(file, 'sha256')
+        compiled_path = f"{source_path}.{digest.hexdigest()[:16]}{EXTENSION}"
+
+        if read_digest(compiled_path) == digest.digest():
+            try:
+                return cls.open(compiled_path)
+            except ValueError:
+                pass  # The file is truncated, compile it again
+
+        buffer = cls.compile(source_path, digest.digest())
+        try:
+            for stale_path in glob.glob(glob.escape(source_path) + '.*' + EXTENSION):
+                os.remove(stale_path)
+            temporary_path = compiled_path + '.tmp'
+            with open(temporary_path, 'wb') as file:
+                file.write(buffer)
+            os.replace(temporary_path, compiled_path)
+        except OSError:
+            return cls(buffer)  # The folder is read-only, keep the compiled dictionary in memory
+        return cls.open(compiled_path)
+
+    @classmethod
+    def open(cls, compiled_path):
+        """
+        Opens an existing compiled dictionary with mmap.
+
+        Args:
+            compiled_path (str): The path to the compiled file.
+
+        Returns:
+            CompiledDictionary: The compiled dictionary.
+        """
+        with open(compiled_path, 'rb') as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), compiled_path)
+
+    @staticmethod
+    def compile(source_path, digest):
+        """
+        Compiles a word list to the binary format.
+
+        The words are streamed from the file and sorted in runs of RUN_WORDS
+        words, packed as UTF-8 lines, then merged into the word table. The
+        GADDAG is built from the packed table, so the whole word list is never
+        held as Python strings at once.
+
+        Args:
+            source_path (str): The path to the word list (one word per line, plain, gzip or xz).
+            digest (bytes): The SHA-256 of the word list.
+
+        Returns:
+            bytes: The contents of the compiled file.
+        """
+        runs = []
+        run = set()
+        letters = set()
+        for word in read_words(source_path):
+            run.add(word)
+            if len(run) == RUN_WORDS:
+                runs.append(pack_run(run, letters))
+                run = set()
+        if run:
+            runs.append(pack_run(run, letters))
+        del run
+
+        # UTF-8 keeps the order of the code points, so the runs are merged as bytes
+        offsets = array('I', [0])
+        data = bytearray()
+        previous = None
+        for line in heapq.merge(*(io.BytesIO(packed) for packed in runs)):
+            if line != previous:
+                data += line[:-1]
+                offsets.append(len(data))
+                previous = line
+        del runs
+
+        alphabet = ''.join(sorted(letters))
+        encoded_alphabet = alphabet.encode('utf-8')
+        words = WordTable(data, offsets)
+        first_edge, edge_letters, edge_targets, terminal = Gaddag(words).to_arrays(alphabet + SEPARATOR)
+        sections = [
+            HEADER.pack(MAGIC, digest, len(words), len(data), len(encoded_alphabet), len(terminal), len(edge_letters)),
+            encoded_alphabet, little_endian(offsets), bytes(data), little_endian(first_edge), terminal, bytes(edge_letters),
+            little_endian(edge_targets)
+        ]
+        return b''.join(section + b'\0' * (padded(len(section)) - len(section)) for section in sections)
+
+    def word(self, index):
+        """
+        Returns the word with the given index in the sorted word table.
+
+        Args:
+            index (int): The index of the word.
+
+        Returns:
+            str: The word.
+        """
+        return self.word_bytes(index).decode('utf-8')
+
+    def word_bytes(self, index):
+        """
+        Returns the UTF-8 bytes of the word with the given index.
+
+        Args:
+            index (int): The index of the word.
+
+        Returns:
+            bytes: The encoded word.
+        """
+        return self.buffer[self.data_start + self.offsets[index]:self.data_start + self.offsets[index + 1]]
+
+    def index(self, word):
+        """
+        Finds the index of a word in the sorted word table with a binary search.
+
+        Args:
+            word (str): The word to look up.
+
+        Returns:
+            int: The index of the word, or -1 if it is not in the dictionary.
+        """
+        key = word.encode('utf-8')
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.word_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and self.word_bytes(low) == key:
+            return low
+        return -1
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.word(index)
+
+class WordTable:
+    """
+    The sorted words of a dictionary being compiled, packed in a single buffer.
+
+    Attributes:
+        data (bytearray): The UTF-8 bytes of the words, one after the other.
+        offsets (array): The start offset of every word in the data (one extra entry at the end).
+    """
+
+    def __init__(self, data, offsets):
+        """
+        Initializes the WordTable over packed words.
+
+        Args:
+            data (bytearray): The UTF-8 bytes of the words, one after the other.
+            offsets (array): The start offset of every word in the data.
+        """
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+def open_word_list(path):
+    """
+    Opens a word list for reading text, decompressing it on the fly when it is compressed.
+
+    The compression is detected from the first bytes of the file, not from its name.
+
+    Args:
+        path (str): The path to the word list, plain, gzip or xz.
+
+    Returns:
+        io.TextIOBase: The text stream of the word list.
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(len(XZ_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if magic.startswith(XZ_MAGIC):
+        return lzma.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def read_words(path):
+    """
+    Streams the words of a word list, one line at a time.
+
+    Args:
+        path (str): The path to the word list (one word per line, plain, gzip or xz).
+
+    Yields:
+        str: The uppercased words without the surrounding whitespace, skipping the empty lines.
+    """
+    with open_word_list(path) as file:
+        for line in file:
+            word = line.strip().upper()
+            if word:
+                yield word
+
+def pack_run(words, letters):
+    """
+    Sorts a run of words and packs it as UTF-8 lines.
+
+    Args:
+        words (set): The words of the run.
+        letters (set): The set collecting the letters of the words.
+
+    Returns:
+        bytes: The sorted words, each followed by a newline.
+    """
+    for word in words:
+        letters.update(word)
+    return ''.join(word + '\n' for word in sorted(words)).encode('utf-8')
+
+def padded(length):
+    """
+    Rounds a section length up to a multiple of 4 bytes.
+
+    Args:
+        length (int): The length of the section.
+
+    Returns:
+        int: The padded length.
+    """
+    return (length + 3) & ~3
+
+def read_digest(compiled_path):
+    """
+    Reads the SHA-256 of the word list stored in the header of a compiled file.
+
+    Args:
+        compiled_path (str): The path to the compiled file.
+
+    Returns:
+        bytes: The stored digest, or None if the file is missing or is not a compiled dictionary.
+    """
+    try:
+        with open(compiled_path, 'rb') as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+        return None
+    return HEADER.unpack(header)[1]
+
+def uint32_section(view):
+    """
+    Reads a little-endian uint32 section of a compiled file.
+
+    Args:
+        view (memoryview): The bytes of the section.
+
+    Returns:
+        memoryview or array: The values, read in place on little-endian hosts and copied on big-endian hosts.
+    """
+    if sys.byteorder == 'little':
+        return view.cast('I')
+    values = array('I')
+    values.frombytes(view)
+    values.byteswap()
+    return values
+
+def little_endian(values):
+    """
+    Returns the bytes of a uint32 array in little-endian order.
+
+    Args:
+        values (array): The values.
+
+    Returns:
+        bytes: The little-endian bytes of the values.
+    """
+    if sys.byteorder == 'little':
+        return values.tobytes()
+    swapped = array('I', values)
+    swapped.byteswap()
+    return swapped.tobytes()
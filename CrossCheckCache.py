@@ -0,0 +1,203 @@
+from Gaddag import SEPARATOR
+
+class CrossCheckCache:
+    """
+    Remembers the anchor squares and the cross-check sets of the board between turns.
+
+    The cache only describes the letters that are already locked on the board.
+    It is updated around the cells of every accepted move, so the cost of an
+    update depends on the size of the move and not on the size of the board.
+
+    Attributes:
+        board_size (int): The size of the board.
+        dictionary (CompiledDictionary): The valid words.
+        anchors (set): The empty cells next to at least one placed letter.
+        horizontal (dict): For the empty cells with a letter above or below, the set of letters
+            that form a valid vertical word there (the constraint for horizontal words).
+        vertical (dict): For the empty cells with a letter to the left or right, the set of letters
+            that form a valid horizontal word there (the constraint for vertical words).
+        rows (set): The rows that hold at least one placed letter.
+        columns (set): The columns that hold at least one placed letter.
+    """
+
+    def __init__(self, board_size, dictionary):
+        """
+        Initializes an empty CrossCheckCache.
+
+        Args:
+            board_size (int): The size of the board.
+            dictionary (CompiledDictionary): The valid words.
+        """
+        self.board_size = board_size
+        self.dictionary = dictionary
+        self.anchors = set()
+        self.horizontal = {}
+        self.vertical = {}
+        self.rows = set()
+        self.columns = set()
+
+    def copy(self):
+        """
+        Returns a copy of the cache that is not affected by later updates.
+
+        Returns:
+            CrossCheckCache: The copy of the cache.
+        """
+        cache = CrossCheckCache(self.board_size, self.dictionary)
+        cache.anchors = set(self.anchors)
+        cache.horizontal = dict(self.horizontal)
+        cache.vertical = dict(self.vertical)
+        cache.rows = set(self.rows)
+        cache.columns = set(self.columns)
+        return cache
+
+    def cross_check(self, position, direction):
+        """
+        Returns the letters that can be placed on an empty cell for a word in the given direction.
+
+        Args:
+            position (tuple): The position of the cell.
+            direction (str): The direction of the word ('horizontal' or 'vertical').
+
+        Returns:
+            frozenset: The allowed letters, or None if the cell has no perpendicular neighbors.
+        """
+        if direction == 'horizontal':
+            return self.horizontal.get(position)
+        return self.vertical.get(position)
+
+    def update(self, board, positions):
+        """
+        Updates the cache around newly placed letters.
+
+        Args:
+            board (BoardView): The letters on the board.
+            positions (iterable): The positions of the letters placed in the move.
+        """
+        horizontal_dirty = set()
+        vertical_dirty = set()
+
+        for row, col in positions:
+            self.anchors.discard((row, col))
+            self.horizontal.pop((row, col), None)
+            self.vertical.pop((row, col), None)
+            self.rows.add(row)
+            self.columns.add(col)
+
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                adj_row, adj_col = row + dr, col + dc
+                while 0 <= adj_row < self.board_size and 0 <= adj_col < self.board_size and \
+                        board.letter(adj_row, adj_col) is not None:
+                    adj_row, adj_col = adj_row + dr, adj_col + dc
+                if not (0 <= adj_row < self.board_size and 0 <= adj_col < self.board_size):
+                    continue
+                self.anchors.add((adj_row, adj_col))
+                if dr:
+                    horizontal_dirty.add((adj_row, adj_col))
+                else:
+                    vertical_dirty.add((adj_row, adj_col))
+
+        for row, col in horizontal_dirty:
+            self.horizontal[(row, col)] = self.compute_cross_check(board, row, col, 1, 0)
+        for row, col in vertical_dirty:
+            self.vertical[(row, col)] = self.compute_cross_check(board, row, col, 0, 1)
+
+    def remove(self, board, positions):
+        """
+        Updates the cache around letters removed from the board, e.g. when a move is undone.
+
+        The removed cells, and the first empty cells past the letters next to
+        them, are the only cells whose anchor and cross-checks can change.
+
+        Args:
+            board (BoardView): The letters on the board, without the removed letters.
+            positions (iterable): The positions of the removed letters.
+        """
+        dirty = set()
+        for row, col in positions:
+            dirty.add((row, col))
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                adj_row, adj_col = row + dr, col + dc
+                while 0 <= adj_row < self.board_size and 0 <= adj_col < self.board_size and \
+                        board.letter(adj_row, adj_col) is not None:
+                    adj_row, adj_col = adj_row + dr, adj_col + dc
+                if 0 <= adj_row < self.board_size and 0 <= adj_col < self.board_size:
+                    dirty.add((adj_row, adj_col))
+            if not board.line_mask(row, 'horizontal'):
+                self.rows.discard(row)
+            if not board.line_mask(col, 'vertical'):
+                self.columns.discard(col)
+
+        for row, col in dirty:
+            vertical_neighbors = any(0 <= adj_row < self.board_size and board.letter(adj_row, col) is not None
+                                     for adj_row in (row - 1, row + 1))
+            horizontal_neighbors = any(0 <= adj_col < self.board_size and board.letter(row, adj_col) is not None
+                                       for adj_col in (col - 1, col + 1))
+            if vertical_neighbors:
+                self.horizontal[(row, col)] = self.compute_cross_check(board, row, col, 1, 0)
+            else:
+                self.horizontal.pop((row, col), None)
+            if horizontal_neighbors:
+                self.vertical[(row, col)] = self.compute_cross_check(board, row, col, 0, 1)
+            else:
+                self.vertical.pop((row, col), None)
+            if vertical_neighbors or horizontal_neighbors:
+                self.anchors.add((row, col))
+            else:
+                self.anchors.discard((row, col))
+
+    def compute_cross_check(self, board, row, col, dr, dc):
+        """
+        Computes the letters that form a valid word with the letters around an empty cell.
+
+        The letters are read from the GADDAG in one walk instead of looking up
+        one word per letter: the path of the reversed prefix and the separator
+        leads to the letters that can follow the prefix, and each of them is
+        followed through the suffix.
+
+        Args:
+            board (BoardView): The letters on the board.
+            row (int): The row position of the empty cell.
+            col (int): The column position of the empty cell.
+            dr (int): The row step of the perpendicular word.
+            dc (int): The column step of the perpendicular word.
+
+        Returns:
+            frozenset: The letters that can be placed on the cell.
+        """
+        before = []
+        adj_row, adj_col = row - dr, col - dc
+        while 0 <= adj_row and 0 <= adj_col and board.letter(adj_row, adj_col) is not None:
+            before.append(board.letter(adj_row, adj_col))
+            adj_row, adj_col = adj_row - dr, adj_col - dc
+
+        after = []
+        adj_row, adj_col = row + dr, col + dc
+        while adj_row < self.board_size and adj_col < self.board_size and board.letter(adj_row, adj_col) is not None:
+            after.append(board.letter(adj_row, adj_col))
+            adj_row, adj_col = adj_row + dr, adj_col + dc
+
+        gaddag = self.dictionary.gaddag
+        edges = gaddag.edges
+        if before:
+            # rev(prefix) + SEPARATOR + letter + suffix, before already holds the prefix reversed
+            node = gaddag.root
+            for letter in before + [SEPARATOR]:
+                node = edges[node].get(letter)
+                if node is None:
+                    return frozenset()
+            starts = list(edges[node].items())
+        else:
+            # letter + SEPARATOR + suffix
+            starts = [(letter, edges[child].get(SEPARATOR)) for letter, child in edges[gaddag.root].items()
+                      if letter != SEPARATOR]
+
+        allowed = []
+        for letter, node in starts:
+            for next_letter in after:
+                if node is None:
+                    break
+                node = edges[node].get(next_letter)
+            if node is not None and gaddag.terminal[node]:
+                allowed.append(letter)
+        return frozenset(allowed)
@@ -0,0 +1,141 @@
+import pygame
+import Utils
+
+class Dialog:
+    """
+    A message drawn inside the game window, instead of in a separate Tk window.
+
+    A modal dialog is centered on the window, which is dimmed behind it, and
+    has an OK button: the game ignores the rest of the window until it is
+    closed. A toast is a small box at the top of the board without a button,
+    the game goes on while it is shown and closes it after a timeout or when
+    it is clicked.
+
+    Attributes:
+        title (str): The title of a modal dialog, not shown on a toast.
+        lines (list): The lines of the message, wrapped to the width of the box.
+        modal (bool): True for a modal dialog, False for a toast.
+        rect (pygame.Rect): The box of the message.
+        button_rect (pygame.Rect): The OK button of a modal dialog, None for a toast.
+        area (pygame.Rect): The region of the window the box is centered in.
+        padding (int): The space between the border of the box and its content.
+    """
+
+    def __init__(self, title, message, area, font, score_font, modal=True, width=400, padding=20):
+        """
+        Initializes the Dialog and lays out its box.
+
+        Args:
+            title (str): The title of a modal dialog.
+            message (str): The message.
+            area (pygame.Rect): The region of the window the box is centered in, e.g. the board for a toast.
+            font (pygame.font.Font): The font for the title and the button.
+            score_font (pygame.font.Font): The font for the message.
+            modal (bool): True for a modal dialog, False for a toast.
+            width (int): The maximum width of the box.
+            padding (int): The space between the border of the box and its content.
+        """
+        self.title = title
+        self.modal = modal
+        self.area = pygame.Rect(area)
+        self.padding = padding
+        self.lines = wrap_text(message, score_font, width - 2 * padding)
+
+        line_height = score_font.get_linesize()
+        if modal:
+            height = padding + font.get_linesize() + 10 + len(self.lines) * line_height + 20 + 40 + padding
+            self.rect = pygame.Rect(0, 0, width, height)
+            self.rect.center = self.area.center
+            self.button_rect = pygame.Rect(0, 0, 80, 40)
+            self.button_rect.midbottom = (self.rect.centerx, self.rect.bottom - padding)
+        else:
+            text_width = max(score_font.size(line)[0] for line in self.lines)
+            self.rect = pygame.Rect(0, 0, text_width + 2 * padding, len(self.lines) * line_height + padding)
+            self.rect.midtop = (self.area.centerx, self.area.top + 20)
+            self.button_rect = None
+
+    def dirty_rect(self):
+        """
+        Returns the region of the window the dialog changes, to redraw when it is opened or closed.
+
+        Returns:
+            pygame.Rect: The box for a toast, None for a modal dialog, which dims the whole window.
+        """
+        return None if self.modal else self.rect
+
+    def draw(self, screen, font, score_font, sprites):
+        """
+        Draws the dialog on the screen, over the rest of the frame.
+
+        Args:
+            screen (pygame.Surface): The screen to draw on.
+            font (pygame.font.Font): The font for the title and the button.
+            score_font (pygame.font.Font): The font for the message.
+            sprites (SpriteCache): The cache of the rendered texts.
+        """
+        text_color = Utils.hex_to_rgb('#d9d9d9')
+        line_height = score_font.get_linesize()
+
+        if self.modal:
+            shade = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 140))
+            screen.blit(shade, (0, 0))
+
+        Utils.draw_rounded_rect(screen, Utils.hex_to_rgb('#1a1b21'), self.rect, corner_radius=8)
+        pygame.draw.rect(screen, Utils.hex_to_rgb('#6B597F' if self.modal else '#a2869c'), self.rect, 2, border_radius=8)
+
+        y = self.rect.y + self.padding // 2
+        if self.modal:
+            title_text = sprites.text(self.title, font, (255, 255, 255))
+            screen.blit(title_text, (self.rect.centerx - title_text.get_width() // 2, self.rect.y + self.padding))
+            y = self.rect.y + self.padding + font.get_linesize() + 10
+
+        for line in self.lines:
+            line_text = sprites.text(line, score_font, text_color)
+            screen.blit(line_text, (self.rect.centerx - line_text.get_width() // 2, y))
+            y += line_height
+
+        if self.modal:
+            pygame.draw.rect(screen, Utils.hex_to_rgb('#92a1c2'), self.button_rect)
+            ok_text = sprites.text("OK", font, (0, 0, 0))
+            screen.blit(ok_text, (self.button_rect.centerx - ok_text.get_width() // 2,
+                                  self.button_rect.centery - ok_text.get_height() // 2))
+
+    def handle_click(self, pos):
+        """
+        Checks if a click closes the dialog.
+
+        Args:
+            pos (tuple): The position of the click.
+
+        Returns:
+            bool: True if the click was on the OK button of a modal dialog or on a toast, False otherwise.
+        """
+        if self.modal:
+            return self.button_rect.collidepoint(pos)
+        return self.rect.collidepoint(pos)
+
+def wrap_text(text, font, width):
+    """
+    Splits a text into lines that fit a width, breaking between words.
+
+    Args:
+        text (str): The text to split, its newlines are kept.
+        font (pygame.font.Font): The font the text is drawn with.
+        width (int): The maximum width of a line in pixels, a longer word gets a line of its own.
+
+    Returns:
+        list: The lines, at least one.
+    """
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and font.size(candidate)[0] > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
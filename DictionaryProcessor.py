@@ -1,10 +1,13 @@
+from CompiledDictionary import CompiledDictionary
+from Profiler import profiler
+
 class DictionaryProcessor:
     """
     Processes a dictionary file for the Scrabble game.
 
     Attributes:
         dictionary_path (str): The path to the dictionary file.
-        words (list): A list of words loaded from the dictionary file.
+        words (CompiledDictionary): The uppercased words loaded from the dictionary file.
         letters (set): A set of unique letters extracted from the words.
     """
 
@@ -13,7 +16,7 @@ class DictionaryProcessor:
         Initializes the DictionaryProcessor with the given dictionary file path.
 
         Args:
-            dictionary_path (str): The path to the dictionary file.
+            dictionary_path (str): The path to the dictionary file, plain or compressed with gzip or xz.
         """
         self.dictionary_path = dictionary_path
         self.words = self.load_dictionary()
@@ -21,13 +24,16 @@ class DictionaryProcessor:
 
     def load_dictionary(self):
         """
-        Loads the dictionary file and returns a list of words.
+        Loads the dictionary file from its compiled cache.
+
+        The word list is only parsed the first time (or after it changes); later
+        runs open the compiled file stored next to it.
 
         Returns:
-            list: A list of words from the dictionary file.
+            CompiledDictionary: The words from the dictionary file.
         """
-        with open(self.dictionary_path, 'r') as file:
-            return [line.strip() for line in file]
+        with profiler.span('load_dictionary'):
+            return CompiledDictionary.load(self.dictionary_path)
 
     def extract_letters(self):
         """
@@ -36,7 +42,4 @@ class DictionaryProcessor:
         Returns:
             set: A set of unique letters from the words.
         """
-        letters = set()
-        for word in self.words:
-            letters.update(word)
-        return letters
\ No newline at end of file
+        return set(self.words.alphabet)
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pygame
+
+class FrameScheduler:
+    """
+    Paces the main loop of the game.
+
+    When nothing is animating the loop blocks on pygame.event.wait, so an idle
+    window does not use the CPU. While something is animating the loop is
+    woken at most target_fps times per second.
+
+    Attributes:
+        target_fps (int): The frame rate cap while something is animating.
+        idle_timeout (int): The milliseconds to block waiting for an event when nothing is animating.
+        clock (pygame.time.Clock): The clock used to cap the frame rate.
+    """
+
+    def __init__(self, target_fps, idle_timeout):
+        """
+        Initializes the FrameScheduler with the given frame rate and idle timeout.
+
+        Args:
+            target_fps (int): The frame rate cap while something is animating.
+            idle_timeout (int): The milliseconds to block waiting for an event when nothing is animating.
+        """
+        self.target_fps = target_fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+
+    def wait_events(self, animating):
+        """
+        Waits for the next frame and returns the pending events.
+
+        Args:
+            animating (bool): True if something on the screen is animating.
+
+        Returns:
+            list: The events received since the previous frame.
+        """
+        if animating:
+            self.clock.tick(self.target_fps)
+            return pygame.event.get()
+
+        event = pygame.event.wait(self.idle_timeout)
+        self.clock.tick()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
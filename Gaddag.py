@@ -0,0 +1,239 @@
+from array import array
+
+SEPARATOR = '>'
+
+class LazyEdges(dict):
+    """
+    The edges of a GADDAG read from flat arrays, converted to dicts on first access.
+
+    Only the nodes visited by the move search are ever converted, so a GADDAG
+    opened from a compiled dictionary is usable right away.
+
+    Attributes:
+        first_edge (memoryview): For every node, the index of its first edge (one extra entry at the end).
+        edge_letters (memoryview): For every edge, the index of its letter in the alphabet.
+        edge_targets (memoryview): For every edge, the index of its child node.
+        alphabet (str): The letters of the GADDAG, including the separator.
+    """
+
+    def __init__(self, first_edge, edge_letters, edge_targets, alphabet):
+        """
+        Initializes the LazyEdges over the given arrays.
+
+        Args:
+            first_edge (memoryview): For every node, the index of its first edge.
+            edge_letters (memoryview): For every edge, the index of its letter in the alphabet.
+            edge_targets (memoryview): For every edge, the index of its child node.
+            alphabet (str): The letters of the GADDAG, including the separator.
+        """
+        super().__init__()
+        self.first_edge = first_edge
+        self.edge_letters = edge_letters
+        self.edge_targets = edge_targets
+        self.alphabet = alphabet
+
+    def __missing__(self, node):
+        edges = {self.alphabet[self.edge_letters[i]]: self.edge_targets[i]
+                 for i in range(self.first_edge[node], self.first_edge[node + 1])}
+        self[node] = edges
+        return edges
+
+    def __len__(self):
+        return len(self.first_edge) - 1
+
+class Gaddag:
+    """
+    A minimized GADDAG built from the words of a dictionary.
+
+    For every word a1..an and every split point i the GADDAG stores the path
+    rev(a1..ai) + SEPARATOR + a(i+1)..an, so a word can be grown in both
+    directions starting from any of its letters. Equivalent suffixes are
+    shared, which keeps the structure small enough for large word lists.
+
+    Attributes:
+        edges (list): For every node, a dict mapping a letter to the child node index.
+        terminal (list): For every node, True if a complete word ends at that node.
+        root (int): The index of the root node.
+    """
+
+    def __init__(self, words=()):
+        """
+        Initializes the Gaddag from the given words.
+
+        Args:
+            words (iterable): The words to store in the GADDAG.
+        """
+        self.edges = [{}]
+        self.terminal = [False]
+        self.root = 0
+        self.build(words)
+
+    @classmethod
+    def from_arrays(cls, first_edge, edge_letters, edge_targets, terminal, alphabet):
+        """
+        Creates a Gaddag over flat arrays, as written by to_arrays.
+
+        Args:
+            first_edge (memoryview): For every node, the index of its first edge.
+            edge_letters (memoryview): For every edge, the index of its letter in the alphabet.
+            edge_targets (memoryview): For every edge, the index of its child node.
+            terminal (memoryview): For every node, 1 if a complete word ends at that node.
+            alphabet (str): The letters of the GADDAG, including the separator.
+
+        Returns:
+            Gaddag: The GADDAG reading its nodes from the arrays.
+        """
+        gaddag = cls.__new__(cls)
+        gaddag.edges = LazyEdges(first_edge, edge_letters, edge_targets, alphabet)
+        gaddag.terminal = terminal
+        gaddag.root = 0
+        return gaddag
+
+    def to_arrays(self, alphabet):
+        """
+        Flattens the GADDAG into arrays that can be written to a file.
+
+        Args:
+            alphabet (str): The letters of the GADDAG, including the separator.
+
+        Returns:
+            tuple: The first_edge, edge_letters, edge_targets and terminal arrays.
+        """
+        letter_codes = {letter: code for code, letter in enumerate(alphabet)}
+        first_edge = array('I', [0])
+        edge_letters = bytearray()
+        edge_targets = array('I')
+        for edges in self.edges:
+            for letter, child in sorted(edges.items()):
+                edge_letters.append(letter_codes[letter])
+                edge_targets.append(child)
+            first_edge.append(len(edge_targets))
+        terminal = bytes(1 if flag else 0 for flag in self.terminal)
+        return first_edge, edge_letters, edge_targets, terminal
+
+    @staticmethod
+    def paths_for_word(word):
+        """
+        Returns all the GADDAG paths for a word.
+
+        Args:
+            word (str): The word to expand.
+
+        Returns:
+            list: A list of strings, one for every split point of the word.
+        """
+        return [word[:i][::-1] + SEPARATOR + word[i:] for i in range(1, len(word) + 1)]
+
+    @staticmethod
+    def paths_starting_with(word, letter):
+        """
+        Returns the GADDAG paths for a word that start with a given letter.
+
+        A path starts with the letter before its split point.
+
+        Args:
+            word (str): The word to expand.
+            letter (str): The first letter of the paths.
+
+        Returns:
+            list: A list of strings, one for every occurrence of the letter in the word.
+        """
+        paths = []
+        index = word.find(letter)
+        while index >= 0:
+            paths.append(word[:index + 1][::-1] + SEPARATOR + word[index + 1:])
+            index = word.find(letter, index + 1)
+        return paths
+
+    def build(self, words):
+        """
+        Builds the minimized GADDAG from the given words.
+
+        The paths are inserted in sorted order and equivalent nodes are merged
+        as soon as they can no longer change (Daciuk's incremental algorithm).
+        Every path starts with a letter, so the paths are generated and sorted
+        one first letter at a time and only the paths of a single letter are
+        held in memory. The words are iterated once per letter.
+
+        Args:
+            words (iterable): The words to store in the GADDAG, a collection that can be iterated several times.
+        """
+        letters = set()
+        for word in words:
+            letters.update(word)
+        register = {}
+        unchecked = []
+        previous = ''
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = (self.terminal[child], tuple(sorted(self.edges[child].items())))
+                if key in register:
+                    self.edges[parent][letter] = register[key]
+                    self.edges[child] = None  # The duplicate node is unreachable, free its edges
+                else:
+                    register[key] = child
+
+        for first in sorted(letters):
+            paths = sorted({path for word in words if first in word for path in self.paths_starting_with(word, first)})
+            for path in paths:
+                common = 0
+                for letter, previous_letter in zip(path, previous):
+                    if letter != previous_letter:
+                        break
+                    common += 1
+                minimize(common)
+
+                node = unchecked[-1][2] if unchecked else self.root
+                for letter in path[common:]:
+                    child = len(self.edges)
+                    self.edges.append({})
+                    self.terminal.append(False)
+                    self.edges[node][letter] = child
+                    unchecked.append((node, letter, child))
+                    node = child
+                self.terminal[node] = True
+                previous = path
+        minimize(0)
+        register.clear()  # Free the merged node keys before the nodes are renumbered
+        self.compact()
+
+    def compact(self):
+        """
+        Renumbers the nodes so that only the nodes reachable from the root are kept.
+        """
+        order = {self.root: 0}
+        queue = [self.root]
+        for node in queue:
+            for child in self.edges[node].values():
+                if child not in order:
+                    order[child] = len(queue)
+                    queue.append(child)
+
+        edges = []
+        for node in queue:
+            edges.append({letter: order[child] for letter, child in self.edges[node].items()})
+            self.edges[node] = None  # Free the old nodes as they are copied
+        self.edges = edges
+        self.terminal = [self.terminal[node] for node in queue]
+        self.root = 0
+
+    def contains(self, word):
+        """
+        Checks if a word is stored in the GADDAG.
+
+        Args:
+            word (str): The word to look up.
+
+        Returns:
+            bool: True if the word is in the GADDAG, False otherwise.
+        """
+        if not word:
+            return False
+        node = self.root
+        for letter in word[::-1] + SEPARATOR:
+            node = self.edges[node].get(letter)
+            if node is None:
+                return False
+        return self.terminal[node]
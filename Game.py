@@ -1,19 +1,36 @@
+import logging
 import pygame
 import sys
-import random
 import Utils
 from Board import Board
 from Menu import Menu
-from Cell import Cell
-from constants import letters, letter_scores, special_tiles
-import tkinter as tk
-from tkinter import messagebox
+from constants import target_fps, idle_timeout, opponent_workers, opponent_difficulty, save_path, profile_path
+from constants import log_level, log_buffer_level, log_buffer_size, crash_log_path, toast_duration
+from Dialog import Dialog
+from DictionaryProcessor import DictionaryProcessor
+from GameEngine import GameEngine
+from LogBuffer import configure_logging
+from MoveLog import OPPONENT_KINDS
 from Opponent import Opponent
+from Profiler import profiler
+from SpriteCache import SpriteCache
+from WordIndex import WordIndex
+from FrameScheduler import FrameScheduler
+
+OPPONENT_PROGRESS_EVENT = pygame.event.custom_type()
+OPPONENT_MOVE_EVENT = pygame.event.custom_type()
+TOAST_EXPIRED_EVENT = pygame.event.custom_type()
+
+logger = logging.getLogger(__name__)
 
 class Game:
     """
     Represents the Scrabble game.
 
+    The game is the pygame front end of a GameEngine, which holds the board
+    and the rules: the game only turns mouse events into engine calls and
+    draws the state of the engine.
+
     Attributes:
         dictionary_path (str): The path to the dictionary file.
         board_size (int): The size of the board.
@@ -25,177 +42,435 @@ class Game:
         screen (pygame.Surface): The screen to draw on.
         font (pygame.font.Font): The font for drawing letters.
         score_font (pygame.font.Font): The font for drawing scores.
+        sprites (SpriteCache): The cache of the rendered tiles and texts.
+        engine (GameEngine): The state and the rules of the game.
         board (Board): The game board.
         menu (Menu): The game menu.
         dragged_letter (str): The letter being dragged.
         dragged_letter_offset (tuple): The offset of the dragged letter.
-        dragged_letter_pos (tuple): The position of the dragged letter.
-        letter_from_board (tuple): The position of the letter from the board.
-        locked_letters (set): The set of locked letters.
-        total_score (int): The total score of the player.
-        words (list): The list of words found on the board.
-        current_iteration_words (list): The list of words found in the current iteration.
-        iteration (int): The current iteration number.
-        board_matrix (list): The matrix representing the board.
-        previous_placed_letters (set): The set of previously placed letters.
+        dragged_letter_rect (pygame.Rect): The rectangle where the dragged letter is drawn.
         opponent (Opponent): The opponent player.
+        dirty_rects (list): The regions of the window to redraw on the next frame.
+        scheduler (FrameScheduler): The pacing of the main loop.
+        opponent_search (int): The number of the latest opponent search, used to drop stale results.
+        opponent_cancel (threading.Event): The event cancelling the running opponent search, None if it is not thinking.
+        opponent_progress (float): The searched fraction of the board in the running opponent search.
+        hints (list): The best moves of the last hint as (score, move) tuples, None if no hint is shown.
+        profile_path (str): The file the Chrome trace is written to when the game exits, None if not profiling.
+        log_buffer (LogBuffer): The latest log messages, written to the crash log if the game crashes.
+        dialog (Dialog): The message shown over the window, None if there is none.
     """
 
-    def __init__(self, dictionary_path):
+    def __init__(self, dictionary_path, target_fps=target_fps, opponent_workers=opponent_workers,
+                 opponent_difficulty=opponent_difficulty, profile_path=profile_path):
         """
         Initializes the Game with the given dictionary file path.
 
         Args:
             dictionary_path (str): The path to the dictionary file.
+            target_fps (int): The frame rate cap while a tile is being dragged.
+            opponent_workers (int): The number of processes searching for the opponent's moves.
+            opponent_difficulty (str): The level of the opponent, a key of constants.difficulty_levels.
+            profile_path (str): The file the Chrome trace is written to when the game exits, None to disable
+                the profiler.
         """
         self.dictionary_path = dictionary_path
+        self.profile_path = profile_path
+        if profile_path:
+            profiler.enable()
+        self.log_buffer = configure_logging(log_level, log_buffer_level, log_buffer_size)
         self.board_size = 15
         self.cell_size = 45
         self.margin = 3
         self.menu_height = 80
         self.score_menu = 300
         self.screen_size = self.board_size * (self.cell_size + self.margin) + self.margin
-        print("BOARD SIZE: ", self.screen_size)
+        logger.debug("Board size: %d", self.screen_size)
 
         pygame.init()
         self.screen = pygame.display.set_mode((self.screen_size + self.score_menu, self.screen_size + self.menu_height))
         pygame.display.set_caption("Scrabble Game")
         self.font = pygame.font.Font(None, 36)
         self.score_font = pygame.font.Font(None, 20)
+        self.sprites = SpriteCache(self.cell_size)
 
-        self.board = Board(self.board_size, self.cell_size, self.margin)
-        self.menu = Menu(self.screen_size, self.cell_size, self.margin, self.menu_height, dictionary_path, self)
+        dictionary = DictionaryProcessor(dictionary_path).words
+        self.engine = GameEngine(dictionary, self.board_size, word_index=WordIndex(dictionary))
+        self.board = Board(self.board_size, self.cell_size, self.margin, self.engine.view)
+        self.menu = Menu(self.screen_size, self.cell_size, self.margin, self.menu_height, self)
 
         self.dragged_letter = None
         self.dragged_letter_offset = (0, 0)
-        self.dragged_letter_pos = None
-        self.letter_from_board = None
-        self.locked_letters = set()
-        self.total_score = 0
-        self.words = []
-        self.current_iteration_words = []
-        self.iteration = 0
-        self.board_matrix = [[None for _ in range(self.board_size)] for _ in range(self.board_size)]
-        self.previous_placed_letters = set()
-        self.opponent = Opponent(self)
+        self.dragged_letter_rect = None
+        self.opponent = Opponent(self.engine, opponent_workers, opponent_difficulty)
+        self.dirty_rects = []
+        self.scheduler = FrameScheduler(target_fps, idle_timeout)
+        self.opponent_search = 0
+        self.opponent_cancel = None
+        self.opponent_progress = 0
+        self.hints = None
+        self.dialog = None
 
     def run(self):
         """
         Runs the main game loop.
+
+        A frame is only composed when a region of the window was invalidated,
+        and only the invalidated regions are pushed to the display. The loop
+        sleeps until the next event unless a tile is being dragged, in which
+        case it runs at most at the target frame rate. If the loop crashes, the
+        latest log messages are written to the crash log.
         """
-        while True:
-            self.screen.fill(Utils.hex_to_rgb('#1a1b21'))
-            self.board.draw(self.screen, self.font, self.score_font)
-            self.menu.draw(self.screen, self.font, self.score_font)
-            self.draw_score()
+        self.invalidate()
+        try:
+            while True:
+                if self.dirty_rects:
+                    with profiler.span('frame'):
+                        self.draw()
+                        pygame.display.update(self.dirty_rects)
+                    self.dirty_rects = []
+
+                for event in self.scheduler.wait_events(animating=self.dragged_letter is not None):
+                    if event.type == pygame.QUIT:
+                        if self.is_opponent_thinking():
+                            self.opponent_cancel.set()
+                        self.opponent.shutdown()
+                        self.write_profile()
+                        pygame.quit()
+                        sys.exit()
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        self.handle_mouse_button_down(event)
+                    elif event.type == pygame.MOUSEBUTTONUP:
+                        self.handle_mouse_button_up(event)
+                    elif event.type == pygame.KEYDOWN:
+                        self.handle_key_down(event)
+                    elif event.type == pygame.MOUSEMOTION and self.dragged_letter:
+                        self.invalidate(self.dragged_letter_rect)
+                        self.dragged_letter_rect = pygame.Rect(event.pos[0] - self.dragged_letter_offset[0],
+                                                               event.pos[1] - self.dragged_letter_offset[1],
+                                                               self.cell_size, self.cell_size)
+                        self.invalidate(self.dragged_letter_rect)
+                    elif event.type in (OPPONENT_PROGRESS_EVENT, OPPONENT_MOVE_EVENT):
+                        self.handle_opponent_event(event)
+                    elif event.type == TOAST_EXPIRED_EVENT and self.dialog is not None and not self.dialog.modal:
+                        self.close_dialog()
+                    elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self.invalidate()
+        except Exception:
+            logger.exception("The game crashed")
+            self.log_buffer.dump(crash_log_path)  # The latest messages, for a post-mortem
+            raise
+
+    def write_profile(self):
+        """
+        Writes the Chrome trace of the game and logs the summary of the profiler, if it is enabled.
+        """
+        if self.profile_path:
+            profiler.write_trace(self.profile_path)
+            logger.info("%s", profiler.summary())
 
-            if self.dragged_letter:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                Utils.draw_rounded_rect(self.screen, Utils.hex_to_rgb('#b79d9b'), (
-                    mouse_x - self.dragged_letter_offset[0], mouse_y - self.dragged_letter_offset[1], self.cell_size, self.cell_size),
-                    corner_radius=8)
-                letter_text = self.font.render(self.dragged_letter, True, (255, 255, 255))
-                self.screen.blit(letter_text, (mouse_x - self.dragged_letter_offset[0] + (self.cell_size - letter_text.get_width()) // 2,
-                                               mouse_y - self.dragged_letter_offset[1] + (self.cell_size - letter_text.get_height()) // 2))
+    def invalidate(self, rect=None):
+        """
+        Marks a region of the window to be redrawn on the next frame.
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self.handle_mouse_button_down(event)
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    self.handle_mouse_button_up(event)
+        Args:
+            rect (pygame.Rect): The region to redraw, None for the whole window.
+        """
+        self.dirty_rects.append(pygame.Rect(rect) if rect else self.screen.get_rect())
 
-            pygame.display.flip()
+    def invalidate_cells(self, positions):
+        """
+        Marks board cells to be redrawn, with the borders drawn between them and their neighbors.
 
-    def validate_new_word(self):
+        Args:
+            positions (iterable): The (row, col) positions of the cells.
         """
-        Validates the new words added in the current iteration.
+        for row, col in positions:
+            self.invalidate(self.board.cell_rect(row, col).inflate(self.margin * 6, self.margin * 6))
 
-        Returns:
-            tuple: A boolean indicating if the words are valid and the invalid word if any.
+    def invalidate_panel(self):
+        """
+        Marks the side panel with the scores, the opponent's progress and the hints to be redrawn.
         """
-        if not self.current_iteration_words:
-            return False, "No new word added"
+        self.invalidate((self.screen_size, 0, self.score_menu, self.screen_size))
 
-        for word in self.current_iteration_words:
-            word_str = ''.join([letter for letter, _ in word])
-            if word_str not in self.menu.dictionary:
-                return False, word_str
-        return True, None
+    def invalidate_menu(self):
+        """
+        Marks the menu bar with the rack and the buttons to be redrawn.
+        """
+        self.invalidate((0, self.screen_size, self.screen.get_width(), self.menu_height))
+
+    def draw(self):
+        """
+        Composes the frame, limited to the invalidated regions of the window.
+        """
+        self.screen.set_clip(self.dirty_rects[0].unionall(self.dirty_rects[1:]))
+        self.screen.fill(Utils.hex_to_rgb('#1a1b21'))
+        self.board.draw(self.screen, self.font, self.score_font, self.sprites)
+        self.menu.draw(self.screen, self.font, self.score_font, self.sprites)
+        self.draw_score()
+
+        if self.dragged_letter:
+            self.screen.blit(self.sprites.tile(self.dragged_letter, self.font, None, Utils.hex_to_rgb('#b79d9b'), (255, 255, 255)),
+                             self.dragged_letter_rect)
+        if self.dialog is not None:
+            self.dialog.draw(self.screen, self.font, self.score_font, self.sprites)
+        self.screen.set_clip(None)
+
+    def show_message(self, title, message, modal=True):
+        """
+        Shows a message over the window, replacing the one shown before.
+
+        Args:
+            title (str): The title of the message.
+            message (str): The message.
+            modal (bool): True for a dialog closed with its OK button, False for a toast over the board
+                that closes itself after constants.toast_duration.
+        """
+        self.close_dialog()
+        if modal:
+            self.dialog = Dialog(title, message, self.screen.get_rect(), self.font, self.score_font)
+        else:
+            self.dialog = Dialog(title, message, (0, 0, self.screen_size, self.screen_size), self.font, self.score_font,
+                                 modal=False)
+            pygame.time.set_timer(TOAST_EXPIRED_EVENT, toast_duration, loops=1)  # Restarts the timer of a previous toast
+        self.invalidate(self.dialog.dirty_rect())
+
+    def close_dialog(self):
+        """
+        Removes the message shown over the window, if any.
+        """
+        if self.dialog is not None:
+            self.invalidate(self.dialog.dirty_rect())
+            self.dialog = None
 
     def handle_mouse_button_down(self, event):
         """
         Handles the mouse button down event.
 
+        While a modal dialog is shown, the clicks only go to its OK button.
+
         Args:
             event (pygame.event.Event): The event object.
         """
         mouse_x, mouse_y = event.pos
+        if self.dialog is not None and self.dialog.handle_click(event.pos):
+            self.close_dialog()
+            return
+        if self.dialog is not None and self.dialog.modal:
+            return
 
         button_action = self.menu.handle_button_click(event.pos)
+        if self.is_opponent_thinking():
+            if button_action == "cancel":
+                self.cancel_opponent_turn()
+            return
+
         if button_action == "submit":
-            self.find_word()  # Ensure words are found before validation
-            valid, invalid_word = self.validate_new_word()
-            if not valid:
-                root = tk.Tk()
-                root.withdraw()  # Hide the root window
-                messagebox.showerror("Error", f"The word '{invalid_word}' is not in the dictionary.")
-                root.destroy()
-                return
-            if not self.board.placed_letters or self.board.placed_letters.keys() == self.previous_placed_letters:
-                root = tk.Tk()
-                root.withdraw()  # Hide the root window
-                messagebox.showerror("Error", "No new words have been added.")
-                root.destroy()
-                return
-            self.previous_placed_letters = set(self.board.placed_letters.keys())
-            self.locked_letters.update(self.board.placed_letters.keys())
-            if self.iteration > 0 and not self.check_words_connected():
-                root = tk.Tk()
-                root.withdraw()  # Hide the root window
-                messagebox.showerror("Error", "Words are not connected!")
-                root.destroy()
-                self.locked_letters.difference_update(self.board.placed_letters.keys())
+            submitted = list(self.engine.pending_positions)
+            error = self.engine.submit()
+            if error:
+                self.show_message("Error", error, modal=False)
                 return
-            self.calculate_score()
-            self.iteration += 1
-            self.print_board_matrix()  # Print the matrix after submitting
-            for word in self.current_iteration_words:
-                print(f"Word added: {''.join([letter for letter, _ in word])}")
-            self.menu.replace_letters()  # Generate new letters only when words are connected
+            self.menu.update_letter_positions()
+            self.invalidate_cells(submitted)
+            self.invalidate_menu()
+            self.invalidate_panel()
+            self.clear_hints()
 
             # Opponent makes a move
-            self.opponent.make_move()
+            self.start_opponent_turn()
 
         elif button_action == "shuffle":
             self.menu.shuffle_letters()
+            self.invalidate_menu()
+            return
+
+        elif button_action == "hint":
+            self.show_hints()
+            return
+
+        elif button_action == "undo":
+            self.undo()
+            return
+
+        elif button_action == "redo":
+            self.redo()
             return
 
-        for i, (letter, pos) in enumerate(zip(self.menu.menu_letters, self.menu.menu_letter_positions)):
+        for i, (letter, pos) in enumerate(zip(self.engine.rack, self.menu.menu_letter_positions)):
             x, y = pos
             if x <= mouse_x <= x + self.cell_size and y <= mouse_y <= y + self.cell_size:
                 self.dragged_letter = letter
-                self.dragged_letter_pos = (x, y)
                 self.dragged_letter_offset = (mouse_x - x, mouse_y - y)
-                self.menu.menu_letters.pop(i)
+                self.dragged_letter_rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
+                self.engine.rack.pop(i)
                 self.menu.menu_letter_positions.pop(i)
+                self.invalidate(self.dragged_letter_rect)
                 return
 
-        for (row, col), letter in list(self.board.placed_letters.items()):
-            if (row, col) in self.locked_letters:
-                continue
+        for row, col in list(self.engine.pending_positions):  # Only the letters that are not submitted yet can be moved
             x = self.margin + col * (self.cell_size + self.margin)
             y = self.margin + row * (self.cell_size + self.margin)
             if x <= mouse_x <= x + self.cell_size and y <= mouse_y <= y + self.cell_size:
-                self.dragged_letter = letter
-                self.dragged_letter_pos = (x, y)
+                self.dragged_letter = self.engine.remove_letter(row, col)
                 self.dragged_letter_offset = (mouse_x - x, mouse_y - y)
-                self.letter_from_board = (row, col)
-                del self.board.placed_letters[(row, col)]
-                self.board.cell_colors[(row, col)] = Cell.get_cell_color(row, col)
+                self.dragged_letter_rect = pygame.Rect(x, y, self.cell_size, self.cell_size)
+                self.invalidate_cells([(row, col)])
+                return
+
+    def handle_key_down(self, event):
+        """
+        Handles the keyboard shortcuts: Ctrl+Z undoes, Ctrl+Y redoes, Ctrl+S saves and Ctrl+O loads the game.
+
+        While a modal dialog is shown, Enter and Escape close it and the shortcuts are ignored.
+
+        Args:
+            event (pygame.event.Event): The event object.
+        """
+        if self.dialog is not None and self.dialog.modal:
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_ESCAPE):
+                self.close_dialog()
+            return
+        if not event.mod & pygame.KMOD_CTRL or self.dragged_letter or self.is_opponent_thinking():
+            return
+        if event.key == pygame.K_z:
+            self.undo()
+        elif event.key == pygame.K_y:
+            self.redo()
+        elif event.key == pygame.K_s:
+            self.engine.save_game(save_path)
+        elif event.key == pygame.K_o:
+            try:
+                self.engine.load_game(save_path)
+            except (OSError, ValueError) as error:
+                self.show_message("Error", f"The game cannot be loaded: {error}", modal=False)
                 return
+            self.history_changed(None)
+
+    def undo(self):
+        """
+        Undoes the last action of the player, and the opponent's moves made after it.
+        """
+        entry = self.engine.undo()
+        cells = []
+        while entry is not None:
+            cells.extend(entry[1])
+            if entry[0] not in OPPONENT_KINDS:
+                break
+            entry = self.engine.undo()
+        self.history_changed(cells)
+
+    def redo(self):
+        """
+        Redoes the next undone action of the player, and the opponent's moves made after it.
+        """
+        entry = self.engine.redo()
+        cells = list(entry[1]) if entry is not None else []
+        while self.engine.log.upcoming() is not None and self.engine.log.upcoming()[0] in OPPONENT_KINDS:
+            cells.extend(self.engine.redo()[1])
+        self.history_changed(cells)
+
+    def history_changed(self, cells):
+        """
+        Brings the window up to date after the board was changed through the log.
+
+        Args:
+            cells (list): The (row, col, letter) cells that changed, None to redraw the whole board.
+        """
+        self.opponent.total_score = self.engine.log.score(OPPONENT_KINDS)
+        self.menu.update_letter_positions()
+        if cells is None:
+            self.invalidate()
+        else:
+            self.invalidate_cells((row, col) for row, col, _ in cells)
+            self.invalidate_menu()
+            self.invalidate_panel()
+        self.clear_hints()
+
+    def show_hints(self):
+        """
+        Shows the best moves for the rack, the best one as ghost tiles on the board.
+
+        The search has a fixed time budget, so the window does not freeze on crowded boards.
+        """
+        self.clear_hints()
+        self.hints = self.engine.find_hints()
+        if self.hints:
+            _, (word, (row, col), direction) = self.hints[0]
+            dr, dc = (0, 1) if direction == 'horizontal' else (1, 0)
+            self.board.ghost_tiles = [(letter, (row + dr * i, col + dc * i)) for i, letter in enumerate(word)]
+        self.invalidate_cells(position for _, position in self.board.ghost_tiles)
+        self.invalidate_panel()
+
+    def clear_hints(self):
+        """
+        Removes the hint from the window, once the board has changed.
+        """
+        if self.hints is None:
+            return
+        self.invalidate_cells(position for _, position in self.board.ghost_tiles)
+        self.invalidate_panel()
+        self.hints = None
+        self.board.ghost_tiles = []
+
+    def is_opponent_thinking(self):
+        """
+        Checks if the opponent is searching for its move.
+
+        Returns:
+            bool: True while the opponent search is running, False otherwise.
+        """
+        return self.opponent_cancel is not None
+
+    def start_opponent_turn(self):
+        """
+        Starts the opponent's move search in a worker thread.
+
+        The worker reports back through pygame events, which are handled on the main thread.
+        """
+        self.opponent_search += 1
+        search = self.opponent_search
+        self.opponent_progress = 0
+        self.opponent_cancel = self.opponent.start_move(
+            lambda progress: pygame.event.post(pygame.event.Event(OPPONENT_PROGRESS_EVENT, progress=progress, search=search)),
+            lambda move: pygame.event.post(pygame.event.Event(OPPONENT_MOVE_EVENT, move=move, search=search)))
+        self.invalidate_menu()  # The cancel button replaces the undo and redo buttons
+        self.invalidate_panel()
+
+    def handle_opponent_event(self, event):
+        """
+        Handles the progress and the result of the opponent search.
+
+        Args:
+            event (pygame.event.Event): The event posted by the opponent search.
+        """
+        if not self.is_opponent_thinking() or event.search != self.opponent_search:
+            return  # The search was cancelled
+
+        if event.type == OPPONENT_PROGRESS_EVENT:
+            self.opponent_progress = event.progress
+            self.invalidate_panel()
+        else:
+            self.opponent_cancel = None
+            placed_word = self.opponent.apply_move(event.move)
+            self.invalidate_menu()
+            self.invalidate_panel()
+            self.clear_hints()
+            if placed_word is None:
+                self.end_game()
+            else:
+                self.invalidate_cells(position for _, position in placed_word)
+
+    def cancel_opponent_turn(self):
+        """
+        Cancels the opponent search, the opponent forfeits its turn.
+        """
+        self.opponent_cancel.set()
+        self.opponent_cancel = None
+        self.opponent.forfeit()
+        self.invalidate_menu()
+        self.invalidate_panel()
 
     def handle_mouse_button_up(self, event):
         """
@@ -205,75 +480,49 @@ class Game:
             event (pygame.event.Event): The event object.
         """
         if self.dragged_letter:
+            self.invalidate(self.dragged_letter_rect)
             mouse_x, mouse_y = event.pos
             col = (mouse_x - self.margin) // (self.cell_size + self.margin)
             row = (mouse_y - self.margin) // (self.cell_size + self.margin)
 
-            if 0 <= row < self.board_size and 0 <= col < self.board_size and not self.board_matrix[row][col]:
-                if self.letter_from_board:
-                    self.board_matrix[self.letter_from_board[0]][self.letter_from_board[1]] = None  # Remove letter from previous position
-                self.board.placed_letters[(row, col)] = self.dragged_letter
-                self.board.cell_colors[(row, col)] = Utils.hex_to_rgb('#b79d9b')
-                self.board_matrix[row][col] = (self.dragged_letter, self.iteration)
-                self.print_board_matrix()  # Print the matrix after placing a letter
+            if self.engine.place_letter(row, col, self.dragged_letter):
+                self.invalidate_cells([(row, col)])
             else:
-                if self.letter_from_board:
-                    self.board_matrix[self.letter_from_board[0]][self.letter_from_board[1]] = None  # Remove letter from previous position
-                    self.menu.menu_letters.append(self.dragged_letter)
-                else:
-                    self.menu.menu_letters.append(self.dragged_letter)
-
-                total_menu_width = len(self.menu.menu_letters) * (self.cell_size + self.margin * 2) - self.margin * 2
-                start_x = (self.screen_size - total_menu_width) // 2
-                self.menu.menu_letter_positions = [
-                    (start_x + i * (self.cell_size + self.margin * 2), self.screen_size + (self.menu_height - self.cell_size) // 2)
-                    for i in range(len(self.menu.menu_letters))
-                ]
+                self.engine.rack.append(self.dragged_letter)
+                self.menu.update_letter_positions()
+                self.invalidate_menu()
 
             self.dragged_letter = None
-            self.dragged_letter_pos = None
+            self.dragged_letter_rect = None
             self.dragged_letter_offset = (0, 0)
-            self.letter_from_board = None
-
-    def calculate_score(self):
-        """
-        Calculates the score for the current iteration.
-        """
-        score = 0
-        for word in self.current_iteration_words:
-            word_score = 0
-            word_multiplier = 1
-            for letter, (row, col) in word:
-                letter_score = letter_scores[letter]
-                if (row, col) in special_tiles:
-                    tile_type = special_tiles[(row, col)]
-                    if tile_type == 'DL':
-                        letter_score *= 2
-                    elif tile_type == 'TL':
-                        letter_score *= 3
-                    elif tile_type == 'DW':
-                        word_multiplier *= 2
-                    elif tile_type == 'TW':
-                        word_multiplier *= 3
-                word_score += letter_score
-            word_score *= word_multiplier
-            score += word_score
-        self.total_score += score
-        print(f"Score for this turn: {score}")
-        print(f"Total score: {self.total_score}")
 
     def draw_score(self):
         """
         Draws the player's and opponent's scores on the screen.
         """
         # Draw player's score
-        player_score_text = self.font.render(f"Player Score: {self.total_score}", True, (255, 255, 255))
+        player_score_text = self.sprites.text(f"Player Score: {self.engine.total_score}", self.font, (255, 255, 255))
         self.screen.blit(player_score_text, (self.screen_size + 20, 20))
 
         # Draw opponent's score
-        opponent_score_text = self.font.render(f"Opponent Score: {self.opponent.total_score}", True, (255, 255, 255))
+        opponent_score_text = self.sprites.text(f"Opponent Score: {self.opponent.total_score}", self.font, (255, 255, 255))
         self.screen.blit(opponent_score_text, (self.screen_size + 20, 60))
 
+        # Draw the thinking indicator
+        if self.is_opponent_thinking():
+            # Rendered without the cache, the percentage changes with every progress event
+            thinking_text = self.score_font.render(f"Opponent is thinking... {int(self.opponent_progress * 100)}%",
+                                                   True, Utils.hex_to_rgb('#d9d9d9'))
+            self.screen.blit(thinking_text, (self.screen_size + 20, 100))
+
+        # Draw the best moves of the hint
+        if self.hints is not None:
+            lines = [f"{word} at {row + 1}, {col + 1} {direction}: {score} points"
+                     for score, (word, (row, col), direction) in self.hints] or ["No move found"]
+            for i, line in enumerate(["Hint:"] + lines):
+                hint_text = self.sprites.text(line, self.score_font, Utils.hex_to_rgb('#d9d9d9'))
+                self.screen.blit(hint_text, (self.screen_size + 20, 130 + i * 20))
+
         # Draw special tiles information
         special_tile_info = {
             'DL': ('Double Letter', Utils.hex_to_rgb('#92a1c2')),
@@ -285,103 +534,16 @@ class Game:
         y_offset = self.screen_size - 160
         for tile_type, (description, color) in special_tile_info.items():
             pygame.draw.rect(self.screen, color, (self.screen_size + 20, y_offset, 100, 30))
-            tile_text = self.score_font.render(f"{tile_type}: {description}", True, Utils.hex_to_rgb('#d9d9d9'))
+            tile_text = self.sprites.text(f"{tile_type}: {description}", self.score_font, Utils.hex_to_rgb('#d9d9d9'))
             self.screen.blit(tile_text, (self.screen_size + 130, y_offset + 5))
             y_offset += 40
 
-    def find_word(self):
-        """
-        Finds all the words on the board.
-        """
-        checked_positions = set()
-        self.words = []
-        self.current_iteration_words = []
-
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board_matrix[row][col] and (row, col) not in checked_positions:
-                    # Check horizontal word
-                    word = []
-                    start_col = col
-                    while start_col > 0 and self.board_matrix[row][start_col - 1]:
-                        start_col -= 1
-                    while start_col < self.board_size and self.board_matrix[row][start_col]:
-                        word.append((self.board_matrix[row][start_col][0], (row, start_col)))
-                        checked_positions.add((row, start_col))
-                        start_col += 1
-
-                    if len(word) > 1:
-                        self.words.append((word, 'horizontal'))
-                        if any(self.board_matrix[row][col][1] == self.iteration for _, (row, col) in word):
-                            self.current_iteration_words.append(word)
-                        print(f"Found horizontal word: {''.join([letter for letter, _ in word])}")
-
-                    # Check vertical word
-                    word = []
-                    start_row = row
-                    while start_row > 0 and self.board_matrix[start_row - 1][col]:
-                        start_row -= 1
-                    while start_row < self.board_size and self.board_matrix[start_row][col]:
-                        word.append((self.board_matrix[start_row][col][0], (start_row, col)))
-                        checked_positions.add((start_row, col))
-                        start_row += 1
-
-                    if len(word) > 1:
-                        self.words.append((word, 'vertical'))
-                        if any(self.board_matrix[row][col][1] == self.iteration for _, (row, col) in word):
-                            self.current_iteration_words.append(word)
-                        print(f"Found vertical word: {''.join([letter for letter, _ in word])}")
-
-    def check_words_connected(self):
-        """
-        Checks if the words are connected to previously placed letters.
-
-        Returns:
-            bool: True if the words are connected, False otherwise.
-        """
-        if not self.words:
-            return False
-
-        for word, _ in self.words:
-            for _, (row, col) in word:
-                if self.board_matrix[row][col][1] == self.iteration:
-                    # Check adjacent cells for letters from previous iterations
-                    for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                        adj_row, adj_col = row + dr, col + dc
-                        if 0 <= adj_row < self.board_size and 0 <= adj_col < self.board_size:
-                            if self.board_matrix[adj_row][adj_col] and self.board_matrix[adj_row][adj_col][1] < self.iteration:
-                                return True
-        return False
-
-    def print_board_matrix(self):
-        """
-        Prints the board matrix to the console.
-        """
-        for row in self.board_matrix:
-            print([f"{cell[0]}({cell[1]})" if cell else "None" for cell in row])
-
-    def validate_words(self):
-        """
-        Validates the words on the board.
-
-        Returns:
-            tuple: A boolean indicating if the words are valid and the invalid word if any.
-        """
-        for word, _ in self.words:
-            word_str = ''.join([letter for letter, _ in word])
-            if word_str not in self.menu.dictionary:
-                return False, word_str
-        return True, None
-
     def end_game(self):
         """
         Ends the game and displays the winner.
         """
-        winner = "Player" if self.total_score > self.opponent.total_score else "Opponent"
-        if self.total_score == self.opponent.total_score:
+        winner = "Player" if self.engine.total_score > self.opponent.total_score else "Opponent"
+        if self.engine.total_score == self.opponent.total_score:
             winner = "It's a tie!"
 
-        root = tk.Tk()
-        root.withdraw()  # Hide the root window
-        messagebox.showinfo("Game Over", f"The winner is: {winner}")
-        root.destroy()
\ No newline at end of file
+        self.show_message("Game Over", f"The winner is: {winner}")
\ No newline at end of file
@@ -0,0 +1,585 @@
+import logging
+import random
+from constants import letters, hint_budget, hint_count, move_cache_bytes
+from BoardState import BoardState
+from CrossCheckCache import CrossCheckCache
+from HintFinder import HintFinder
+from MoveCache import MoveCache
+from MoveLog import MoveLog
+from Profiler import profiler
+from Scorer import Scorer
+from WordIndex import WordIndex
+
+logger = logging.getLogger(__name__)
+
+class GameEngine:
+    """
+    Holds the state and the rules of a Scrabble game, without any user interface.
+
+    The pygame Game is a front end over the engine; the engine can also be
+    driven directly, e.g. to simulate games between two computer players.
+
+    Attributes:
+        dictionary (CompiledDictionary): The valid words.
+        board_size (int): The size of the board.
+        verbose (bool): True to log the progress of the game.
+        board (BoardState): The letters on the board, only changed by the engine.
+        view (BoardView): The read-only view of the board, for the rules and the rendering.
+        iteration (int): The current iteration number.
+        total_score (int): The total score of the player.
+        words (list): The list of words found on the board.
+        current_iteration_words (list): The list of words found in the current iteration.
+        cross_checks (CrossCheckCache): The anchors and cross-checks of the locked letters.
+        scorer (Scorer): The scoring of the words and moves, with the premium tables of the board.
+        move_cache (MoveCache): The moves generated for the positions of the game, shared with the opponents.
+        hint_finder (HintFinder): The search for the best moves of the player.
+        pending_positions (set): The positions of the letters placed by the player and not submitted yet.
+        rack (list): The letters of the player, empty if no rack was dealt.
+        used_words (set): The set of words that have been used to fill the rack.
+        word_index (WordIndex): The length and letter indexes of the dictionary, built on the first rack refill.
+        log (MoveLog): The changes made to the board, to undo, redo and save them.
+    """
+
+    def __init__(self, dictionary, board_size=15, verbose=True, deal_rack=True, word_index=None):
+        """
+        Initializes the GameEngine with an empty board.
+
+        Args:
+            dictionary (CompiledDictionary): The valid words.
+            board_size (int): The size of the board.
+            verbose (bool): True to log the progress of the game.
+            deal_rack (bool): True to deal the letters of the player, False when only computer players move.
+            word_index (WordIndex): The indexes of the dictionary, to share them between engines.
+        """
+        self.dictionary = dictionary
+        self.board_size = board_size
+        self.verbose = verbose
+        self.board = BoardState(board_size, ''.join(sorted(set(letters) | set(dictionary.alphabet))))
+        self.view = self.board.view()
+        self.iteration = 0
+        self.total_score = 0
+        self.words = []
+        self.current_iteration_words = []
+        self.cross_checks = CrossCheckCache(board_size, dictionary)
+        self.scorer = Scorer(board_size)
+        self.move_cache = MoveCache(move_cache_bytes)
+        self.hint_finder = HintFinder(dictionary.gaddag, board_size, self.scorer, self.move_cache)
+        self.pending_positions = set()
+        self.used_words = set()
+        self.word_index = word_index
+        self.rack = self.get_valid_letters() if deal_rack else []
+        self.log = MoveLog(''.join(self.rack))
+
+    def place_letter(self, row, col, letter):
+        """
+        Places a letter of the current iteration on an empty cell.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+            letter (str): The letter to place.
+
+        Returns:
+            bool: True if the letter was placed, False if the cell is outside the board or taken.
+        """
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size) or self.board.letter(row, col):
+            return False
+        self.board.place(row, col, letter, self.iteration)
+        self.pending_positions.add((row, col))
+        self.log.record('place', [(row, col, letter)], self.iteration)
+        return True
+
+    def remove_letter(self, row, col):
+        """
+        Removes a letter placed by the player that is not submitted yet.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            str: The removed letter, or None if there is no pending letter on the cell.
+        """
+        if (row, col) not in self.pending_positions:
+            return None  # Only the letters that are not submitted yet can be moved
+        self.pending_positions.discard((row, col))
+        letter = self.board.remove(row, col)
+        self.log.record('remove', [(row, col, letter)], self.iteration)
+        return letter
+
+    def submit(self):
+        """
+        Validates and scores the letters placed by the player in the current iteration.
+
+        On success the cross-checks are updated, the iteration advances and the rack is refilled.
+
+        Returns:
+            str: The error message if the move is rejected, None if it is accepted.
+        """
+        with profiler.span('submit'):
+            valid, invalid_word = self.find_new_words()
+            if not valid:
+                return f"The word '{invalid_word}' is not in the dictionary."
+            new_positions = sorted(self.pending_positions)
+            if not new_positions:
+                return "No new words have been added."
+            if self.iteration > 0 and not self.check_words_connected(new_positions):
+                return "Words are not connected!"
+
+            self.cross_checks.update(self.board, new_positions)
+            self.pending_positions.clear()
+            score = self.calculate_score()
+            self.total_score += score
+            self.iteration += 1
+            if self.verbose and logger.isEnabledFor(logging.INFO):
+                logger.info("Total score: %d", self.total_score)
+                for word in self.current_iteration_words:
+                    logger.info("Word added: %s", ''.join([letter for letter, _ in word]))
+                self.log_board()
+            rack = ''.join(self.rack)
+            self.replace_letters()  # Generate new letters only when words are connected
+            self.log.record('submit', [(row, col, self.board.letter(row, col)) for row, col in new_positions],
+                            self.iteration - 1, score, (rack, ''.join(self.rack)))
+            return None
+
+    def find_hints(self, count=hint_count, budget=hint_budget):
+        """
+        Finds the best scoring moves the player can make with the rack.
+
+        The letters placed and not submitted yet count as letters of the rack.
+
+        Args:
+            count (int): The number of moves to return.
+            budget (float): The time in seconds the search may take, the best moves found
+                so far are returned when it runs out.
+
+        Returns:
+            list: The best moves found, as (score, move) tuples with the best move first.
+        """
+        board = self.board.copy()
+        rack = list(self.rack)
+        for row, col in self.pending_positions:
+            rack.append(board.remove(row, col))
+        return self.hint_finder.find(board, self.cross_checks, rack, count, budget)
+
+    def place_word(self, word, position, direction):
+        """
+        Places a whole word on the board, as a move of the current iteration.
+
+        The letters already on the board keep the iteration they were placed in.
+
+        Args:
+            word (str): The word to place.
+            position (tuple): The position to place the word.
+            direction (str): The direction to place the word ('horizontal' or 'vertical').
+
+        Returns:
+            list: A list of tuples containing the letter and its position.
+        """
+        row, col = position
+        dr, dc = (0, 1) if direction == 'horizontal' else (1, 0)
+        placed_word = []
+        for i in range(len(word)):
+            if self.board.letter(row + dr * i, col + dc * i) is None:
+                self.board.place(row + dr * i, col + dc * i, word[i], self.iteration)
+            placed_word.append((word[i], (row + dr * i, col + dc * i)))
+        self.cross_checks.update(self.board, [position for _, position in placed_word])
+        return placed_word
+
+    def play_move(self, move, score):
+        """
+        Places the word of a computer player's move and ends its turn.
+
+        Args:
+            move (tuple): The word, position, and direction of the move.
+            score (int): The score of the move.
+
+        Returns:
+            list: A list of tuples containing the letter and its position.
+        """
+        word, (row, col), direction = move
+        dr, dc = (0, 1) if direction == 'horizontal' else (1, 0)
+        cells = [(row + dr * i, col + dc * i, letter) for i, letter in enumerate(word)
+                 if self.board.letter(row + dr * i, col + dc * i) is None]
+        placed_word = self.place_word(*move)
+        self.log.record('move', cells, self.iteration, score)
+        self.iteration += 1
+        return placed_word
+
+    def pass_turn(self):
+        """
+        Ends the turn of a computer player without placing a word.
+        """
+        self.log.record('pass', [], self.iteration)
+        self.iteration += 1
+
+    def find_new_words(self):
+        """
+        Finds and validates the words formed by the letters placed in the current iteration.
+
+        Only the row and the column through every pending letter are read, so the
+        cost does not depend on how full the board is. The main word comes first,
+        followed by the cross-words, and the words are checked against the
+        dictionary as soon as they are read.
+
+        Returns:
+            tuple: A boolean indicating if the words are valid and the invalid word if any.
+        """
+        self.current_iteration_words = []
+        positions = sorted(self.pending_positions)
+        directions = [('horizontal', 0, 1), ('vertical', 1, 0)]
+        if len({col for _, col in positions}) == 1 and len(positions) > 1:
+            directions.reverse()  # The main word is vertical
+
+        seen = set()
+        for direction, dr, dc in directions:
+            for row, col in positions:
+                # Walk back to the start of the word through the pending letter
+                while 0 <= row - dr and 0 <= col - dc and self.board.letter(row - dr, col - dc):
+                    row, col = row - dr, col - dc
+                if (row, col, direction) in seen:
+                    continue
+                seen.add((row, col, direction))
+
+                word = []
+                while row < self.board_size and col < self.board_size and self.board.letter(row, col):
+                    word.append((self.board.letter(row, col), (row, col)))
+                    row, col = row + dr, col + dc
+                if len(word) > 1:
+                    self.current_iteration_words.append(word)
+                    word_str = ''.join([letter for letter, _ in word])
+                    if self.verbose:
+                        logger.debug("Found %s word: %s", direction, word_str)
+                    if word_str not in self.dictionary:
+                        return False, word_str
+
+        if not self.current_iteration_words:
+            return False, "No new word added"
+        return True, None
+
+    def calculate_score(self):
+        """
+        Calculates the score of the words formed in the current iteration.
+
+        The premiums only count for the letters placed in the current iteration.
+
+        Returns:
+            int: The score for the current iteration.
+        """
+        score = self.scorer.score_words(self.board, self.current_iteration_words, self.iteration)
+        if self.verbose:
+            logger.info("Score for this turn: %d", score)
+        return score
+
+    def find_word(self):
+        """
+        Finds all the words on the board.
+        """
+        checked_positions = set()
+        grid = [self.board.line(row, 'horizontal') for row in range(self.board_size)]
+        self.words = []
+        self.current_iteration_words = []
+
+        for row in range(self.board_size):
+            for col in range(self.board_size):
+                if grid[row][col] and (row, col) not in checked_positions:
+                    # Check horizontal word
+                    word = []
+                    start_col = col
+                    while start_col > 0 and grid[row][start_col - 1]:
+                        start_col -= 1
+                    while start_col < self.board_size and grid[row][start_col]:
+                        word.append((grid[row][start_col], (row, start_col)))
+                        checked_positions.add((row, start_col))
+                        start_col += 1
+
+                    if len(word) > 1:
+                        self.words.append((word, 'horizontal'))
+                        if any(self.board.iteration(row, col) == self.iteration for _, (row, col) in word):
+                            self.current_iteration_words.append(word)
+                        if self.verbose and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Found horizontal word: %s", ''.join([letter for letter, _ in word]))
+
+                    # Check vertical word
+                    word = []
+                    start_row = row
+                    while start_row > 0 and grid[start_row - 1][col]:
+                        start_row -= 1
+                    while start_row < self.board_size and grid[start_row][col]:
+                        word.append((grid[start_row][col], (start_row, col)))
+                        checked_positions.add((start_row, col))
+                        start_row += 1
+
+                    if len(word) > 1:
+                        self.words.append((word, 'vertical'))
+                        if any(self.board.iteration(row, col) == self.iteration for _, (row, col) in word):
+                            self.current_iteration_words.append(word)
+                        if self.verbose and logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Found vertical word: %s", ''.join([letter for letter, _ in word]))
+
+    def check_words_connected(self, new_positions):
+        """
+        Checks if the words are connected to previously placed letters.
+
+        A new letter is connected when it lies on an anchor square of the cross-check cache,
+        which only holds the letters locked in previous iterations.
+
+        Args:
+            new_positions (list): The positions of the letters placed in the current iteration.
+
+        Returns:
+            bool: True if the words are connected, False otherwise.
+        """
+        return any(position in self.cross_checks.anchors for position in new_positions)
+
+    def get_valid_letters(self):
+        """
+        Gets valid letters for a new rack.
+
+        Returns:
+            list: A list of valid letters.
+        """
+        if self.word_index is None:
+            self.word_index = WordIndex(self.dictionary)
+        selected_word = self.word_index.random_word(7, self.used_words)
+        if selected_word:
+            self.used_words.add(selected_word)
+            return list(selected_word)
+        return random.choices(letters, k=5)  # Fallback to random letters if no valid word is found
+
+    def replace_letters(self):
+        """
+        Replaces the letters of the rack with new letters.
+
+        The new letters come from a random word containing any of the available letters.
+        """
+        with profiler.span('replace_letters'):
+            if self.word_index is None:
+                self.word_index = WordIndex(self.dictionary)
+            index = self.word_index.random_member(self.word_index.containing_any(self.get_available_letters()))
+            if index is not None:
+                selected_word = self.dictionary.word(index)
+                self.rack = list(selected_word[:7])
+                random.shuffle(self.rack)
+                if len(self.rack) < 7:
+                    self.rack.extend(random.choices(letters, k=7 - len(self.rack)))
+            else:
+                self.rack = random.choices(letters, k=7)
+
+    def get_available_letters(self):
+        """
+        Gets the available letters from the board and the rack.
+
+        Returns:
+            set: A set of available letters.
+        """
+        available_letters = set(self.rack)
+        for row, col in self.board.positions():
+            if self.count_neighbors(row, col) <= 2:
+                available_letters.add(self.board.letter(row, col))
+        return available_letters
+
+    def count_neighbors(self, row, col):
+        """
+        Counts the number of neighboring cells with letters.
+
+        Args:
+            row (int): The row position of the cell.
+            col (int): The column position of the cell.
+
+        Returns:
+            int: The number of neighboring cells with letters.
+        """
+        return self.board.count_neighbors(row, col)
+
+    def load_board(self, board, iteration):
+        """
+        Replaces the letters on the board, e.g. to start from a saved position.
+
+        The letters of the given board are all locked and the cross-checks are rebuilt.
+        The log starts over from the loaded position.
+
+        Args:
+            board (BoardState): The board to copy, or a view of it.
+            iteration (int): The current iteration number.
+        """
+        self.board.clear()
+        for row, col in board.positions():
+            self.board.place(row, col, board.letter(row, col), board.iteration(row, col))
+        self.iteration = iteration
+        self.pending_positions.clear()
+        self.cross_checks = CrossCheckCache(self.board_size, self.dictionary)
+        self.cross_checks.update(self.board, self.board.positions())
+        self.log = MoveLog(''.join(self.rack))
+
+    def undo(self):
+        """
+        Reverts the last applied entry of the log.
+
+        Only the cells of the entry are changed, and the cross-checks are
+        updated around them.
+
+        Returns:
+            tuple: The reverted entry, or None if there is nothing to undo.
+        """
+        entry = self.log.undo()
+        if entry is None:
+            return None
+        kind, cells, iteration, score, (rack, _) = entry
+        if kind == 'place':
+            for row, col, letter in cells:
+                self.board.remove(row, col)
+                self.pending_positions.discard((row, col))
+                self.rack.append(letter)
+        elif kind == 'remove':
+            for row, col, letter in cells:
+                self.rack.remove(letter)
+                self.board.place(row, col, letter, iteration)
+                self.pending_positions.add((row, col))
+        elif kind in ('submit', 'move'):
+            # The cross-checks only describe locked letters, so they are updated without the letters
+            for row, col, _ in cells:
+                self.board.remove(row, col)
+            self.cross_checks.remove(self.board, [(row, col) for row, col, _ in cells])
+            if kind == 'submit':
+                for row, col, letter in cells:
+                    self.board.place(row, col, letter, iteration)
+                    self.pending_positions.add((row, col))
+                self.total_score -= score
+                self.rack = list(rack)
+        self.iteration = iteration
+        return entry
+
+    def redo(self, update_cross_checks=True):
+        """
+        Applies again the next undone entry of the log.
+
+        Args:
+            update_cross_checks (bool): False to leave the cross-checks out of date, when replaying
+                many entries and rebuilding them once at the end.
+
+        Returns:
+            tuple: The applied entry, or None if there is nothing to redo.
+        """
+        entry = self.log.redo()
+        if entry is None:
+            return None
+        kind, cells, iteration, score, (_, rack) = entry
+        if kind == 'place':
+            for row, col, letter in cells:
+                self.rack.remove(letter)
+                self.board.place(row, col, letter, iteration)
+                self.pending_positions.add((row, col))
+        elif kind == 'remove':
+            for row, col, letter in cells:
+                self.board.remove(row, col)
+                self.pending_positions.discard((row, col))
+                self.rack.append(letter)
+        elif kind in ('submit', 'move'):
+            for row, col, letter in cells:
+                self.board.place(row, col, letter, iteration)
+            if update_cross_checks:
+                self.cross_checks.update(self.board, [(row, col) for row, col, _ in cells])
+            if kind == 'submit':
+                self.pending_positions.clear()
+                self.total_score += score
+                self.rack = list(rack)
+        self.iteration = iteration + (kind in ('submit', 'move', 'pass'))
+        return entry
+
+    def save_game(self, path):
+        """
+        Saves the game as its log.
+
+        Args:
+            path (str): The path of the saved game.
+        """
+        self.log.save(path)
+
+    def load_game(self, path):
+        """
+        Loads a saved game by replaying its log on an empty board.
+
+        The cross-checks are built once for the final board, as a cell can be
+        updated by many moves during the replay. If the file or any of its
+        entries is invalid, the game that was being played is restored.
+
+        Args:
+            path (str): The path of the saved game.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid saved game.
+        """
+        with profiler.span('load_game'):
+            log = MoveLog.load(path, self.board_size, self.board.letters[1:])
+            state = (self.board.copy(), self.iteration, self.total_score, set(self.pending_positions),
+                     self.cross_checks, list(self.rack), self.log)
+            self.board.clear()
+            self.iteration = 0
+            self.total_score = 0
+            self.pending_positions.clear()
+            self.cross_checks = CrossCheckCache(self.board_size, self.dictionary)
+            self.rack = list(log.rack)
+            self.log = log
+            try:
+                while log.upcoming() is not None:
+                    self.check_replay(log.upcoming())
+                    self.redo(update_cross_checks=False)
+            except ValueError:
+                self.restore(state)
+                raise
+            locked = self.board.copy()
+            for row, col in self.pending_positions:
+                locked.remove(row, col)
+            self.cross_checks.update(locked, locked.positions())
+
+    def check_replay(self, entry):
+        """
+        Checks that an entry of a loaded log can be applied to the board.
+
+        Args:
+            entry (tuple): The next entry of the log.
+
+        Raises:
+            ValueError: If the entry does not match the board or the rack.
+        """
+        kind, cells, _, _, _ = entry
+        letters = [letter for _, _, letter in cells]
+        for row, col, letter in cells:
+            if kind in ('place', 'move') and self.board.letter(row, col) is not None:
+                raise ValueError(f"the {kind} at {row}, {col} is on a taken cell")
+            if kind in ('remove', 'submit') and ((row, col) not in self.pending_positions or
+                                                 self.board.letter(row, col) != letter):
+                raise ValueError(f"the {kind} at {row}, {col} does not match a pending letter")
+        if kind == 'place' and any(self.rack.count(letter) < letters.count(letter) for letter in letters):
+            raise ValueError("a placed letter is not in the rack")
+        if kind == 'submit' and len(cells) != len(self.pending_positions):
+            raise ValueError("the submit does not match the pending letters")
+
+    def restore(self, state):
+        """
+        Puts back the game saved before a failed load.
+
+        Args:
+            state (tuple): The board copy, the iteration, the score, the pending positions,
+                the cross-checks, the rack and the log of the game.
+        """
+        board, self.iteration, self.total_score, self.pending_positions, self.cross_checks, self.rack, self.log = state
+        self.board.clear()
+        for row, col in board.positions():
+            self.board.place(row, col, board.letter(row, col), board.iteration(row, col))
+
+    def log_board(self):
+        """
+        Logs the board at debug level, one row per line.
+
+        The board is only formatted when debug messages are enabled.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        rows = []
+        for row in range(self.board_size):
+            cells = [self.board[row, col] for col in range(self.board_size)]
+            rows.append(' '.join(f"{cell[0]}({cell[1]})" if cell else "." for cell in cells))
+        logger.debug("Board at iteration %d:\n%s", self.iteration, '\n'.join(rows))
@@ -0,0 +1,132 @@
+import heapq
+import time
+from collections import Counter
+from MoveGenerator import MoveGenerator, SearchLimit
+from Profiler import profiler
+
+class HintFinder:
+    """
+    Finds the best scoring moves the player can make with the letters of the rack.
+
+    The moves are grown from the anchor squares with the GADDAG walk of the
+    opponent's MoveGenerator, but only with the letters of the rack and
+    following the player's rules: every word formed across a new letter must be valid, which
+    the cross-check sets of the cache tell without reading the board. The
+    search stops at its deadline and returns the best moves found so far.
+    Only the best moves are kept during the search, in a min-heap bounded to
+    the number of moves asked for. The best moves of the searches that ran
+    to the end are kept in the move cache, keyed by the board and the rack.
+
+    Attributes:
+        board_size (int): The size of the board.
+        scorer (Scorer): The scorer ranking the moves.
+        generator (MoveGenerator): The GADDAG walk, shared with the opponent.
+        cache (MoveCache): The cache of the scored moves, None to search every time.
+    """
+
+    def __init__(self, gaddag, board_size, scorer, cache=None):
+        """
+        Initializes the HintFinder with the given GADDAG.
+
+        Args:
+            gaddag (Gaddag): The GADDAG built from the dictionary.
+            board_size (int): The size of the board.
+            scorer (Scorer): The scorer ranking the moves.
+            cache (MoveCache): The cache of the scored moves, None to search every time.
+        """
+        self.board_size = board_size
+        self.scorer = scorer
+        self.generator = MoveGenerator(gaddag, board_size)
+        self.cache = cache
+
+    def find(self, board, cross_checks, rack, count, budget):
+        """
+        Finds the best scoring moves for a rack.
+
+        Args:
+            board (BoardState): The letters locked on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+            rack (list): The letters the moves can use.
+            count (int): The number of moves to return.
+            budget (float): The time in seconds the search may take.
+
+        Returns:
+            list: The best moves found, as (score, move) tuples with the best move first.
+            A move is a tuple of the word, its position, and its direction.
+        """
+        with profiler.span('find_hints'):
+            rack_key = ''.join(sorted(rack))
+            if self.cache is not None:
+                cached = self.cache.get('hint', board.zobrist, rack_key)
+                if cached is not None and cached[0] >= count:
+                    return cached[1][:count]
+
+            limit = SearchLimit(time.perf_counter() + budget)
+            cross_scores = self.scorer.cross_scores(board)
+            rack = Counter(rack)
+            best = []  # A min-heap of the best (score, move) pairs found so far
+            candidates = 0
+            seen = set()
+            duplicates = 0
+
+            for index, direction, line, checks, anchors in self.line_tasks(board, cross_checks):
+                anchor_set = set(anchors)
+                for anchor in anchors:
+                    found = []
+                    self.generator.walk(line, checks, anchor_set, anchor, rack, found, limit)
+                    moves = []
+                    for word, start in found:
+                        position = (index, start) if direction == 'horizontal' else (start, index)
+                        tiles = tuple(sorted((position[0] + offset * (direction == 'vertical'),
+                                              position[1] + offset * (direction == 'horizontal'), letter)
+                                             for offset, letter in enumerate(word) if line[start + offset] is None))
+                        if tiles not in seen:  # A single new letter can be found in both directions
+                            seen.add(tiles)
+                            moves.append((word, position, direction))
+                    duplicates += len(found) - len(moves)
+                    candidates += len(found)
+                    for pair in zip(self.scorer.score_moves(board, moves, cross_scores), moves):
+                        if len(best) < count:
+                            heapq.heappush(best, pair)
+                        elif pair > best[0]:
+                            heapq.heapreplace(best, pair)
+                    if limit.reached:
+                        break
+                if limit.reached:
+                    break
+
+            profiler.count('hint_candidates', candidates)
+            profiler.count('hint_duplicates_pruned', duplicates)
+            best.sort(reverse=True)
+            if self.cache is not None and not limit.reached:
+                self.cache.put('hint', board.zobrist, rack_key, (count, best), len(best))
+            return best
+
+    def line_tasks(self, board, cross_checks):
+        """
+        Lists the rows and columns to search, with their letters, cross-checks and anchors.
+
+        On an empty board the only anchor is the center cell.
+
+        Args:
+            board (BoardView): The letters locked on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+
+        Returns:
+            list: A list of tuples with the line index, direction, letters, cross-checks and sorted anchors.
+        """
+        anchors = cross_checks.anchors or {(self.board_size // 2, self.board_size // 2)}
+        row_anchors = {}
+        col_anchors = {}
+        for row, col in anchors:
+            row_anchors.setdefault(row, []).append(col)
+            col_anchors.setdefault(col, []).append(row)
+
+        tasks = []
+        for row, cols in sorted(row_anchors.items()):
+            checks = [cross_checks.horizontal.get((row, col)) for col in range(self.board_size)]
+            tasks.append((row, 'horizontal', board.line(row, 'horizontal'), checks, sorted(cols)))
+        for col, rows in sorted(col_anchors.items()):
+            checks = [cross_checks.vertical.get((row, col)) for row in range(self.board_size)]
+            tasks.append((col, 'vertical', board.line(col, 'vertical'), checks, sorted(rows)))
+        return tasks
@@ -0,0 +1,81 @@
+import logging
+import sys
+from collections import deque
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+class LogBuffer(logging.Handler):
+    """
+    Keeps the latest log records in memory, to dump them after a crash.
+
+    The records are stored as they are, so their messages are only formatted
+    when the buffer is dumped. The arguments of a message are kept by
+    reference, so they should not be changed after they are logged.
+
+    Attributes:
+        records (deque): The latest records, oldest first.
+    """
+
+    def __init__(self, capacity, level=logging.NOTSET):
+        """
+        Initializes an empty LogBuffer.
+
+        Args:
+            capacity (int): The number of latest records kept.
+            level (int): The lowest level of the records kept.
+        """
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self):
+        """
+        Formats the kept records.
+
+        Returns:
+            list: The formatted records, oldest first.
+        """
+        return [self.format(record) for record in list(self.records)]
+
+    def dump(self, path):
+        """
+        Writes the kept records to a file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(line + '\n' for line in self.lines())
+
+def configure_logging(console_level, buffer_level, capacity):
+    """
+    Sends the log records of the game to the console and to a LogBuffer.
+
+    The root logger is set to the lower of the two levels, so the messages
+    below both levels are dropped before they are formatted.
+
+    Args:
+        console_level (str): The lowest level written to the console, e.g. 'WARNING'.
+        buffer_level (str): The lowest level kept in the buffer, e.g. 'INFO'.
+        capacity (int): The number of latest records kept in the buffer.
+
+    Returns:
+        LogBuffer: The buffer of the latest records.
+    """
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter('%(levelname)s %(name)s: %(message)s'))
+    buffer = LogBuffer(capacity, buffer_level)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, LogBuffer) or handler.get_name() == 'console':
+            root.removeHandler(handler)  # Configuring again replaces the handlers of the previous game
+    console.set_name('console')
+    root.addHandler(console)
+    root.addHandler(buffer)
+    root.setLevel(min(console.level, buffer.level))
+    return buffer
@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 
-from DictionaryProcessor import DictionaryProcessor
 from Game import Game
 import os
 
@@ -56,7 +55,7 @@ class MainGUI:
         """
         Opens a file dialog to upload a dictionary file.
         """
-        self.dictionary_path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt")])
+        self.dictionary_path = filedialog.askopenfilename(filetypes=[("Word lists", "*.txt *.gz *.xz"), ("Text files", "*.txt")])
         if self.dictionary_path:
             file_name = os.path.basename(self.dictionary_path)
             self.upload_button.config(text=file_name)
@@ -67,8 +66,6 @@ class MainGUI:
         Starts the Scrabble game if a dictionary file is uploaded.
         """
         if self.dictionary_path:
-            processor = DictionaryProcessor(self.dictionary_path)
-            processor.load_dictionary()
             game = Game(dictionary_path=self.dictionary_path)
             self.root.destroy()  # Close the main window
             game.run()
@@ -1,6 +1,6 @@
 import pygame
 import random
-from constants import letters, letter_scores
+from constants import letters
 import Utils
 
 class Menu:
@@ -12,15 +12,17 @@ class Menu:
         screen_size (int): The size of the screen.
         margin (int): The margin between cells.
         menu_height (int): The height of the menu.
-        dictionary (set): The set of words loaded from the dictionary file.
-        menu_letters (list): The list of letters in the menu.
-        used_words (set): The set of words that have been used.
-        game (Game): The game instance.
+        game (Game): The game instance, whose engine holds the letters of the player.
+        menu_letter_positions (list): The positions of the letters in the menu.
         submit_button_rect (pygame.Rect): The rectangle for the submit button.
         shuffle_button_rect (pygame.Rect): The rectangle for the shuffle button.
+        hint_button_rect (pygame.Rect): The rectangle for the hint button.
+        cancel_button_rect (pygame.Rect): The rectangle for the button cancelling the opponent's turn.
+        undo_button_rect (pygame.Rect): The rectangle for the undo button.
+        redo_button_rect (pygame.Rect): The rectangle for the redo button.
     """
 
-    def __init__(self, screen_size, cell_size, margin, menu_height, dictionary_path, game):
+    def __init__(self, screen_size, cell_size, margin, menu_height, game):
         """
         Initializes the Menu with the given parameters.
 
@@ -29,70 +31,35 @@ class Menu:
             cell_size (int): The size of each cell in the menu.
             margin (int): The margin between cells.
             menu_height (int): The height of the menu.
-            dictionary_path (str): The path to the dictionary file.
             game (Game): The game instance.
         """
         self.cell_size = cell_size
         self.screen_size = screen_size
         self.margin = margin
         self.menu_height = menu_height
-        self.dictionary = self.load_dictionary(path=dictionary_path)
-        self.menu_letters = []
-        self.used_words = set()
         self.game = game
-        self.initialize_menu()
+        self.update_letter_positions()
 
         # Define button positions and sizes
         self.submit_button_rect = pygame.Rect(screen_size - 150, screen_size + 20, 100, 40)
         self.shuffle_button_rect = pygame.Rect(screen_size - 650, screen_size + 20, 100, 40)
-
-    def load_dictionary(self, path):
-        """
-        Loads the dictionary file and returns a set of words.
-
-        Args:
-            path (str): The path to the dictionary file.
-
-        Returns:
-            set: A set of words from the dictionary file.
-        """
-        with open(path, 'r') as file:
-            words = file.read().splitlines()
-        return set(word.upper() for word in words)
-
-    def initialize_menu(self):
-        """
-        Initializes the menu with valid letters.
-        """
-        self.menu_letters = self.get_valid_letters()
-        self.update_letter_positions()
-
-    def get_valid_letters(self):
-        """
-        Gets valid letters for the menu.
-
-        Returns:
-            list: A list of valid letters.
-        """
-        valid_words = [word for word in self.dictionary if len(word) == 7 and word not in self.used_words]
-        if valid_words:
-            selected_word = random.choice(valid_words)
-            self.used_words.add(selected_word)
-            return list(selected_word)
-        return random.choices(letters, k=5)  # Fallback to random letters if no valid word is found
+        self.hint_button_rect = pygame.Rect(screen_size + 20, screen_size + 20, 70, 40)
+        self.cancel_button_rect = pygame.Rect(screen_size + 100, screen_size + 20, 100, 40)
+        self.undo_button_rect = pygame.Rect(screen_size + 100, screen_size + 20, 80, 40)
+        self.redo_button_rect = pygame.Rect(screen_size + 190, screen_size + 20, 80, 40)
 
     def update_letter_positions(self):
         """
         Updates the positions of the letters in the menu.
         """
-        total_menu_width = len(self.menu_letters) * (self.cell_size + self.margin * 2) - self.margin * 2
+        total_menu_width = len(self.game.engine.rack) * (self.cell_size + self.margin * 2) - self.margin * 2
         start_x = (self.screen_size - total_menu_width) // 2
         self.menu_letter_positions = [
             (start_x + i * (self.cell_size + self.margin * 2), self.screen_size + (self.menu_height - self.cell_size) // 2)
-            for i in range(len(self.menu_letters))
+            for i in range(len(self.game.engine.rack))
         ]
 
-    def draw(self, screen, font, score_font):
+    def draw(self, screen, font, score_font, sprites):
         """
         Draws the menu on the screen.
 
@@ -100,34 +67,40 @@ class Menu:
             screen (pygame.Surface): The screen to draw on.
             font (pygame.font.Font): The font for drawing letters.
             score_font (pygame.font.Font): The font for drawing letter scores.
+            sprites (SpriteCache): The cache of the rendered tiles and texts.
         """
         menu_y = screen.get_height() - self.menu_height
         pygame.draw.rect(screen, (50, 50, 50), (0, menu_y, screen.get_width(), self.menu_height))
 
-        for i, (letter, pos) in enumerate(zip(self.menu_letters, self.menu_letter_positions)):
-            x, y = pos
-            letter_text = font.render(letter, True, (0, 0, 0))
-            letter_score = letter_scores[letter]
-            score_text = score_font.render(str(letter_score), True, (0, 0, 0))
-
-            Utils.draw_rounded_rect(screen, Utils.hex_to_rgb('#b79d9b'), (x, y, self.cell_size, self.cell_size), corner_radius=8)
-
-            screen.blit(letter_text, (
-                x + (self.cell_size - letter_text.get_width()) // 2, y + (self.cell_size - letter_text.get_height()) // 2))
-
-            score_x = x + self.cell_size - score_text.get_width() - 5
-            score_y = y + self.cell_size - score_text.get_height() - 5
-            screen.blit(score_text, (score_x, score_y))
+        for letter, pos in zip(self.game.engine.rack, self.menu_letter_positions):
+            screen.blit(sprites.tile(letter, font, score_font, Utils.hex_to_rgb('#b79d9b')), pos)
 
         # Draw buttons
         pygame.draw.rect(screen, Utils.hex_to_rgb('#92a1c2'), self.submit_button_rect)
-        submit_text = font.render("Submit", True, (0, 0, 0))
+        submit_text = sprites.text("Submit", font, (0, 0, 0))
         screen.blit(submit_text, (self.submit_button_rect.x + 8, self.submit_button_rect.y + 7))
 
         pygame.draw.rect(screen, Utils.hex_to_rgb('#6B597F'), self.shuffle_button_rect)
-        shuffle_text = font.render("Shuffle", True, (255, 255, 255))
+        shuffle_text = sprites.text("Shuffle", font, (255, 255, 255))
         screen.blit(shuffle_text, (self.shuffle_button_rect.x + 10, self.shuffle_button_rect.y + 7))
 
+        pygame.draw.rect(screen, Utils.hex_to_rgb('#92a1c2'), self.hint_button_rect)
+        hint_text = sprites.text("Hint", font, (0, 0, 0))
+        screen.blit(hint_text, (self.hint_button_rect.x + 8, self.hint_button_rect.y + 7))
+
+        if self.game.is_opponent_thinking():
+            pygame.draw.rect(screen, Utils.hex_to_rgb('#a2869c'), self.cancel_button_rect)
+            cancel_text = sprites.text("Cancel", font, (0, 0, 0))
+            screen.blit(cancel_text, (self.cancel_button_rect.x + 10, self.cancel_button_rect.y + 7))
+        else:
+            pygame.draw.rect(screen, Utils.hex_to_rgb('#6B597F'), self.undo_button_rect)
+            undo_text = sprites.text("Undo", font, (255, 255, 255))
+            screen.blit(undo_text, (self.undo_button_rect.x + 8, self.undo_button_rect.y + 7))
+
+            pygame.draw.rect(screen, Utils.hex_to_rgb('#6B597F'), self.redo_button_rect)
+            redo_text = sprites.text("Redo", font, (255, 255, 255))
+            screen.blit(redo_text, (self.redo_button_rect.x + 8, self.redo_button_rect.y + 7))
+
     def handle_button_click(self, pos):
         """
         Handles button clicks in the menu.
@@ -136,65 +109,24 @@ class Menu:
             pos (tuple): The position of the mouse click.
 
         Returns:
-            str: The action to be performed ("submit" or "shuffle").
+            str: The action to be performed ("submit", "shuffle", "hint", "undo", "redo" or "cancel").
         """
+        if self.game.is_opponent_thinking():
+            # Only the opponent's turn can be cancelled while it is thinking
+            return "cancel" if self.cancel_button_rect.collidepoint(pos) else None
         if self.submit_button_rect.collidepoint(pos):
             return "submit"
         elif self.shuffle_button_rect.collidepoint(pos):
             self.shuffle_letters()
             return "shuffle"
+        elif self.hint_button_rect.collidepoint(pos):
+            return "hint"
+        elif self.undo_button_rect.collidepoint(pos):
+            return "undo"
+        elif self.redo_button_rect.collidepoint(pos):
+            return "redo"
         return None
 
-    def replace_letters(self):
-        """
-        Replaces the letters in the menu with new letters.
-        """
-        available_letters = self.get_available_letters()
-        valid_words = [word for word in self.dictionary if any(letter in available_letters for letter in word)]
-        if valid_words:
-            selected_word = random.choice(valid_words)
-            self.menu_letters = list(selected_word[:7])
-            random.shuffle(self.menu_letters)
-            if len(self.menu_letters) < 7:
-                self.menu_letters.extend(random.choices(letters, k=7 - len(self.menu_letters)))
-        else:
-            self.menu_letters = random.choices(letters, k=7)
-        self.update_letter_positions()
-
-    def get_available_letters(self):
-        """
-        Gets the available letters from the board and menu.
-
-        Returns:
-            set: A set of available letters.
-        """
-        available_letters = set(self.menu_letters)
-        for row in range(self.game.board_size):
-            for col in range(self.game.board_size):
-                if self.game.board_matrix[row][col] is not None:
-                    if self.count_neighbors(row, col) <= 2:
-                        available_letters.add(self.game.board_matrix[row][col][0])
-        return available_letters
-
-    def count_neighbors(self, row, col):
-        """
-        Counts the number of neighboring cells with letters.
-
-        Args:
-            row (int): The row position of the cell.
-            col (int): The column position of the cell.
-
-        Returns:
-            int: The number of neighboring cells with letters.
-        """
-        neighbors = 0
-        for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            adj_row, adj_col = row + dr, col + dc
-            if 0 <= adj_row < self.game.board_size and 0 <= adj_col < self.game.board_size:
-                if self.game.board_matrix[adj_row][adj_col] is not None:
-                    neighbors += 1
-        return neighbors
-
     @staticmethod
     def get_random_letter():
         """
@@ -209,5 +141,5 @@ class Menu:
         """
         Shuffles the letters in the menu.
         """
-        random.shuffle(self.menu_letters)
+        random.shuffle(self.game.engine.rack)
         self.update_letter_positions()
\ No newline at end of file
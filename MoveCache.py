@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from Profiler import profiler
+
+MOVE_BYTES = 240  # Approximate memory of a cached move: its tuple, word, position and score
+
+class MoveCache:
+    """
+    A least recently used cache of the moves generated for a board position.
+
+    The entries are keyed by the kind of search, the Zobrist hash of the
+    board and the rack the moves were generated for (None for the rackless
+    opponent), and hold the move lists with their scores. The kind keeps
+    apart the searches that follow different rules and cache different
+    values for the same position, e.g. the opponent's moves and the hints. The memory of an entry is estimated from
+    its number of moves, and the least recently used entries are dropped
+    when the estimate goes over the limit. The cache is shared by the game
+    and the opponent's search thread, so it is guarded by a lock.
+
+    Attributes:
+        max_bytes (int): The memory limit of the cache, in bytes.
+        entries (OrderedDict): The cached values and their estimated sizes, least recently used first.
+        size_bytes (int): The estimated memory of the cached entries.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that found nothing.
+        lock (threading.Lock): The lock guarding the entries and the counters.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Initializes an empty MoveCache.
+
+        Args:
+            max_bytes (int): The memory limit of the cache, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, kind, board_hash, rack):
+        """
+        Looks up the moves of a position.
+
+        Args:
+            kind (str): The kind of search the moves were generated by, e.g. 'opponent' or 'hint'.
+            board_hash (int): The Zobrist hash of the board.
+            rack (str): The sorted letters of the rack, None for moves generated without a rack.
+
+        Returns:
+            object: The cached value, or None if the position is not cached.
+        """
+        with self.lock:
+            entry = self.entries.get((kind, board_hash, rack))
+            if entry is None:
+                self.misses += 1
+                profiler.count('move_cache_misses')
+                return None
+            self.entries.move_to_end((kind, board_hash, rack))
+            self.hits += 1
+            profiler.count('move_cache_hits')
+            return entry[0]
+
+    def put(self, kind, board_hash, rack, value, moves):
+        """
+        Stores the moves of a position, dropping the least recently used entries over the limit.
+
+        Args:
+            kind (str): The kind of search the moves were generated by, e.g. 'opponent' or 'hint'.
+            board_hash (int): The Zobrist hash of the board.
+            rack (str): The sorted letters of the rack, None for moves generated without a rack.
+            value (object): The value to cache, e.g. the moves and their scores.
+            moves (int): The number of moves in the value, to estimate its memory.
+        """
+        size = (moves + 1) * MOVE_BYTES
+        with self.lock:
+            previous = self.entries.pop((kind, board_hash, rack), None)
+            if previous is not None:
+                self.size_bytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self.entries[(kind, board_hash, rack)] = (value, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, dropped) = self.entries.popitem(last=False)
+                self.size_bytes -= dropped
+
+    def clear(self):
+        """
+        Drops every entry, the counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits, the misses, the number of entries and their estimated memory in bytes.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries), 'bytes': self.size_bytes}
@@ -0,0 +1,338 @@
+import time
+from Gaddag import SEPARATOR
+from Profiler import profiler
+
+BLOCKED = frozenset()  # The letters allowed on a cell where the opponent cannot place a new letter
+CHECK_INTERVAL = 64  # Steps of the walk between two checks of the clock and of the cancellation
+
+class SearchLimit:
+    """
+    The deadline and the cancellation of a single search.
+
+    Every search gets its own limit, passed down the walk, so the searches
+    running at the same time on a shared MoveGenerator, e.g. a cancelled
+    opponent turn finishing its line and the next turn, do not stop each
+    other. The walk checks the limit every CHECK_INTERVAL steps.
+
+    Attributes:
+        deadline (float): The perf_counter time the search stops at, None for no time limit.
+        cancelled (callable): Returns True when the search should stop early, None if it is never cancelled.
+        reached (bool): True once the deadline has passed or the search was cancelled.
+        countdown (int): The steps of the walk left before the next check.
+    """
+
+    def __init__(self, deadline=None, cancelled=None):
+        """
+        Initializes the SearchLimit.
+
+        Args:
+            deadline (float): The perf_counter time the search stops at, None for no time limit.
+            cancelled (callable): Returns True when the search should stop early, None if it is never cancelled.
+        """
+        self.deadline = deadline
+        self.cancelled = cancelled
+        self.reached = False
+        self.countdown = 1
+
+    def check(self):
+        """
+        Checks the clock and the cancellation.
+
+        Returns:
+            bool: True if the search should stop.
+        """
+        if not self.reached:
+            self.reached = (self.deadline is not None and time.perf_counter() > self.deadline) or \
+                (self.cancelled is not None and self.cancelled())
+        return self.reached
+
+    def step(self):
+        """
+        Counts a step of the walk, checking the limit every CHECK_INTERVAL steps.
+
+        Returns:
+            bool: True if the search should stop.
+        """
+        self.countdown -= 1
+        if self.countdown:
+            return self.reached
+        self.countdown = CHECK_INTERVAL
+        return self.check()
+
+class MoveGenerator:
+    """
+    Generates the legal placements for the opponent using a GADDAG.
+
+    Instead of trying every dictionary word on every cell, words are grown
+    from anchor squares (empty cells next to a placed letter), so only the
+    placements that touch the existing words are ever explored. The
+    placements follow the same rules as Opponent.can_place_word and
+    Opponent.is_valid_placement: the word is bounded by empty cells, reuses
+    at least one letter already on the board, places at least one new
+    letter, and a new letter is never placed next to a letter of a
+    perpendicular word. The words already on the board are not moves.
+
+    The walk itself (walk, extend_left and extend_right) is shared with the
+    HintFinder: the letters allowed on every empty cell and an optional rack
+    are the only differences between the opponent's search and the hints.
+
+    The generator keeps no state between calls, the deadline and the
+    cancellation of a search are passed down the walk in a SearchLimit, so
+    several threads can search with the same generator.
+
+    Attributes:
+        gaddag (Gaddag): The GADDAG built from the dictionary.
+        board_size (int): The size of the board.
+    """
+
+    def __init__(self, gaddag, board_size):
+        """
+        Initializes the MoveGenerator with the given GADDAG.
+
+        Args:
+            gaddag (Gaddag): The GADDAG built from the dictionary.
+            board_size (int): The size of the board.
+        """
+        self.gaddag = gaddag
+        self.board_size = board_size
+
+    def generate(self, board, cross_checks, progress=None, cancelled=None, deadline=None, priority=None, rack=None):
+        """
+        Finds all the legal placements on the board.
+
+        Only the rows and columns holding letters are searched. The anchors are
+        read from the cross-check cache and the blocked cells from the hook
+        bitmasks of the board. With a deadline the search is anytime: it returns
+        the placements found so far when the deadline passes, so the lines are
+        searched in order of priority. The deadline and the cancellation are
+        also checked inside the walk of a line.
+
+        Args:
+            board (BoardView): The letters on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+            progress (callable): Called with the searched fraction of the lines after every line.
+            cancelled (callable): Returns True when the search should stop early.
+            deadline (float): The perf_counter time the search stops at, None to search the whole board.
+            priority (callable): Returns the priority of a line task, the lines with the highest priority
+                are searched first. None to search the lines in board order.
+            rack (Counter): The letters the new cells can take, None for any letter.
+
+        Returns:
+            list: A list of tuples containing the word, position, and direction.
+        """
+        with profiler.span('generate_moves'):
+            tasks = self.line_tasks(board, cross_checks)
+            if priority is not None:
+                tasks.sort(key=priority, reverse=True)
+            limit = None if deadline is None and cancelled is None else SearchLimit(deadline, cancelled)
+            moves = []
+            searched = 0
+            for task in tasks:
+                if limit is not None and limit.check():
+                    break
+                moves.extend(self.search_line(*task, limit=limit, rack=rack))
+                if limit is not None and limit.reached:
+                    break  # The line was cut short
+                searched += 1
+                if progress is not None:
+                    progress(searched / len(tasks))
+            profiler.count('lines_searched', searched)
+            profiler.count('lines_pruned', len(tasks) - searched)
+            profiler.count('moves_generated', len(moves))
+            return moves
+
+    def line_tasks(self, board, cross_checks):
+        """
+        Splits the search into one independent task per row and column holding letters.
+
+        Args:
+            board (BoardView): The letters on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+
+        Returns:
+            list: A list of tuples with the line index, direction, letters, blocked cells and anchors,
+            the arguments of search_line.
+        """
+        row_anchors = {}
+        col_anchors = {}
+        for row, col in cross_checks.anchors:
+            row_anchors.setdefault(row, []).append(col)
+            col_anchors.setdefault(col, []).append(row)
+
+        tasks = []
+        for row in cross_checks.rows:
+            hooks = board.hook_mask(row, 'horizontal')
+            blocked = [bool(hooks >> col & 1) for col in range(self.board_size)]
+            tasks.append((row, 'horizontal', board.line(row, 'horizontal'), blocked, sorted(row_anchors.get(row, []))))
+        for col in cross_checks.columns:
+            hooks = board.hook_mask(col, 'vertical')
+            blocked = [bool(hooks >> row & 1) for row in range(self.board_size)]
+            tasks.append((col, 'vertical', board.line(col, 'vertical'), blocked, sorted(col_anchors.get(col, []))))
+        return tasks
+
+    def search_line(self, index, direction, line, blocked, anchors, limit=None, rack=None):
+        """
+        Finds the legal placements on one row or column.
+
+        Args:
+            index (int): The row index for 'horizontal', the column index for 'vertical'.
+            direction (str): The direction of the line ('horizontal' or 'vertical').
+            line (list): The letters on the line, None for the empty cells.
+            blocked (list): For every cell, True if a new letter cannot be placed there.
+            anchors (list): The sorted indexes of the anchor squares on the line.
+            limit (SearchLimit): The deadline and the cancellation of the search, None to search the whole line.
+            rack (Counter): The letters the new cells can take, None for any letter.
+
+        Returns:
+            list: A list of tuples containing the word, position, and direction.
+        """
+        words = self.generate_line(line, blocked, anchors, limit, rack)
+        if direction == 'horizontal':
+            return [(word, (index, start), direction) for word, start in words]
+        return [(word, (start, index), direction) for word, start in words]
+
+    def generate_line(self, line, blocked, anchors, limit=None, rack=None):
+        """
+        Finds all the legal words on a single row or column.
+
+        Args:
+            line (list): The letters on the line, None for the empty cells.
+            blocked (list): For every cell, True if a new letter cannot be placed there.
+            anchors (list): The sorted indexes of the anchor squares on the line.
+            limit (SearchLimit): The deadline and the cancellation of the search, None to search the whole line.
+            rack (Counter): The letters the new cells can take, None for any letter.
+
+        Returns:
+            list: A list of tuples containing the word and its start index on the line.
+        """
+        results = []
+        checks = [BLOCKED if cell_blocked else None for cell_blocked in blocked]
+        anchor_set = set(anchors)
+        for anchor in anchors:
+            if not blocked[anchor]:
+                self.walk(line, checks, anchor_set, anchor, rack, results, limit)
+        return results
+
+    def walk(self, line, checks, anchor_set, anchor, rack, results, limit=None):
+        """
+        Finds the words of at least two letters that cover an anchor of a line.
+
+        This is the GADDAG walk of both the opponent and the hint search, which
+        only differ in the letters they allow on the empty cells.
+
+        Args:
+            line (list): The letters on the line, None for the empty cells.
+            checks (list): For every cell, the letters allowed there, None for any letter.
+            anchor_set (set): The anchor squares of the line.
+            anchor (int): The anchor the words are grown from.
+            rack (Counter): The letters the new cells can take, used up as they are placed.
+                None for any letter of the alphabet.
+            results (list): The list collecting the found words and their start indexes.
+            limit (SearchLimit): The deadline and the cancellation of the search, None to walk to the end.
+        """
+        self.extend_left(line, checks, anchor_set, anchor, anchor, self.gaddag.root, '', rack, results, limit)
+
+    def letter_choices(self, node, rack, allowed):
+        """
+        Returns the letters that continue a GADDAG path and can be placed on an empty cell.
+
+        Args:
+            node (int): The current GADDAG node.
+            rack (Counter): The letters left on the rack, None for any letter.
+            allowed (frozenset): The letters allowed on the cell, None for any letter.
+
+        Returns:
+            list: The (letter, child node) pairs.
+        """
+        edges = self.gaddag.edges[node]
+        if rack is None:
+            return [(letter, child) for letter, child in edges.items()
+                    if letter != SEPARATOR and (allowed is None or letter in allowed)]
+        return [(letter, edges[letter]) for letter, left in rack.items()
+                if left and letter in edges and (allowed is None or letter in allowed)]
+
+    def extend_left(self, line, checks, anchor_set, anchor, pos, node, reversed_prefix, rack, results, limit):
+        """
+        Grows the word leftwards from the anchor, then switches to the right part.
+
+        Args:
+            line (list): The letters on the line, None for the empty cells.
+            checks (list): For every cell, the letters allowed there, None for any letter.
+            anchor_set (set): The anchor squares of the line.
+            anchor (int): The anchor the word is grown from.
+            pos (int): The cell being filled.
+            node (int): The current GADDAG node.
+            reversed_prefix (str): The letters placed so far, from the anchor leftwards.
+            rack (Counter): The letters left on the rack, None for any letter.
+            results (list): The list collecting the found words and their start indexes.
+            limit (SearchLimit): The deadline and the cancellation of the search, None to walk to the end.
+        """
+        if limit is not None and limit.step():
+            return
+        edges = self.gaddag.edges
+        cell = line[pos]
+        if cell is not None:
+            child = edges[node].get(cell)
+            choices = [(cell, child)] if child is not None else []
+        elif pos != anchor and pos in anchor_set:
+            # Words covering an anchor further left are generated from that anchor.
+            return
+        elif rack is None and checks[pos] is None:  # The opponent's usual case, inlined as it is the hot path
+            choices = [(letter, child) for letter, child in edges[node].items() if letter != SEPARATOR]
+        else:
+            choices = self.letter_choices(node, rack, checks[pos])
+
+        used = rack is not None and cell is None
+        for letter, child in choices:
+            if used:
+                rack[letter] -= 1
+            prefix = reversed_prefix + letter
+            if pos == 0 or line[pos - 1] is None:
+                separator = edges[child].get(SEPARATOR)
+                if separator is not None:
+                    self.extend_right(line, checks, anchor + 1, separator, prefix[::-1], pos, rack, results, limit)
+            if pos > 0:
+                self.extend_left(line, checks, anchor_set, anchor, pos - 1, child, prefix, rack, results, limit)
+            if used:
+                rack[letter] += 1
+
+    def extend_right(self, line, checks, pos, node, word, start, rack, results, limit):
+        """
+        Grows the word rightwards after the anchor and records the complete words.
+
+        Args:
+            line (list): The letters on the line, None for the empty cells.
+            checks (list): For every cell, the letters allowed there, None for any letter.
+            pos (int): The cell being filled.
+            node (int): The current GADDAG node.
+            word (str): The word built so far.
+            start (int): The start index of the word on the line.
+            rack (Counter): The letters left on the rack, None for any letter.
+            results (list): The list collecting the found words and their start indexes.
+            limit (SearchLimit): The deadline and the cancellation of the search, None to walk to the end.
+        """
+        if limit is not None and limit.step():
+            return
+        at_end = pos == len(line)
+        if len(word) > 1 and self.gaddag.terminal[node] and (at_end or line[pos] is None):
+            results.append((word, start))
+        if at_end:
+            return
+
+        edges = self.gaddag.edges
+        cell = line[pos]
+        if cell is not None:
+            child = edges[node].get(cell)
+            if child is not None:
+                self.extend_right(line, checks, pos + 1, child, word + cell, start, rack, results, limit)
+            return
+        if rack is None:
+            allowed = checks[pos]
+            for letter, child in edges[node].items():
+                if letter != SEPARATOR and (allowed is None or letter in allowed):
+                    self.extend_right(line, checks, pos + 1, child, word + letter, start, None, results, limit)
+            return
+        for letter, child in self.letter_choices(node, rack, checks[pos]):
+            rack[letter] -= 1
+            self.extend_right(line, checks, pos + 1, child, word + letter, start, rack, results, limit)
+            rack[letter] += 1
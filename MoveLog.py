@@ -0,0 +1,199 @@
+import json
+
+PLAYER_KINDS = ('place', 'remove', 'submit')  # The entries recorded for the actions of the player
+OPPONENT_KINDS = ('move', 'pass')  # The entries recorded for the turns of the opponent
+
+class MoveLog:
+    """
+    An append-only log of the changes made to the board during a game.
+
+    Every entry is a small delta rather than a copy of the board: a tuple of
+    its kind, the cells it changed as (row, col, letter) tuples, the iteration
+    it was made in, the score it earned, and for a submit the rack before and
+    after it ('' otherwise). The kinds are:
+
+        place: The player put a letter of the rack on an empty cell.
+        remove: The player took back a letter that was not submitted yet.
+        submit: The player's pending letters were accepted and locked.
+        move: The opponent placed a word, the cells are its new letters.
+        pass: The opponent skipped its turn.
+
+    Undo and redo only move the position in the log, so the entries after it
+    can be redone until a new entry is recorded, which drops them. A saved
+    game is the rack dealt at the start and the applied entries, one JSON
+    line each, and is loaded by replaying the entries on an empty board.
+
+    Attributes:
+        rack (str): The rack dealt at the start of the game.
+        entries (list): The recorded entries, oldest first.
+        position (int): The number of entries applied to the board.
+    """
+
+    def __init__(self, rack=''):
+        """
+        Initializes an empty MoveLog.
+
+        Args:
+            rack (str): The rack dealt at the start of the game.
+        """
+        self.rack = rack
+        self.entries = []
+        self.position = 0
+
+    def record(self, kind, cells, iteration, score=0, racks=('', '')):
+        """
+        Appends an entry after the applied ones, dropping the entries that were undone.
+
+        Args:
+            kind (str): The kind of the entry.
+            cells (tuple): The changed cells, as (row, col, letter) tuples.
+            iteration (int): The iteration the change was made in.
+            score (int): The score earned by the change.
+            racks (tuple): The rack before and after a submit.
+        """
+        del self.entries[self.position:]
+        self.entries.append((kind, tuple(cells), iteration, score, tuple(racks)))
+        self.position += 1
+
+    def undo(self):
+        """
+        Steps back over the last applied entry.
+
+        Returns:
+            tuple: The entry to revert, or None if no entry is applied.
+        """
+        if self.position == 0:
+            return None
+        self.position -= 1
+        return self.entries[self.position]
+
+    def redo(self):
+        """
+        Steps forward over the next undone entry.
+
+        Returns:
+            tuple: The entry to apply again, or None if no entry was undone.
+        """
+        if self.position == len(self.entries):
+            return None
+        self.position += 1
+        return self.entries[self.position - 1]
+
+    def upcoming(self):
+        """
+        Returns the entry the next redo would apply.
+
+        Returns:
+            tuple: The next undone entry, or None if no entry was undone.
+        """
+        return self.entries[self.position] if self.position < len(self.entries) else None
+
+    def score(self, kinds):
+        """
+        Sums the scores of the applied entries of some kinds.
+
+        Args:
+            kinds (tuple): The kinds of the entries to sum.
+
+        Returns:
+            int: The total score.
+        """
+        return sum(entry[3] for entry in self.entries[:self.position] if entry[0] in kinds)
+
+    def save(self, path):
+        """
+        Writes the start rack and the applied entries to a file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'rack': self.rack}) + '\n')
+            for entry in self.entries[:self.position]:
+                file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+    @classmethod
+    def load(cls, path, board_size, letters):
+        """
+        Reads a log written by save, with every entry undone and ready to be replayed.
+
+        Every entry is checked before it is returned, so a damaged or foreign
+        file is rejected as a whole instead of failing halfway through a replay.
+
+        Args:
+            path (str): The path of the file.
+            board_size (int): The size of the board the entries are replayed on.
+            letters (str): The letters that can be on the board.
+
+        Returns:
+            MoveLog: The loaded log.
+
+        Raises:
+            ValueError: If the file is not a saved game for this board.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            try:
+                header = json.loads(file.readline())
+            except ValueError as error:
+                raise ValueError(f"line 1 is not a saved game header: {error}") from None
+            if not isinstance(header, dict) or not is_letters(header.get('rack'), letters):
+                raise ValueError("line 1 is not a saved game header")
+            log = cls(header['rack'])
+            for number, line in enumerate(file, 2):
+                if line.strip():
+                    try:
+                        entry = json.loads(line)
+                    except ValueError as error:
+                        raise ValueError(f"line {number} is not valid JSON: {error}") from None
+                    log.entries.append(parse_entry(entry, board_size, letters, number))
+        return log
+
+def is_letters(value, letters):
+    """
+    Checks if a value is a string made of the letters of the board.
+
+    Args:
+        value (object): The value to check.
+        letters (str): The letters that can be on the board.
+
+    Returns:
+        bool: True if the value is a string of those letters, False otherwise.
+    """
+    return isinstance(value, str) and all(letter in letters for letter in value)
+
+def parse_entry(entry, board_size, letters, number):
+    """
+    Checks the shape, the types and the cells of an entry read from a saved game.
+
+    Args:
+        entry (object): The decoded JSON of the entry.
+        board_size (int): The size of the board the entry is replayed on.
+        letters (str): The letters that can be on the board.
+        number (int): The line number of the entry, for the error message.
+
+    Returns:
+        tuple: The entry, in the form recorded by MoveLog.record.
+
+    Raises:
+        ValueError: If the entry is not valid.
+    """
+    if not isinstance(entry, list) or len(entry) != 5:
+        raise ValueError(f"line {number} is not a log entry")
+    kind, cells, iteration, score, racks = entry
+    if kind not in PLAYER_KINDS + OPPONENT_KINDS:
+        raise ValueError(f"line {number} has an unknown kind: {kind!r}")
+    if type(iteration) is not int or iteration < 0 or type(score) is not int or score < 0:
+        raise ValueError(f"line {number} has an invalid iteration or score")
+    if not isinstance(racks, list) or len(racks) != 2 or not all(is_letters(rack, letters) for rack in racks):
+        raise ValueError(f"line {number} has invalid racks")
+    if not isinstance(cells, list):
+        raise ValueError(f"line {number} has invalid cells")
+    for cell in cells:
+        if not isinstance(cell, list) or len(cell) != 3:
+            raise ValueError(f"line {number} has an invalid cell: {cell!r}")
+        row, col, letter = cell
+        if type(row) is not int or type(col) is not int or not (0 <= row < board_size and 0 <= col < board_size):
+            raise ValueError(f"line {number} has a cell outside the board: {cell!r}")
+        if not is_letters(letter, letters) or len(letter) != 1:
+            raise ValueError(f"line {number} has an invalid letter: {cell!r}")
+    return kind, tuple(map(tuple, cells)), iteration, score, tuple(racks)
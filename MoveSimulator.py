@@ -0,0 +1,198 @@
+import multiprocessing
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from CompiledDictionary import CompiledDictionary
+from constants import simulation_rate
+from GameEngine import GameEngine
+from Profiler import profiler
+
+worker_simulator = None  # The MoveSimulator of the current worker process
+
+def init_worker(compiled_path, buffer, board_size, reply_budget):
+    """
+    Sets up the simulator of a worker process, once per process.
+
+    Args:
+        compiled_path (str): The path to the compiled dictionary, None if it is only in memory.
+        buffer (bytes): The contents of the compiled dictionary when it is only in memory.
+        board_size (int): The size of the board.
+        reply_budget (float): The time in seconds the search of a reply may take.
+    """
+    global worker_simulator
+    dictionary = CompiledDictionary.open(compiled_path) if compiled_path else CompiledDictionary(buffer)
+    worker_simulator = MoveSimulator(dictionary, board_size, reply_budget=reply_budget)
+
+def simulate_move(board, iteration, move, count):
+    """
+    Plays continuations of a move in a worker process.
+
+    Args:
+        board (BoardState): The letters on the board, before the move.
+        iteration (int): The current iteration number.
+        move (tuple): The word, position, and direction of the move.
+        count (int): The number of continuations to play.
+
+    Returns:
+        list: The outcome of every continuation, as returned by MoveSimulator.simulate.
+    """
+    return worker_simulator.simulate(board, iteration, move, count)
+
+class MoveSimulator:
+    """
+    Evaluates candidate moves by playing random continuations of the game.
+
+    A continuation plays the candidate, deals the player a rack sampled the
+    way the game deals racks (the opponent cannot see the real one), and lets
+    the player answer with one of its best moves for that rack, chosen at
+    random. The outcome is the score of the candidate minus the score of the
+    answer, so moves opening premium squares to the player are penalized.
+
+    The continuations are played in small batches, round-robin over the
+    candidates, until the deadline. The batches are started at most at the
+    given rate, so the CPU cost of the opponent stays bounded, and are spread
+    over a pool of worker processes when there are several workers.
+
+    Attributes:
+        engine (GameEngine): The engine the continuations are played on in this process.
+        reply_budget (float): The time in seconds the search of a reply may take.
+        reply_count (int): The number of best replies the answer is chosen from.
+        rate (float): The maximum number of continuations started per second.
+        batch (int): The number of continuations played per task.
+        workers (int): The number of worker processes, 1 to play in the calling thread.
+        executor (ProcessPoolExecutor): The pool of worker processes, None with a single worker.
+    """
+
+    def __init__(self, dictionary, board_size, workers=1, rate=simulation_rate, reply_budget=0.05, reply_count=3,
+                 batch=4, word_index=None):
+        """
+        Initializes the MoveSimulator and starts its worker processes.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary of the game.
+            board_size (int): The size of the board.
+            workers (int): The number of worker processes, 1 to play in the calling thread.
+            rate (float): The maximum number of continuations started per second.
+            reply_budget (float): The time in seconds the search of a reply may take.
+            reply_count (int): The number of best replies the answer is chosen from.
+            batch (int): The number of continuations played per task.
+            word_index (WordIndex): The indexes of the dictionary used to sample the racks.
+        """
+        self.engine = GameEngine(dictionary, board_size, verbose=False, deal_rack=False, word_index=word_index)
+        self.reply_budget = reply_budget
+        self.reply_count = reply_count
+        self.rate = rate
+        self.batch = batch
+        self.workers = workers
+        self.executor = None
+        if workers > 1:
+            buffer = None if dictionary.path else bytes(dictionary.buffer)
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=init_worker,
+                                                initargs=(dictionary.path, buffer, board_size, reply_budget))
+
+    def simulate(self, board, iteration, move, count):
+        """
+        Plays continuations of a move.
+
+        Args:
+            board (BoardState): The letters on the board, before the move.
+            iteration (int): The current iteration number.
+            move (tuple): The word, position, and direction of the move.
+            count (int): The number of continuations to play.
+
+        Returns:
+            list: For every continuation, the score of the move minus the score of the answer.
+        """
+        engine = self.engine
+        engine.load_board(board, iteration)
+        score = engine.scorer.score_move(engine.view, move)
+        engine.play_move(move, score)
+
+        outcomes = []
+        for _ in range(count):
+            engine.rack = []
+            engine.replace_letters()  # Samples a rack from the letters available on the board
+            replies = engine.find_hints(self.reply_count, self.reply_budget)
+            outcomes.append(score - (random.choice(replies)[0] if replies else 0))
+        return outcomes
+
+    def evaluate(self, board, iteration, moves, deadline, cancelled=None):
+        """
+        Plays continuations of the candidate moves until the deadline.
+
+        Args:
+            board (BoardView): The letters on the board, before the moves.
+            iteration (int): The current iteration number.
+            moves (list): The candidate moves.
+            deadline (float): The perf_counter time the simulations stop at.
+            cancelled (callable): Returns True when the simulations should stop early.
+
+        Returns:
+            list: For every move, the average outcome of its continuations, None if none was played.
+        """
+        with profiler.span('simulate'):
+            board = board.copy()
+            totals = [0] * len(moves)
+            counts = [0] * len(moves)
+            start = time.perf_counter()
+            started = 0
+            next_move = 0
+            pending = {}
+
+            def stopped():
+                return time.perf_counter() > deadline or (cancelled is not None and cancelled())
+
+            while True:
+                # Start batches while a worker is free, within the rate and before the deadline
+                while len(pending) < self.workers * 2 and not stopped() and self.throttle(start, started, deadline):
+                    if self.executor is None:
+                        outcomes = self.simulate(board, iteration, moves[next_move], self.batch)
+                        totals[next_move] += sum(outcomes)
+                        counts[next_move] += len(outcomes)
+                    else:
+                        future = self.executor.submit(simulate_move, board, iteration, moves[next_move], self.batch)
+                        pending[future] = next_move
+                    started += self.batch
+                    profiler.count('simulations', self.batch)
+                    next_move = (next_move + 1) % len(moves)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, max(0, deadline - time.perf_counter()), return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcomes = future.result()
+                    totals[pending[future]] += sum(outcomes)
+                    counts[pending.pop(future)] += len(outcomes)
+                if not done or (cancelled is not None and cancelled()):
+                    for future in pending:
+                        future.cancel()
+                    break
+            return [total / count if count else None for total, count in zip(totals, counts)]
+
+    def throttle(self, start, started, deadline):
+        """
+        Waits until the next batch can start without going over the rate.
+
+        Args:
+            start (float): The perf_counter time the simulations started at.
+            started (int): The number of continuations started so far.
+            deadline (float): The perf_counter time the simulations stop at.
+
+        Returns:
+            bool: True if the batch can start, False if the deadline comes first.
+        """
+        ready = start + started / self.rate
+        if ready > deadline:
+            return False
+        delay = ready - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def shutdown(self):
+        """
+        Stops the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,58 +1,298 @@
+import logging
 import random
-import Utils
-from constants import letter_scores, special_tiles
-import tkinter as tk
-from tkinter import messagebox
+import threading
+import time
+from collections import Counter
+from constants import difficulty_levels, simulation_candidates
+from MoveGenerator import MoveGenerator
+from MoveSimulator import MoveSimulator
+from ParallelMoveGenerator import ParallelMoveGenerator
+from Profiler import profiler
+
+logger = logging.getLogger(__name__)
 
 class Opponent:
     """
     Represents the opponent player in the Scrabble game.
 
+    Without a difficulty level the opponent searches the whole board and plays
+    a random legal move. With a level, the search is anytime: the rows and
+    columns with the most room and premium squares are searched first, the
+    search stops at the time budget of the level, and the moves found so far
+    are ranked with the strategy of the level. The simulation strategy spends
+    half of the budget searching and the other half playing continuations of
+    the best scoring moves with a MoveSimulator.
+
+    With a rack size the opponent only plays the letters of its rack, which
+    makes every search much cheaper. Its rack is refilled after every move
+    with letters drawn from random dictionary words, so the letters follow
+    their frequencies in the language.
+
     Attributes:
-        game (Game): The game instance.
+        engine (GameEngine): The engine holding the board of the game.
         total_score (int): The total score of the opponent.
+        move_generator (MoveGenerator): The GADDAG-based generator of legal placements, a
+            ParallelMoveGenerator when the search is spread over several processes.
+        budget (float): The time in seconds the search may take, None to search the whole board.
+        strategy (str): How the move is chosen among the moves found: 'random', 'top_quarter', 'best'
+            or 'simulation'.
+        simulator (MoveSimulator): The simulator of the continuations, None unless the strategy is 'simulation'.
+        rack_size (int): The number of letters on the rack, None for an opponent that can play any letter.
+        rack (list): The letters of the opponent, None for an opponent that can play any letter.
     """
 
-    def __init__(self, game):
+    def __init__(self, engine, workers=1, difficulty=None, rack_size=None):
         """
-        Initializes the Opponent with the given game instance.
+        Initializes the Opponent with the given game engine.
 
         Args:
-            game (Game): The game instance.
+            engine (GameEngine): The engine holding the board of the game.
+            workers (int): The number of processes searching for moves, 1 to search in the calling thread.
+            difficulty (str): A key of constants.difficulty_levels, None for an unlimited random opponent.
+            rack_size (int): The number of letters on the rack, None for an opponent that can play any letter.
         """
-        self.game = game
+        self.engine = engine
         self.total_score = 0
+        self.budget, self.strategy = difficulty_levels[difficulty] if difficulty else (None, 'random')
+        self.simulator = None
+        if self.strategy == 'simulation':
+            self.simulator = MoveSimulator(self.engine.dictionary, self.engine.board_size, workers,
+                                           word_index=self.engine.word_index)
+        if workers > 1:
+            self.move_generator = ParallelMoveGenerator(self.engine.dictionary, self.engine.board_size, workers)
+        else:
+            self.move_generator = MoveGenerator(self.engine.dictionary.gaddag, self.engine.board_size)
+        self.rack_size = rack_size
+        self.rack = None
+        if rack_size:
+            self.rack = []
+            self.refill_rack()
+
+    def refill_rack(self):
+        """
+        Draws letters until the rack is full, each one from a random word of the dictionary.
+        """
+        dictionary = self.engine.dictionary
+        while len(self.rack) < self.rack_size:
+            self.rack.append(random.choice(dictionary.word(random.randrange(len(dictionary)))))
 
     def make_move(self):
         """
         Makes a move for the opponent by finding and placing a valid word.
+
+        Returns:
+            list: The placed letters and their positions, or None if no word can be placed.
+        """
+        return self.apply_move(self.choose_move(self.engine.view, self.engine.cross_checks, rack=self.rack))
+
+    def start_move(self, on_progress, on_done):
+        """
+        Starts searching for the opponent's move in a worker thread.
+
+        The search works on a copy of the board, so the game can keep running.
+        The chosen move must be passed to apply_move on the main thread.
+
+        Args:
+            on_progress (callable): Called from the worker with the searched fraction of the board.
+            on_done (callable): Called from the worker with the chosen move, unless the search is cancelled.
+
+        Returns:
+            threading.Event: The event to set to cancel the search.
+        """
+        board = self.engine.view.copy()
+        cross_checks = self.engine.cross_checks.copy()
+        rack = None if self.rack is None else list(self.rack)
+        cancel_event = threading.Event()
+
+        def search():
+            move = self.choose_move(board, cross_checks, on_progress, cancel_event.is_set, rack)
+            if not cancel_event.is_set():
+                on_done(move)
+
+        threading.Thread(target=search, daemon=True).start()
+        return cancel_event
+
+    def choose_move(self, board, cross_checks, progress=None, cancelled=None, rack=None):
+        """
+        Chooses the opponent's move without changing the board.
+
+        The search stops at the time budget of the difficulty level, if any. The moves
+        of a position are taken from the move cache of the engine when they were
+        already generated and scored.
+
+        Args:
+            board (BoardView): The letters on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+            progress (callable): Called with the searched fraction of the board.
+            cancelled (callable): Returns True when the search should stop early.
+            rack (list): The letters the move can use, None for any letter.
+
+        Returns:
+            tuple: The word, position, and direction of the move, or None if no word can be placed.
+        """
+        with profiler.span('choose_move'):
+            start = time.perf_counter()
+            cache = self.engine.move_cache
+            rack_key = None if rack is None else ''.join(sorted(rack))
+            cached = cache.get('opponent', board.zobrist, rack_key)
+            if cached is not None:
+                possible_words, scores = cached
+                complete = True
+            else:
+                possible_words, complete = self.generate_moves(board, cross_checks, progress, cancelled, start,
+                                                               None if rack is None else Counter(rack))
+                scores = None
+                if complete:
+                    cache.put('opponent', board.zobrist, rack_key, (possible_words, None), len(possible_words))
+            if not possible_words:
+                return None
+            profiler.count('opponent_candidates', len(possible_words))
+            if self.strategy == 'random':
+                return random.choice(possible_words)
+
+            if scores is None:
+                scores = self.engine.scorer.score_moves(board, possible_words)
+                if complete:
+                    cache.put('opponent', board.zobrist, rack_key, (possible_words, scores), len(possible_words))
+            ranked = sorted(zip(scores, range(len(possible_words))), reverse=True)
+            if self.strategy == 'simulation':
+                candidates = [possible_words[index] for _, index in ranked[:simulation_candidates]]
+                profiler.count('opponent_pruned', len(possible_words) - len(candidates))
+                outcomes = self.simulator.evaluate(board, self.engine.iteration, candidates, start + self.budget, cancelled)
+                played = [(outcome, index) for index, outcome in enumerate(outcomes) if outcome is not None]
+                return candidates[max(played)[1]] if played else candidates[0]
+            if self.strategy == 'best':
+                ranked = [move for move in ranked if move[0] == ranked[0][0]]
+            else:
+                ranked = ranked[:max(1, len(ranked) // 4)]
+            profiler.count('opponent_pruned', len(possible_words) - len(ranked))
+            return possible_words[random.choice(ranked)[1]]
+
+    def generate_moves(self, board, cross_checks, progress, cancelled, start, rack=None):
+        """
+        Generates the moves within the search budget of the difficulty level.
+
+        When the budget runs out before any move is found, the search starts
+        again with one more budget, so the search takes at most twice its
+        budget. If it still finds nothing, the opponent cannot move this turn.
+
+        Args:
+            board (BoardView): The letters on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+            progress (callable): Called with the searched fraction of the board.
+            cancelled (callable): Returns True when the search should stop early.
+            start (float): The perf_counter time the turn started at.
+            rack (Counter): The letters the moves can use, None for any letter.
+
+        Returns:
+            tuple: The moves found, and True if the whole board was searched.
+        """
+        if self.budget is None:
+            moves = self.move_generator.generate(board, cross_checks, progress, cancelled, rack=rack)
+            return moves, not (cancelled and cancelled())
+
+        # The ranking strategies score the moves found, a quarter of the budget is kept for it
+        budget = {'random': self.budget, 'simulation': self.budget / 2}.get(self.strategy, self.budget * 0.75)
+        deadline = start + budget
+        moves = self.move_generator.generate(board, cross_checks, progress, cancelled, deadline, self.line_priority, rack)
+        if time.perf_counter() <= deadline:
+            return moves, not (cancelled and cancelled())
+        if not moves and not (cancelled and cancelled()):
+            # Nothing was found in time, the search gets one more budget before the turn is given up
+            deadline = time.perf_counter() + budget
+            moves = self.move_generator.generate(board, cross_checks, progress, cancelled, deadline, self.line_priority, rack)
+            return moves, time.perf_counter() <= deadline and not (cancelled and cancelled())
+        return moves, False
+
+    def line_priority(self, task):
+        """
+        Rates a row or column by the room and the premium squares it offers to new letters.
+
+        Every cell a new letter can be placed on counts its letter and word multipliers,
+        so long free stretches and premium squares are searched first.
+
+        Args:
+            task (tuple): The line task, as returned by MoveGenerator.line_tasks.
+
+        Returns:
+            int: The priority of the line.
+        """
+        index, direction, line, blocked, _ = task
+        scorer = self.engine.scorer
+        size = self.engine.board_size
+        first, step = (index * size, 1) if direction == 'horizontal' else (index, size)
+        return sum(scorer.letter_multipliers[first + position * step] * scorer.word_multipliers[first + position * step]
+                   for position in range(size) if line[position] is None and not blocked[position])
+
+    def apply_move(self, move, from_rack=True):
+        """
+        Places the chosen move on the board and updates the score.
+
+        Args:
+            move (tuple): The word, position, and direction of the move, or None if no word can be placed.
+            from_rack (bool): False for a move whose letters do not come from the rack, e.g. an opening word.
+
+        Returns:
+            list: The placed letters and their positions, or None if no word can be placed.
+        """
+        if move is None:
+            if self.engine.verbose:
+                logger.info("Opponent cannot make a move.")
+            return None
+
+        if self.rack is not None and from_rack:
+            word, (row, col), direction = move
+            dr, dc = (0, 1) if direction == 'horizontal' else (1, 0)
+            for i, letter in enumerate(word):
+                if self.engine.board.letter(row + dr * i, col + dc * i) is None:
+                    self.rack.remove(letter)
+            self.refill_rack()
+        placed_word = self.engine.play_move(move, self.calculate_score(move))
+        if self.engine.verbose:
+            self.engine.log_board()
+        return placed_word
+
+    def forfeit(self):
         """
-        possible_words = self.find_possible_words()
-        if not possible_words:
-            print("Opponent cannot make a move.")
-            self.game.end_game()
-            return
+        Skips the opponent's turn without placing a word.
 
-        word, position, direction = random.choice(possible_words)
-        placed_word = self.place_word(word, position, direction)
-        self.calculate_score(placed_word)
-        self.game.iteration += 1
-        self.game.print_board_matrix()
+        An opponent with a rack exchanges all its letters for new ones.
+        """
+        if self.engine.verbose:
+            logger.info("Opponent forfeits its turn.")
+        if self.rack is not None:
+            self.rack = []
+            self.refill_rack()
+        self.engine.pass_turn()
+
+    def shutdown(self):
+        """
+        Stops the worker processes of the move search and of the simulations, if any.
+        """
+        if isinstance(self.move_generator, ParallelMoveGenerator):
+            self.move_generator.shutdown()
+        if self.simulator is not None:
+            self.simulator.shutdown()
 
     def find_possible_words(self):
         """
         Finds all possible words that the opponent can place on the board.
 
+        The placements are generated from the anchor squares with the GADDAG and
+        are the same ones accepted by can_place_word and is_valid_placement. They
+        are taken from the move cache of the engine when the position was already searched.
+
         Returns:
             list: A list of tuples containing the word, position, and direction.
         """
-        possible_words = []
-        for word in self.game.menu.dictionary:
-            positions = self.find_positions_for_word(word)
-            for position, direction in positions:
-                if self.is_valid_placement(word, position, direction):
-                    possible_words.append((word, position, direction))
-        return possible_words
+        with profiler.span('find_possible_words'):
+            view = self.engine.view
+            cached = self.engine.move_cache.get('opponent', view.zobrist, None)
+            if cached is not None:
+                return cached[0]
+            moves = self.move_generator.generate(view, self.engine.cross_checks)
+            self.engine.move_cache.put('opponent', view.zobrist, None, (moves, None), len(moves))
+            return moves
 
     def find_positions_for_word(self, word):
         """
@@ -65,8 +305,8 @@ class Opponent:
             list: A list of tuples containing the position and direction.
         """
         positions = []
-        for row in range(self.game.board_size):
-            for col in range(self.game.board_size):
+        for row in range(self.engine.board_size):
+            for col in range(self.engine.board_size):
                 if self.can_place_word(word, (row, col), 'horizontal'):
                     positions.append(((row, col), 'horizontal'))
                 if self.can_place_word(word, (row, col), 'vertical'):
@@ -87,26 +327,29 @@ class Opponent:
         """
         row, col = position
         if direction == 'horizontal':
-            if col + len(word) > self.game.board_size:
+            if col + len(word) > self.engine.board_size:
                 return False
             for i in range(len(word)):
-                current_cell = self.game.board_matrix[row][col + i]
-                if current_cell is not None and current_cell[0] != word[i]:
+                current_letter = self.engine.view.letter(row, col + i)
+                if current_letter is not None and current_letter != word[i]:
                     return False
             return True
         elif direction == 'vertical':
-            if row + len(word) > self.game.board_size:
+            if row + len(word) > self.engine.board_size:
                 return False
             for i in range(len(word)):
-                current_cell = self.game.board_matrix[row + i][col]
-                if current_cell is not None and current_cell[0] != word[i]:
+                current_letter = self.engine.view.letter(row + i, col)
+                if current_letter is not None and current_letter != word[i]:
                     return False
             return True
         return False
 
     def is_valid_placement(self, word, position, direction):
         """
-        Checks if a word placement is valid by ensuring it is connected to existing words.
+        Checks if a word placement is valid by ensuring it is connected to existing words and places a new letter.
+
+        The checks use the occupancy bitmasks of the line of the word and of its two
+        neighbouring lines, so they take a few shifts and ANDs whatever the length of the word.
 
         Args:
             word (str): The word to place.
@@ -117,46 +360,18 @@ class Opponent:
             bool: True if the placement is valid, False otherwise.
         """
         row, col = position
-        connected = False
-
-        if direction == 'horizontal':
-            for i in range(len(word)):
-                current_cell = self.game.board_matrix[row][col + i]
-                if current_cell is not None:
-                    connected = True
-                if (
-                    (row > 0 and self.game.board_matrix[row - 1][col + i] is not None) or
-                    (row < self.game.board_size - 1 and self.game.board_matrix[row + 1][col + i] is not None)
-                ):
-                    connected = True
-                if current_cell is None and (
-                    (row > 0 and self.game.board_matrix[row - 1][col + i] is not None) or
-                    (row < self.game.board_size - 1 and self.game.board_matrix[row + 1][col + i] is not None)
-                ):
-                    return False
-            if (col > 0 and self.game.board_matrix[row][col - 1] is not None) or \
-               (col + len(word) < self.game.board_size and self.game.board_matrix[row][col + len(word)] is not None):
-                return False
-        elif direction == 'vertical':
-            for i in range(len(word)):
-                current_cell = self.game.board_matrix[row + i][col]
-                if current_cell is not None:
-                    connected = True
-                if (
-                    (col > 0 and self.game.board_matrix[row + i][col - 1] is not None) or
-                    (col < self.game.board_size - 1 and self.game.board_matrix[row + i][col + 1] is not None)
-                ):
-                    connected = True
-                if current_cell is None and (
-                    (col > 0 and self.game.board_matrix[row + i][col - 1] is not None) or
-                    (col < self.game.board_size - 1 and self.game.board_matrix[row + i][col + 1] is not None)
-                ):
-                    return False
-            if (row > 0 and self.game.board_matrix[row - 1][col] is not None) or \
-               (row + len(word) < self.game.board_size and self.game.board_matrix[row + len(word)][col] is not None):
-                return False
+        index, start = (row, col) if direction == 'horizontal' else (col, row)
+        view = self.engine.view
+        line = view.line_mask(index, direction)
+        span = ((1 << len(word)) - 1) << start
 
-        return connected
+        if span & view.hook_mask(index, direction):
+            return False  # A new letter would touch a perpendicular word
+        if line & ((1 << start >> 1) | (1 << (start + len(word)))):
+            return False  # The word is not bounded by empty cells
+        if line & span == span:
+            return False  # The word places no new letter
+        return bool(line & span)  # The word goes through an existing letter
 
     def place_word(self, word, position, direction):
         """
@@ -170,45 +385,24 @@ class Opponent:
         Returns:
             list: A list of tuples containing the letter and its position.
         """
-        row, col = position
-        placed_word = []
-        if direction == 'horizontal':
-            for i in range(len(word)):
-                self.game.board_matrix[row][col + i] = (word[i], self.game.iteration)
-                self.game.board.placed_letters[(row, col + i)] = word[i]
-                self.game.board.cell_colors[(row, col + i)] = Utils.hex_to_rgb('#b79d9b')
-                placed_word.append((word[i], (row, col + i)))
-        elif direction == 'vertical':
-            for i in range(len(word)):
-                self.game.board_matrix[row + i][col] = (word[i], self.game.iteration)
-                self.game.board.placed_letters[(row + i, col)] = word[i]
-                self.game.board.cell_colors[(row + i, col)] = Utils.hex_to_rgb('#b79d9b')
-                placed_word.append((word[i], (row + i, col)))
-        return placed_word
+        return self.engine.place_word(word, position, direction)
 
-    def calculate_score(self, word):
+    def calculate_score(self, move):
         """
-        Calculates the score for the placed word and updates the opponent's total score.
+        Calculates the score of a move, before it is placed, and updates the opponent's total score.
+
+        The score includes the perpendicular words formed by the new letters, and the
+        premiums only count for the new letters.
 
         Args:
-            word (list): A list of tuples containing the letter and its position.
-        """
-        word_score = 0
-        word_multiplier = 1
-        for letter, (row, col) in word:
-            letter_score = letter_scores[letter]
-            if (row, col) in special_tiles:
-                tile_type = special_tiles[(row, col)]
-                if tile_type == 'DL':
-                    letter_score *= 2
-                elif tile_type == 'TL':
-                    letter_score *= 3
-                elif tile_type == 'DW':
-                    word_multiplier *= 2
-                elif tile_type == 'TW':
-                    word_multiplier *= 3
-            word_score += letter_score
-        word_score *= word_multiplier
+            move (tuple): The word, position, and direction of the move.
+
+        Returns:
+            int: The score of the move.
+        """
+        word_score = self.engine.scorer.score_move(self.engine.view, move)
         self.total_score += word_score
-        print(f"Opponent score for this turn: {word_score}")
-        print(f"Opponent total score: {self.total_score}")
\ No newline at end of file
+        if self.engine.verbose:
+            logger.info("Opponent score for this turn: %d", word_score)
+            logger.info("Opponent total score: %d", self.total_score)
+        return word_score
@@ -0,0 +1,130 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from CompiledDictionary import CompiledDictionary
+from MoveGenerator import MoveGenerator, SearchLimit
+from Profiler import profiler
+
+worker_generator = None  # The MoveGenerator of the current worker process
+
+def init_worker(compiled_path, buffer, board_size):
+    """
+    Sets up the move generator of a worker process, once per process.
+
+    Args:
+        compiled_path (str): The path to the compiled dictionary, None if it is only in memory.
+        buffer (bytes): The contents of the compiled dictionary when it is only in memory.
+        board_size (int): The size of the board.
+    """
+    global worker_generator
+    dictionary = CompiledDictionary.open(compiled_path) if compiled_path else CompiledDictionary(buffer)
+    worker_generator = MoveGenerator(dictionary.gaddag, board_size)
+
+def search_lines(tasks, wall_deadline=None, rack=None):
+    """
+    Searches a group of rows and columns in a worker process.
+
+    The deadline is sent as a time.time() value, the wall clock being shared
+    by the processes while perf_counter is not, and turned back into a
+    perf_counter deadline here. A group that starts after the deadline, e.g.
+    one still queued when the turn ran out of time, searches nothing.
+
+    Args:
+        tasks (list): The line tasks, as returned by MoveGenerator.line_tasks.
+        wall_deadline (float): The time.time() the search stops at, None to search every line.
+        rack (Counter): The letters the new cells can take, None for any letter.
+
+    Returns:
+        list: For every task, the list of moves found on its line.
+    """
+    limit = None
+    if wall_deadline is not None:
+        limit = SearchLimit(time.perf_counter() + wall_deadline - time.time())
+    return [[] if limit is not None and limit.check() else worker_generator.search_line(*task, limit=limit, rack=rack)
+            for task in tasks]
+
+class ParallelMoveGenerator:
+    """
+    Generates the legal placements with a pool of worker processes.
+
+    The rows and columns of the board are dealt to the workers in small
+    chunks, in order of priority when one is given, and the results are
+    merged back in line order, so they do not depend on which worker
+    finishes first. Each worker opens the compiled dictionary once, when it
+    starts, so the dictionary is never sent with a task.
+
+    Attributes:
+        move_generator (MoveGenerator): The generator used to split the search into line tasks.
+        workers (int): The number of worker processes.
+        executor (ProcessPoolExecutor): The pool of worker processes.
+    """
+
+    def __init__(self, dictionary, board_size, workers):
+        """
+        Initializes the ParallelMoveGenerator and starts its worker processes.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary of the game.
+            board_size (int): The size of the board.
+            workers (int): The number of worker processes.
+        """
+        self.move_generator = MoveGenerator(dictionary.gaddag, board_size)
+        self.workers = workers
+        buffer = None if dictionary.path else bytes(dictionary.buffer)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=init_worker, initargs=(dictionary.path, buffer, board_size))
+
+    def generate(self, board, cross_checks, progress=None, cancelled=None, deadline=None, priority=None, rack=None):
+        """
+        Finds all the legal placements on the board using the worker processes.
+
+        Args:
+            board (BoardView): The letters on the board.
+            cross_checks (CrossCheckCache): The anchors and cross-checks of the board.
+            progress (callable): Called with the searched fraction of the lines after every group of lines.
+            cancelled (callable): Returns True when the search should stop early.
+            deadline (float): The perf_counter time the search stops at, None to search the whole board.
+            priority (callable): Returns the priority of a line task, the lines with the highest priority
+                are searched first. None to search the lines in board order.
+            rack (Counter): The letters the new cells can take, None for any letter.
+
+        Returns:
+            list: A list of tuples containing the word, position, and direction.
+        """
+        with profiler.span('generate_moves'):
+            tasks = self.move_generator.line_tasks(board, cross_checks)
+            if priority is not None:
+                tasks.sort(key=priority, reverse=True)
+            size = max(1, len(tasks) // (self.workers * 4))
+            groups = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+            wall_deadline = None if deadline is None else time.time() + deadline - time.perf_counter()
+            futures = {self.executor.submit(search_lines, group, wall_deadline, rack): i for i, group in enumerate(groups)}
+
+            results = [[] for _ in groups]
+            searched = 0
+            pending = set(futures)
+            while pending:
+                timeout = None if deadline is None else max(0, deadline - time.perf_counter())
+                done, pending = wait(pending, timeout, return_when=FIRST_COMPLETED)
+                if not done or (cancelled is not None and cancelled()):
+                    break  # The deadline has passed or the search was cancelled
+                for future in done:
+                    results[futures[future]] = future.result()
+                    searched += len(groups[futures[future]])
+                if progress is not None:
+                    progress(searched / len(tasks))
+            for future in pending:
+                future.cancel()
+
+            # Merge the groups back in the order of the lines
+            moves = [move for group in results for line_moves in group for move in line_moves]
+            profiler.count('lines_searched', searched)
+            profiler.count('lines_pruned', len(tasks) - searched)
+            profiler.count('moves_generated', len(moves))
+            return moves
+
+    def shutdown(self):
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
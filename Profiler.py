@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+FRAME_BUCKETS = (1, 2, 4, 8, 16, 33, 50, 100)  # Upper bounds in milliseconds of the frame time histogram
+NO_SPAN = nullcontext()  # The span returned while the profiler is disabled, shared by every call
+
+class Profiler:
+    """
+    Opt-in instrumentation of the game: timed spans, counters and a frame time histogram.
+
+    The hot paths are wrapped in spans (with profiler.span('name'): ...) and
+    count the work they do with profiler.count. While the profiler is
+    disabled, span returns a shared no-op context manager and count returns
+    at once, so the instrumentation costs a method call. Once enabled, every
+    span is recorded with its thread, and the recording can be written as a
+    Chrome trace (chrome://tracing or ui.perfetto.dev) and summarized as a
+    table. Only the spans of the current process are recorded, not those of
+    the worker processes.
+
+    Attributes:
+        enabled (bool): True while the spans and counters are recorded.
+        origin (int): The perf_counter_ns time the recording started at.
+        events (deque): The latest recorded spans and counter samples, as trace events.
+        totals (dict): For every span name, its count, total and maximum duration in nanoseconds.
+        durations (dict): For every span name, the latest durations in nanoseconds, for the percentiles.
+        counters (dict): The value of every counter.
+        lock (threading.Lock): The lock guarding the counters and totals, spans end in several threads.
+    """
+
+    def __init__(self, max_events=200000):
+        """
+        Initializes a disabled Profiler.
+
+        Args:
+            max_events (int): The number of latest trace events and durations kept.
+        """
+        self.enabled = False
+        self.origin = time.perf_counter_ns()
+        self.events = deque(maxlen=max_events)
+        self.totals = {}
+        self.durations = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def enable(self):
+        """
+        Starts recording, dropping any previous recording.
+        """
+        self.origin = time.perf_counter_ns()
+        self.events.clear()
+        self.totals.clear()
+        self.durations.clear()
+        self.counters.clear()
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stops recording, the recording is kept for the reports.
+        """
+        self.enabled = False
+
+    def span(self, name):
+        """
+        Returns a context manager timing the code it wraps.
+
+        Args:
+            name (str): The name of the span.
+
+        Returns:
+            object: The context manager, a shared no-op one while the profiler is disabled.
+        """
+        if not self.enabled:
+            return NO_SPAN
+        return self.timed(name)
+
+    @contextmanager
+    def timed(self, name):
+        """
+        Records the duration of the wrapped code as a span.
+
+        Args:
+            name (str): The name of the span.
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns() - start)
+
+    def record(self, name, start, duration):
+        """
+        Records a span measured elsewhere.
+
+        Args:
+            name (str): The name of the span.
+            start (int): The perf_counter_ns time the span started at.
+            duration (int): The duration of the span in nanoseconds.
+        """
+        self.events.append(('X', name, threading.get_ident(), start - self.origin, duration))
+        with self.lock:
+            total = self.totals.get(name)
+            if total is None:
+                self.totals[name] = [1, duration, duration]
+                self.durations[name] = deque([duration], maxlen=self.events.maxlen)
+            else:
+                total[0] += 1
+                total[1] += duration
+                total[2] = max(total[2], duration)
+                self.durations[name].append(duration)
+
+    def count(self, name, amount=1):
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The name of the counter.
+            amount (int): The amount to add.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            value = self.counters[name] = self.counters.get(name, 0) + amount
+        self.events.append(('C', name, threading.get_ident(), time.perf_counter_ns() - self.origin, value))
+
+    def histogram(self, name, buckets=FRAME_BUCKETS):
+        """
+        Counts the recorded durations of a span in time buckets.
+
+        Args:
+            name (str): The name of the span.
+            buckets (tuple): The upper bounds of the buckets in milliseconds, in increasing order.
+
+        Returns:
+            list: The (label, count) pairs of the buckets, the last one counting the longer spans.
+        """
+        counts = [0] * (len(buckets) + 1)
+        for duration in self.durations.get(name, ()):
+            milliseconds = duration / 1e6
+            counts[next((i for i, bound in enumerate(buckets) if milliseconds <= bound), len(buckets))] += 1
+        labels = [f"<= {bound} ms" for bound in buckets] + [f"> {buckets[-1]} ms"]
+        return list(zip(labels, counts))
+
+    def write_trace(self, path):
+        """
+        Writes the recording in the Chrome trace event format.
+
+        Args:
+            path (str): The path of the JSON file.
+        """
+        pid = os.getpid()
+        trace = []
+        for kind, name, thread, start, value in list(self.events):
+            event = {'name': name, 'ph': kind, 'ts': start / 1000, 'pid': pid, 'tid': thread}
+            if kind == 'X':
+                event['dur'] = value / 1000
+            else:
+                event['args'] = {name: value}
+            trace.append(event)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
+
+    def summary(self):
+        """
+        Formats the recorded spans, the counters and the frame time histogram as a table.
+
+        Returns:
+            str: The summary, one line per span, counter and histogram bucket.
+        """
+        lines = [f"{'span':<24}{'count':>8}{'total ms':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, (count, total, longest) in sorted(self.totals.items(), key=lambda item: -item[1][1]):
+            durations = sorted(self.durations[name])
+            p50 = durations[len(durations) // 2]
+            p95 = durations[min(len(durations) - 1, len(durations) * 95 // 100)]
+            lines.append(f"{name:<24}{count:>8}{total / 1e6:>12.2f}{total / count / 1e6:>10.3f}"
+                         f"{p50 / 1e6:>10.3f}{p95 / 1e6:>10.3f}{longest / 1e6:>10.3f}")
+        if self.counters:
+            lines.append('')
+            lines.append(f"{'counter':<24}{'value':>12}")
+            lines.extend(f"{name:<24}{value:>12}" for name, value in sorted(self.counters.items()))
+        if 'frame' in self.totals:
+            lines.append('')
+            lines.append(f"{'frame time':<24}{'frames':>12}")
+            lines.extend(f"{label:<24}{count:>12}" for label, count in self.histogram('frame'))
+        return '\n'.join(lines)
+
+profiler = Profiler()  # The profiler shared by the whole game, disabled until enable is called
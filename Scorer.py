@@ -0,0 +1,150 @@
+from constants import letter_scores, special_tiles
+
+class Scorer:
+    """
+    Scores words and moves with premium tables precomputed for the board.
+
+    The letter and word multipliers of every cell are stored in flat lists
+    indexed by row * board_size + col. The premiums only count for the letters
+    placed in the move being scored, the letters already on the board count
+    with their plain value. A move scores its main word plus every
+    perpendicular word formed by its new letters.
+
+    Attributes:
+        board_size (int): The size of the board.
+        letter_values (dict): The score of every letter.
+        letter_multipliers (list): The letter multiplier of every cell.
+        word_multipliers (list): The word multiplier of every cell.
+    """
+
+    def __init__(self, board_size, tiles=special_tiles, values=letter_scores):
+        """
+        Initializes the Scorer and precomputes the premium tables.
+
+        Args:
+            board_size (int): The size of the board.
+            tiles (dict): The premium type ('DL', 'TL', 'DW' or 'TW') of the special cells.
+            values (dict): The score of every letter.
+        """
+        self.board_size = board_size
+        self.letter_values = values
+        self.letter_multipliers = [1] * (board_size * board_size)
+        self.word_multipliers = [1] * (board_size * board_size)
+        for (row, col), tile_type in tiles.items():
+            if row < board_size and col < board_size:
+                index = row * board_size + col
+                if tile_type == 'DL':
+                    self.letter_multipliers[index] = 2
+                elif tile_type == 'TL':
+                    self.letter_multipliers[index] = 3
+                elif tile_type == 'DW':
+                    self.word_multipliers[index] = 2
+                elif tile_type == 'TW':
+                    self.word_multipliers[index] = 3
+
+    def score_words(self, board, words, iteration):
+        """
+        Scores words that are already on the board.
+
+        Args:
+            board (BoardView): The letters on the board.
+            words (list): The words, as lists of (letter, (row, col)) tuples.
+            iteration (int): The iteration of the new letters, the only ones getting the premiums.
+
+        Returns:
+            int: The total score of the words.
+        """
+        total = 0
+        for word in words:
+            word_score = 0
+            word_multiplier = 1
+            for letter, (row, col) in word:
+                value = self.letter_values.get(letter, 0)
+                if board.iteration(row, col) == iteration:
+                    index = row * self.board_size + col
+                    value *= self.letter_multipliers[index]
+                    word_multiplier *= self.word_multipliers[index]
+                word_score += value
+            total += word_score * word_multiplier
+        return total
+
+    def cross_scores(self, board):
+        """
+        Computes, for every empty cell, the value of the letters a new letter there would join across.
+
+        Args:
+            board (BoardView): The letters on the board.
+
+        Returns:
+            tuple: For horizontal moves and for vertical moves, a flat list holding for every
+            empty cell the sum of the letter values of its perpendicular word, or None if the
+            cell has no perpendicular neighbors.
+        """
+        size = self.board_size
+        horizontal = [None] * (size * size)
+        vertical = [None] * (size * size)
+        for cross, direction, step in ((horizontal, 'vertical', size), (vertical, 'horizontal', 1)):
+            for index in range(size):
+                line = [self.letter_values.get(letter, 0) if letter else None for letter in board.line(index, direction)]
+                first = index if direction == 'vertical' else index * size
+                for position in range(size):
+                    if line[position] is not None:
+                        continue
+                    before = after = position
+                    while before > 0 and line[before - 1] is not None:
+                        before -= 1
+                    while after < size - 1 and line[after + 1] is not None:
+                        after += 1
+                    if before < position or after > position:
+                        cross[first + position * step] = sum(line[before:position]) + sum(line[position + 1:after + 1])
+        return horizontal, vertical
+
+    def score_moves(self, board, moves, cross_scores=None):
+        """
+        Scores a batch of candidate moves on the same board.
+
+        The perpendicular words are read from the board once for the whole batch,
+        so every move is then scored in a single pass over its letters.
+
+        Args:
+            board (BoardView): The letters on the board, before the moves.
+            moves (list): The word, position, and direction of every move.
+            cross_scores (tuple): The result of cross_scores for the board, to share it between
+                batches. Computed when None.
+
+        Returns:
+            list: The score of every move.
+        """
+        horizontal, vertical = cross_scores or self.cross_scores(board)
+        size = self.board_size
+        scores = []
+        for word, (row, col), direction in moves:
+            step, cross = (1, horizontal) if direction == 'horizontal' else (size, vertical)
+            index = row * size + col
+            main_score = 0
+            word_multiplier = 1
+            cross_total = 0
+            for letter in word:
+                value = self.letter_values.get(letter, 0)
+                if board.letter(*divmod(index, size)) is None:
+                    value *= self.letter_multipliers[index]
+                    word_multiplier *= self.word_multipliers[index]
+                    if cross[index] is not None:
+                        cross_total += (cross[index] + value) * self.word_multipliers[index]
+                main_score += value
+                index += step
+            scores.append(main_score * word_multiplier + cross_total)
+        return scores
+
+    def score_move(self, board, move):
+        """
+        Scores a single move.
+
+        Args:
+            board (BoardView): The letters on the board, before the move.
+            move (tuple): The word, position, and direction of the move.
+
+        Returns:
+            int: The score of the move.
+        """
+        return self.score_moves(board, [move])[0]
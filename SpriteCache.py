@@ -0,0 +1,98 @@
+import pygame
+import Utils
+from collections import OrderedDict
+from constants import letter_scores
+
+class SpriteCache:
+    """
+    Caches the rendered text and the fully composed letter tiles.
+
+    Rendering a letter tile (background, letter and score) happens once per
+    combination of letter, fonts and colors; afterwards drawing a tile is a
+    single blit. The texts include values that change during the game, such
+    as the scores and the hints, so they are kept in a least recently used
+    cache of limited size. The tiles are bounded by the letters and colors.
+    The cache must be cleared when the fonts or the theme change.
+
+    Attributes:
+        cell_size (int): The size of a tile.
+        max_texts (int): The number of rendered texts kept.
+        texts (OrderedDict): The rendered text surfaces, keyed by text, font and color, least recently used first.
+        tiles (dict): The composed tile surfaces, keyed by letter, fonts and colors.
+    """
+
+    def __init__(self, cell_size, max_texts=256):
+        """
+        Initializes an empty SpriteCache.
+
+        Args:
+            cell_size (int): The size of a tile.
+            max_texts (int): The number of rendered texts kept.
+        """
+        self.cell_size = cell_size
+        self.max_texts = max_texts
+        self.texts = OrderedDict()
+        self.tiles = {}
+
+    def clear(self):
+        """
+        Drops all the cached surfaces, to be called when the fonts or the theme change.
+        """
+        self.texts.clear()
+        self.tiles.clear()
+
+    def text(self, text, font, color):
+        """
+        Returns the rendered surface of a text.
+
+        Args:
+            text (str): The text to render.
+            font (pygame.font.Font): The font to render with.
+            color (tuple): The RGB color of the text.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, font, color)
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.texts[key] = surface
+            if len(self.texts) > self.max_texts:
+                self.texts.popitem(last=False)
+        else:
+            self.texts.move_to_end(key)
+        return surface
+
+    def tile(self, letter, font, score_font, background_color, text_color=(0, 0, 0), alpha=255):
+        """
+        Returns the composed surface of a letter tile.
+
+        Args:
+            letter (str): The letter on the tile.
+            font (pygame.font.Font): The font for the letter.
+            score_font (pygame.font.Font): The font for the letter score, None to leave the score out.
+            background_color (tuple): The RGB color of the tile.
+            text_color (tuple): The RGB color of the letter and the score.
+            alpha (int): The opacity of the whole tile, lower for the ghost tiles of a hint.
+
+        Returns:
+            pygame.Surface: The composed tile, transparent outside its rounded corners.
+        """
+        key = (letter, font, score_font, background_color, text_color, alpha)
+        surface = self.tiles.get(key)
+        if surface is None:
+            surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+            Utils.draw_rounded_rect(surface, background_color, (0, 0, self.cell_size, self.cell_size), corner_radius=8)
+
+            letter_text = self.text(letter, font, text_color)
+            surface.blit(letter_text, ((self.cell_size - letter_text.get_width()) // 2,
+                                       (self.cell_size - letter_text.get_height()) // 2))
+
+            if score_font is not None:
+                score_text = self.text(str(letter_scores[letter]), score_font, text_color)
+                surface.blit(score_text, (self.cell_size - score_text.get_width() - 5,
+                                          self.cell_size - score_text.get_height() - 5))
+            surface.set_alpha(alpha)
+            self.tiles[key] = surface
+        return surface
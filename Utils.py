@@ -1,9 +1,13 @@
+import functools
 import pygame
 
+@functools.lru_cache(maxsize=None)
 def hex_to_rgb(hex_color):
     """
     Converts a hex color string to an RGB tuple.
 
+    The results are memoized, the colors of the game are constants.
+
     Args:
         hex_color (str): The hex color string (e.g., '#FFFFFF').
 
@@ -0,0 +1,96 @@
+import random
+
+class WordIndex:
+    """
+    Indexes the words of a dictionary by length and by letter, to refill the rack.
+
+    The words are identified by their index in the sorted word table of the
+    dictionary. For every letter, the words containing it are kept as a bitset
+    (a Python int with bit i set when word i contains the letter), so the
+    words containing any of a set of letters are the OR of a few bitsets.
+
+    Attributes:
+        dictionary (CompiledDictionary): The indexed dictionary.
+        by_length (dict): For every word length, the list of the word indexes of that length.
+        letter_masks (dict): For every letter, the bitset of the words containing it.
+    """
+
+    def __init__(self, dictionary):
+        """
+        Initializes the WordIndex with a single pass over the dictionary.
+
+        Args:
+            dictionary (CompiledDictionary): The dictionary to index.
+        """
+        self.dictionary = dictionary
+        self.by_length = {}
+        bits = {letter: bytearray((len(dictionary) + 7) // 8) for letter in dictionary.alphabet}
+        for index, word in enumerate(dictionary):
+            self.by_length.setdefault(len(word), []).append(index)
+            for letter in set(word):
+                bits[letter][index >> 3] |= 1 << (index & 7)
+        self.letter_masks = {letter: int.from_bytes(bitset, 'little') for letter, bitset in bits.items()}
+
+    def containing_any(self, letters):
+        """
+        Returns the words containing at least one of the given letters.
+
+        Args:
+            letters (iterable): The letters.
+
+        Returns:
+            int: The bitset of the matching words.
+        """
+        mask = 0
+        for letter in set(letters):
+            mask |= self.letter_masks.get(letter, 0)
+        return mask
+
+    def random_word(self, length, excluded=()):
+        """
+        Chooses a random word of a given length.
+
+        Args:
+            length (int): The length of the word.
+            excluded (set): The words that cannot be chosen.
+
+        Returns:
+            str: The chosen word, or None if every word of that length is excluded.
+        """
+        indexes = self.by_length.get(length, [])
+        for _ in range(32):  # Most words are not excluded, a few random picks are enough
+            if not indexes:
+                return None
+            word = self.dictionary.word(random.choice(indexes))
+            if word not in excluded:
+                return word
+        words = [word for word in map(self.dictionary.word, indexes) if word not in excluded]
+        return random.choice(words) if words else None
+
+    def random_member(self, mask):
+        """
+        Chooses a random word from a bitset, with the same chance for every word.
+
+        Args:
+            mask (int): The bitset of the words to choose from.
+
+        Returns:
+            int: The index of the chosen word, or None if the bitset is empty.
+        """
+        if not mask:
+            return None
+        for _ in range(32):  # The bitsets built from a rack usually hold most of the words
+            index = random.randrange(mask.bit_length())
+            if mask >> index & 1:
+                return index
+
+        # Binary search for the position of the k-th set bit
+        rank = random.randrange(mask.bit_count())
+        low, high = 0, mask.bit_length()
+        while high - low > 1:
+            middle = (low + high) // 2
+            if (mask & ((1 << middle) - 1)).bit_count() > rank:
+                high = middle
+            else:
+                low = middle
+        return low
@@ -22,4 +22,29 @@ special_tiles = {
     (1, 13): 'DW', (2, 12): 'DW', (3, 11): 'DW', (4, 10): 'DW',
     (13, 13): 'DW', (12, 12): 'DW', (11, 11): 'DW', (10, 10): 'DW',
     (13, 1): 'DW', (12, 2): 'DW', (11, 3): 'DW', (10, 4): 'DW'
-}
\ No newline at end of file
+}
+
+target_fps = 60  # Frame rate cap while something is animating (e.g. a tile is being dragged)
+idle_timeout = 500  # Milliseconds to block waiting for an event when nothing is animating
+opponent_workers = 1  # Processes used by the opponent's move search, 1 to search without a process pool
+blank = '?'  # The letter standing for a blank tile in a rack
+hint_budget = 0.15  # Seconds the hint search may take before returning the best moves found so far
+hint_count = 3  # Number of best moves returned by the hint
+difficulty_levels = {  # Search budget in seconds and ranking of the moves found, for every opponent level, a turn that finds no move in its budget searches once more, so it takes at most twice the budget
+    'easy': (0.25, 'random'),
+    'medium': (1.0, 'top_quarter'),
+    'hard': (3.0, 'best'),
+    'expert': (6.0, 'simulation'),
+}
+opponent_difficulty = 'medium'  # Level of the opponent in the game, a key of difficulty_levels
+simulation_candidates = 8  # Number of best scoring moves the simulation opponent plays continuations of
+simulation_rate = 200  # Maximum number of continuations the simulation opponent starts per second
+move_cache_bytes = 32 * 1024 * 1024  # Memory limit of the cache of generated moves, in bytes
+save_path = 'scrabble_save.jsonl'  # File the game is saved to with Ctrl+S and loaded from with Ctrl+O
+profile_path = None  # File the Chrome trace of the game is written to when it exits, None to disable the profiler
+log_level = 'WARNING'  # Lowest level of the log messages written to the console
+log_buffer_level = 'INFO'  # Lowest level of the log messages kept in memory for the crash log
+log_buffer_size = 2000  # Number of latest log messages kept in memory
+crash_log_path = 'scrabble_crash.log'  # File the log messages kept in memory are written to when the game crashes
+toast_duration = 3000  # Milliseconds an error message stays at the top of the board
+simulation_rack_size = 7  # Number of letters on the racks of the players of Simulation.py, 0 to let them play any letter
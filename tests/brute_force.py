@@ -0,0 +1,152 @@
+"""
+Cell-by-cell reference implementations of the game rules.
+
+They read the board one cell at a time and try every word at every position,
+so they are slow but obviously right. The tests compare the fast searches
+and the cached or bitmask state of the game against them.
+"""
+from collections import Counter
+
+DIRECTIONS = {'horizontal': (0, 1), 'vertical': (1, 0)}
+
+def placements(board, words, size, through_letter=False):
+    """
+    Lists every word at every position where it fits the letters on the board.
+
+    Args:
+        board (BoardView): The letters on the board.
+        words (iterable): The words to place.
+        size (int): The size of the board.
+        through_letter (bool): True to skip the rows and columns without any letter,
+            where no word can go through a letter on the board.
+
+    Returns:
+        list: The (word, position, direction, new cells) tuples, the new cells being
+        the (row, col, letter) of the empty cells the word covers.
+    """
+    grid = [[board.letter(row, col) for col in range(size)] for row in range(size)]
+    rows = [through_letter and not any(grid[row]) for row in range(size)]
+    columns = [through_letter and not any(grid[row][col] for row in range(size)) for col in range(size)]
+    found = []
+    for word in words:
+        for direction, (dr, dc) in DIRECTIONS.items():
+            for row in range(size - dr * (len(word) - 1)):
+                if dc and rows[row]:
+                    continue
+                for col in range(size - dc * (len(word) - 1)):
+                    if dr and columns[col]:
+                        continue
+                    new_cells = []
+                    for i, letter in enumerate(word):
+                        current = grid[row + dr * i][col + dc * i]
+                        if current is None:
+                            new_cells.append((row + dr * i, col + dc * i, letter))
+                        elif current != letter:
+                            break
+                    else:
+                        found.append((word, (row, col), direction, new_cells))
+    return found
+
+def new_cells(board, word, position, direction):
+    """
+    Lists the empty cells a word covers, None if it does not fit the letters on the board.
+    """
+    (row, col), (dr, dc) = position, DIRECTIONS[direction]
+    cells = []
+    for i, letter in enumerate(word):
+        current = board.letter(row + dr * i, col + dc * i)
+        if current is None:
+            cells.append((row + dr * i, col + dc * i, letter))
+        elif current != letter:
+            return None
+    return cells
+
+def is_bounded(board, word, position, direction, size):
+    """
+    Checks that the cells before and after a word are empty or off the board.
+    """
+    (row, col), (dr, dc) = position, DIRECTIONS[direction]
+    before = (row - dr, col - dc)
+    after = (row + dr * len(word), col + dc * len(word))
+    return all(not (0 <= r < size and 0 <= c < size) or board.letter(r, c) is None for r, c in (before, after))
+
+def perpendicular_word(board, row, col, letter, direction, size):
+    """
+    Reads the word a new letter forms across a move, None if it has no perpendicular neighbour.
+    """
+    dr, dc = DIRECTIONS['vertical' if direction == 'horizontal' else 'horizontal']
+    start_row, start_col = row, col
+    while 0 <= start_row - dr and 0 <= start_col - dc and board.letter(start_row - dr, start_col - dc) is not None:
+        start_row, start_col = start_row - dr, start_col - dc
+    end_row, end_col = row, col
+    while end_row + dr < size and end_col + dc < size and board.letter(end_row + dr, end_col + dc) is not None:
+        end_row, end_col = end_row + dr, end_col + dc
+    if (start_row, start_col) == (end_row, end_col):
+        return None
+    cells = [(start_row + dr * i, start_col + dc * i) for i in range(max(end_row - start_row, end_col - start_col) + 1)]
+    return ''.join(letter if (r, c) == (row, col) else board.letter(r, c) for r, c in cells)
+
+def is_valid_opponent_placement(board, word, position, direction, new_cells, size):
+    """
+    Checks the opponent's rules: bounded, through a letter on the board, at least one
+    new letter, and no new letter next to a letter of a perpendicular word.
+    """
+    if not new_cells or len(new_cells) == len(word):
+        return False
+    if not is_bounded(board, word, position, direction, size):
+        return False
+    return all(perpendicular_word(board, row, col, letter, direction, size) is None for row, col, letter in new_cells)
+
+def opponent_moves(board, words, size, rack=None):
+    """
+    Lists the moves of the opponent, optionally limited to the letters of a rack.
+
+    Returns:
+        set: The (word, position, direction) moves.
+    """
+    return {(word, position, direction) for word, position, direction, new_cells
+            in placements(board, words, size, through_letter=True)
+            if is_valid_opponent_placement(board, word, position, direction, new_cells, size)
+            and (rack is None or not Counter(letter for _, _, letter in new_cells) - rack)}
+
+def cross_check(board, words, row, col, direction, size, alphabet):
+    """
+    Lists the letters of an empty cell that form a valid word across a move in a direction.
+
+    Returns:
+        frozenset: The allowed letters, None if the cell has no perpendicular neighbour.
+    """
+    if perpendicular_word(board, row, col, 'A', direction, size) is None:
+        return None
+    return frozenset(letter for letter in alphabet if perpendicular_word(board, row, col, letter, direction, size) in words)
+
+def anchors(board, size):
+    """
+    Lists the empty cells next to a letter on the board.
+    """
+    return {(row, col) for row in range(size) for col in range(size) if board.letter(row, col) is None and
+            any(0 <= row + dr < size and 0 <= col + dc < size and board.letter(row + dr, col + dc) is not None
+                for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)))}
+
+def player_moves(board, words, size, rack):
+    """
+    Lists the moves the player can make with a rack: bounded, covering an anchor (the
+    center on an empty board), and every word formed across a new letter is valid.
+
+    Returns:
+        list: The (word, position, direction) moves.
+    """
+    anchor_cells = anchors(board, size) or {(size // 2, size // 2)}
+    usable = set(rack) | {board.letter(row, col) for row, col in board.positions()}
+    moves = []
+    for word, position, direction, new_cells in placements(board, [word for word in words if set(word) <= usable], size):
+        if not new_cells or Counter(letter for _, _, letter in new_cells) - rack:
+            continue
+        if not any((row, col) in anchor_cells for row, col, _ in new_cells):
+            continue
+        if not is_bounded(board, word, position, direction, size):
+            continue
+        crossing = [perpendicular_word(board, row, col, letter, direction, size) for row, col, letter in new_cells]
+        if all(cross is None or cross in words for cross in crossing):
+            moves.append((word, position, direction))
+    return moves
@@ -0,0 +1,48 @@
+import os
+import random
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from DictionaryProcessor import DictionaryProcessor
+from GameEngine import GameEngine
+from Opponent import Opponent
+from Simulation import Simulation
+
+DICTIONARY_PATH = os.path.join(ROOT, 'Utils', 'scrabble_cuvinte_romana.txt')
+
+@pytest.fixture(scope='session')
+def dictionary():
+    """
+    The bundled word list, compiled once for the whole session.
+    """
+    return DictionaryProcessor(DICTIONARY_PATH).words
+
+@pytest.fixture(scope='session')
+def words(dictionary):
+    """
+    The words of the bundled word list, as a set.
+    """
+    return set(dictionary)
+
+@pytest.fixture
+def seeded_game(dictionary):
+    """
+    Returns a function playing a seeded game between two opponents.
+
+    The function yields the engine after the opening move and after every
+    later move, so a test can check the board at every position of the game.
+    """
+    def play(seed, turns, rack_size=None):
+        random.seed(seed)
+        engine = GameEngine(dictionary, verbose=False, deal_rack=False)
+        players = [Opponent(engine, rack_size=rack_size) for _ in range(2)]
+        players[0].apply_move(Simulation(dictionary).opening_move(), from_rack=False)
+        yield engine
+        for turn in range(1, turns):
+            if players[turn % 2].make_move() is None:
+                return
+            yield engine
+    return play
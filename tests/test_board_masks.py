@@ -0,0 +1,50 @@
+import random
+import pytest
+import brute_force
+from constants import letters
+from BoardState import BoardState
+from Opponent import Opponent
+
+@pytest.mark.parametrize('seed', range(4))
+def test_masks_match_cells(seed):
+    random.seed(seed)
+    size = 15
+    board = BoardState(size, letters)
+    for _ in range(300):
+        row, col = random.randrange(size), random.randrange(size)
+        if random.random() < 0.6:
+            board.place(row, col, random.choice(letters), 0)
+        else:
+            board.remove(row, col)
+
+        filled = [[board.letter(r, c) is not None for c in range(size)] for r in range(size)]
+        for index in range(size):
+            assert board.line_mask(index, 'horizontal') == sum(filled[index][c] << c for c in range(size))
+            assert board.line_mask(index, 'vertical') == sum(filled[r][index] << r for r in range(size))
+        for r in range(size):
+            for c in range(size):
+                horizontal_hook = not filled[r][c] and any(0 <= r + dr < size and filled[r + dr][c] for dr in (-1, 1))
+                vertical_hook = not filled[r][c] and any(0 <= c + dc < size and filled[r][c + dc] for dc in (-1, 1))
+                assert bool(board.hook_mask(r, 'horizontal') >> c & 1) == horizontal_hook
+                assert bool(board.hook_mask(c, 'vertical') >> r & 1) == vertical_hook
+                assert board.count_neighbors(r, c) == sum(
+                    filled[r + dr][c + dc] for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                    if 0 <= r + dr < size and 0 <= c + dc < size)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_is_valid_placement_matches_brute_force(seeded_game, words, seed):
+    for engine in seeded_game(seed, 8):
+        opponent = Opponent(engine)
+        size = engine.board_size
+        placements = brute_force.placements(engine.view, words, size, through_letter=True)
+        # The lines without letters only hold invalid placements, random ones are enough
+        for word in random.sample(sorted(words), 200):
+            direction = random.choice(['horizontal', 'vertical'])
+            position = (random.randrange(size - len(word) + 1), random.randrange(size - len(word) + 1))
+            new_cells = brute_force.new_cells(engine.view, word, position, direction)
+            if new_cells is not None:
+                placements.append((word, position, direction, new_cells))
+        for word, position, direction, new_cells in placements:
+            assert opponent.can_place_word(word, position, direction)
+            assert opponent.is_valid_placement(word, position, direction) == \
+                brute_force.is_valid_opponent_placement(engine.view, word, position, direction, new_cells, size)
@@ -0,0 +1,30 @@
+import random
+import pytest
+import brute_force
+
+def assert_matches_board(cache, board, words, size, alphabet):
+    assert cache.anchors == brute_force.anchors(board, size)
+    assert cache.rows == {row for row, _ in board.positions()}
+    assert cache.columns == {col for _, col in board.positions()}
+    for row in range(size):
+        for col in range(size):
+            if board.letter(row, col) is None:
+                for direction in ('horizontal', 'vertical'):
+                    assert cache.cross_check((row, col), direction) == \
+                        brute_force.cross_check(board, words, row, col, direction, size, alphabet)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_updates_match_brute_force(seeded_game, words, seed):
+    for engine in seeded_game(seed, 12, rack_size=7 if seed % 2 else None):
+        assert_matches_board(engine.cross_checks, engine.view, words, engine.board_size, engine.dictionary.alphabet)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_removals_match_brute_force(seeded_game, words, seed):
+    engine = list(seeded_game(seed, 12))[-1]
+    board = engine.board.copy()
+    cache = engine.cross_checks.copy()
+    removed = random.sample(board.positions(), 4)
+    for row, col in removed:
+        board.remove(row, col)
+    cache.remove(board, removed)
+    assert_matches_board(cache, board, words, engine.board_size, engine.dictionary.alphabet)
@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+import pytest
+import brute_force
+from GameEngine import GameEngine
+
+def random_rack(words):
+    letters = ''.join(random.sample(sorted(words), 3))
+    return random.sample(letters, min(7, len(letters)))
+
+def positions(seeded_game, dictionary, seed):
+    random.seed(seed)
+    yield GameEngine(dictionary, verbose=False, deal_rack=False)  # The first move goes through the center
+    yield from seeded_game(seed, 8)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_hints_are_the_best_moves(seeded_game, dictionary, words, seed):
+    for engine in positions(seeded_game, dictionary, seed):
+        rack = random_rack(words)
+        hints = engine.hint_finder.find(engine.view, engine.cross_checks, rack, 3, 60)
+        moves = brute_force.player_moves(engine.view, words, engine.board_size, Counter(rack))
+        best = sorted((engine.scorer.score_move(engine.view, move) for move in moves), reverse=True)
+        assert [score for score, _ in hints] == best[:3]
+        assert all(move in moves for _, move in hints)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_hints_are_accepted_by_submit(seeded_game, dictionary, words, seed):
+    for engine in positions(seeded_game, dictionary, seed):
+        for score, (word, (row, col), direction) in engine.hint_finder.find(
+                engine.view, engine.cross_checks, random_rack(words), 3, 60):
+            player = GameEngine(dictionary, verbose=False, deal_rack=False)
+            player.load_board(engine.board, engine.iteration)
+            player.replace_letters = lambda: None
+            dr, dc = brute_force.DIRECTIONS[direction]
+            for i, letter in enumerate(word):
+                if player.board.letter(row + dr * i, col + dc * i) is None:
+                    player.place_letter(row + dr * i, col + dc * i, letter)
+            assert player.submit() is None
+            assert player.total_score == score
+
+def test_cached_hints_are_reused_only_for_fewer_moves(dictionary, words):
+    random.seed(4)
+    engine = GameEngine(dictionary, verbose=False, deal_rack=False)
+    rack = random_rack(words)
+    three = engine.hint_finder.find(engine.view, engine.cross_checks, rack, 3, 60)
+    assert engine.hint_finder.find(engine.view, engine.cross_checks, rack, 1, 60) == three[:1]
+    assert engine.hint_finder.find(engine.view, engine.cross_checks, rack, 5, 60)[:3] == three
@@ -0,0 +1,42 @@
+import random
+from collections import Counter
+import pytest
+import brute_force
+from MoveGenerator import MoveGenerator, SearchLimit
+
+@pytest.mark.parametrize('seed', range(3))
+def test_generate_matches_brute_force(seeded_game, words, seed):
+    for engine in seeded_game(seed, 8):
+        generator = MoveGenerator(engine.dictionary.gaddag, engine.board_size)
+        moves = generator.generate(engine.view, engine.cross_checks)
+        assert len(moves) == len(set(moves))
+        assert set(moves) == brute_force.opponent_moves(engine.view, words, engine.board_size)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_generate_with_rack_matches_brute_force(seeded_game, words, seed):
+    for engine in seeded_game(seed, 8, rack_size=7):
+        rack = Counter(random.choice(sorted(words)) + random.choice(sorted(words)))
+        generator = MoveGenerator(engine.dictionary.gaddag, engine.board_size)
+        moves = generator.generate(engine.view, engine.cross_checks, rack=rack)
+        assert set(moves) == brute_force.opponent_moves(engine.view, words, engine.board_size, rack)
+
+def test_moves_place_a_new_letter(seeded_game):
+    for engine in seeded_game(7, 12):
+        generator = MoveGenerator(engine.dictionary.gaddag, engine.board_size)
+        for word, (row, col), direction in generator.generate(engine.view, engine.cross_checks):
+            dr, dc = brute_force.DIRECTIONS[direction]
+            assert any(engine.view.letter(row + dr * i, col + dc * i) is None for i in range(len(word)))
+
+def test_cancelled_search_stops(seeded_game):
+    engine = list(seeded_game(3, 6))[-1]
+    generator = MoveGenerator(engine.dictionary.gaddag, engine.board_size)
+    assert generator.generate(engine.view, engine.cross_checks, cancelled=lambda: True) == []
+
+def test_limits_are_independent(seeded_game):
+    engine = list(seeded_game(3, 6))[-1]
+    generator = MoveGenerator(engine.dictionary.gaddag, engine.board_size)
+    tasks = generator.line_tasks(engine.view, engine.cross_checks)
+    expired = SearchLimit(cancelled=lambda: True)
+    assert all(generator.search_line(*task, limit=expired) == [] for task in tasks)
+    assert sorted(move for task in tasks for move in generator.search_line(*task, limit=SearchLimit())) == \
+        sorted(generator.generate(engine.view, engine.cross_checks))
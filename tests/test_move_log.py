@@ -0,0 +1,133 @@
+import json
+import random
+import pytest
+from CrossCheckCache import CrossCheckCache
+from GameEngine import GameEngine
+from Opponent import Opponent
+
+def snapshot(engine):
+    board = engine.board
+    cross_checks = engine.cross_checks
+    return (bytes(board.cells), [board.iteration(row, col) for row, col in board.positions()], board.zobrist,
+            list(board.row_masks), list(board.column_masks), engine.iteration, engine.total_score,
+            sorted(engine.rack), set(engine.pending_positions), cross_checks.anchors, cross_checks.horizontal,
+            cross_checks.vertical, cross_checks.rows, cross_checks.columns)
+
+def rebuilt_cross_checks(engine):
+    locked = engine.board.copy()
+    for row, col in engine.pending_positions:
+        locked.remove(row, col)
+    cross_checks = CrossCheckCache(engine.board_size, engine.dictionary)
+    cross_checks.update(locked, locked.positions())
+    return cross_checks.anchors, cross_checks.horizontal, cross_checks.vertical, cross_checks.rows, cross_checks.columns
+
+def place_hint(engine, snapshots=None):
+    hints = engine.find_hints(1, 60)
+    if not hints:
+        return False
+    _, (word, (row, col), direction) = hints[0]
+    dr, dc = (0, 1) if direction == 'horizontal' else (1, 0)
+    for i, letter in enumerate(word):
+        if engine.board.letter(row + dr * i, col + dc * i) is None:
+            engine.rack.remove(letter)
+            engine.place_letter(row + dr * i, col + dc * i, letter)
+            if snapshots is not None:
+                snapshots[engine.log.position] = snapshot(engine)
+    return True
+
+def play_logged_game(dictionary, seed, turns):
+    """
+    Plays a seeded game with placements, removals, submits, opponent moves and passes.
+
+    Returns:
+        tuple: The engine, and the snapshot of every position of its log.
+    """
+    random.seed(seed)
+    engine = GameEngine(dictionary, verbose=False)
+    opponent = Opponent(engine)
+    snapshots = {0: snapshot(engine)}
+    for _ in range(turns):
+        for _ in range(random.randint(0, 3)):
+            if engine.rack and random.random() < 0.7:
+                letter = random.choice(engine.rack)
+                if engine.place_letter(random.randrange(15), random.randrange(15), letter):
+                    engine.rack.remove(letter)
+            elif engine.pending_positions:
+                engine.rack.append(engine.remove_letter(*random.choice(sorted(engine.pending_positions))))
+            snapshots[engine.log.position] = snapshot(engine)
+        for row, col in sorted(engine.pending_positions):
+            engine.rack.append(engine.remove_letter(row, col))
+            snapshots[engine.log.position] = snapshot(engine)
+        if place_hint(engine, snapshots):
+            assert engine.submit() is None
+            snapshots[engine.log.position] = snapshot(engine)
+        if random.random() < 0.2:
+            opponent.forfeit()
+        else:
+            opponent.make_move()
+        snapshots[engine.log.position] = snapshot(engine)
+    return engine, snapshots
+
+@pytest.mark.parametrize('seed', range(4))
+def test_undo_redo_matches_recorded_positions(dictionary, seed):
+    engine, snapshots = play_logged_game(dictionary, seed, 8)
+    final = snapshot(engine)
+    for _ in range(200):
+        if random.random() < 0.5:
+            engine.undo()
+        else:
+            engine.redo()
+        assert snapshot(engine) == snapshots[engine.log.position]
+        assert rebuilt_cross_checks(engine) == snapshot(engine)[-5:]
+    while engine.redo():
+        pass
+    assert snapshot(engine) == final
+
+@pytest.mark.parametrize('seed', range(2))
+def test_save_and_load_restore_the_game(dictionary, tmp_path, seed):
+    engine, _ = play_logged_game(dictionary, seed, 6)
+    place_hint(engine)  # Saved with pending letters
+    path = tmp_path / 'game.jsonl'
+    engine.save_game(path)
+    loaded = GameEngine(dictionary, verbose=False)
+    loaded.load_game(path)
+    assert snapshot(loaded) == snapshot(engine)
+
+@pytest.mark.parametrize('entry', [
+    '["move",null,0,0,["",""]]',
+    '["move",[[20,20,"A"]],0,0,["",""]]',
+    '["move",[[1,1,"ab"]],0,0,["",""]]',
+    '["place",[[1,1,"#"]],0,0,["",""]]',
+    '["pass",[],true,0,["",""]]',
+    '["jump",[],0,0,["",""]]',
+    '{oops',
+])
+def test_malformed_save_keeps_the_game(dictionary, tmp_path, entry):
+    engine, _ = play_logged_game(dictionary, 1, 3)
+    good = tmp_path / 'good.jsonl'
+    engine.save_game(good)
+    before = snapshot(engine)
+    header = good.read_text().splitlines()[0]
+
+    bad = tmp_path / 'bad.jsonl'
+    bad.write_text(header + '\n' + entry + '\n')
+    with pytest.raises(ValueError):
+        engine.load_game(bad)
+    assert snapshot(engine) == before
+
+def test_replay_that_does_not_match_the_board_keeps_the_game(dictionary, tmp_path):
+    engine, _ = play_logged_game(dictionary, 2, 3)
+    path = tmp_path / 'game.jsonl'
+    engine.save_game(path)
+    before = snapshot(engine)
+    lines = path.read_text().splitlines()
+    row, col = engine.board.positions()[0]
+    rack = json.loads(lines[0])['rack']
+    missing = next(letter for letter in 'QWXYZJK' if letter not in rack)
+
+    for extra in (f'["move",[[{row},{col},"A"]],{engine.iteration},3,["",""]]',
+                  f'["place",[[0,0,"{missing}"]],0,0,["",""]]'):
+        path.write_text('\n'.join((lines if 'move' in extra else lines[:1]) + [extra]) + '\n')
+        with pytest.raises(ValueError):
+            engine.load_game(path)
+        assert snapshot(engine) == before